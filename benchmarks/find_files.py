@@ -0,0 +1,52 @@
+"""
+Compare the original find_files search with `qwikstart.utils.search`.
+
+Usage: python benchmarks/find_files.py DIRECTORY REGEX [MAX_WORKERS]
+"""
+import os
+import re
+import sys
+import timeit
+from typing import List, Pattern
+
+from qwikstart.utils import search
+
+
+def walk_and_read(directory: str, regex: Pattern[str]) -> List[str]:
+    """Search files the way find_files did before `qwikstart.utils.search`."""
+    matching_files = []
+    for root, dirs, files in os.walk(directory):
+        for filename in files:
+            filename = os.path.join(root, filename)
+            try:
+                with open(filename) as f:
+                    file_contents = f.read()
+            except (IOError, UnicodeDecodeError):
+                continue
+            if regex.search(file_contents):
+                matching_files.append(filename)
+    return matching_files
+
+
+def scan_and_search(directory: str, regex: Pattern[str], max_workers: int) -> List[str]:
+    paths = search.iter_files(directory)
+    return search.search_files(paths, regex, max_workers=max_workers)
+
+
+def main() -> None:
+    directory, pattern = sys.argv[1:3]
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    regex = re.compile(pattern)
+    print(f"Searching {directory} for {pattern!r}")
+    searches = {
+        "walk_and_read": lambda: walk_and_read(directory, regex),
+        "scan_and_search": lambda: scan_and_search(directory, regex, max_workers),
+    }
+    for name, run_search in searches.items():
+        num_matches = len(run_search())
+        seconds = min(timeit.repeat(run_search, number=1, repeat=5))
+        print(f"{name}: {seconds * 1000:.1f} ms ({num_matches} matches)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Compare the round-trip yaml loader with the safe loader used for read-only files.
+
+Usage: python benchmarks/yaml_loading.py [NUMBER_OF_OPERATIONS]
+"""
+import sys
+import timeit
+
+from qwikstart.utils import io
+
+OPERATION_TEMPLATE = """
+    - name: "Add file {index}"
+      add_file:
+          template_path: "templates/file_{index}.py"
+          target_path: "{{{{ qwikstart.target_dir }}}}/file_{index}.py"
+          template_variables:
+              index: {index}
+              tags: ["a", "b", "c"]
+"""
+
+
+def make_task_spec(num_operations: int) -> str:
+    operations = "".join(
+        OPERATION_TEMPLATE.format(index=i) for i in range(num_operations)
+    )
+    return f"name: Large task\ncontext:\n    key: value\noperations:{operations}"
+
+
+def main() -> None:
+    num_operations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    spec_contents = make_task_spec(num_operations)
+    print(f"Loading task spec with {num_operations} operations")
+    for loader in (io.load_yaml_string, io.safe_load_yaml_string):
+        seconds = min(timeit.repeat(lambda: loader(spec_contents), number=1, repeat=5))
+        print(f"{loader.__name__}: {seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,31 @@
+import functools
 import inspect
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Mapping, Optional, Type, TypeVar
+from typing import (
+    Any,
+    FrozenSet,
+    Hashable,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    cast,
+)
 
 import jinja2
 
+from .utils.file_buffer import FileBuffer
+from .utils.file_index import FileContentIndex
+from .utils.templates import SourceDirLoader, TemplateCache
+
 DictContext = Mapping[str, Any]
 TContext = TypeVar("TContext", bound="BaseContext")
 
+#: Fields of `ExecutionContext` used to create its template loader.
+TEMPLATE_LOADER_FIELDS = ("source_dir", "template_search_paths", "template_sources")
+
 
 @dataclass(frozen=True)
 class ExecutionContext:
@@ -23,11 +41,75 @@ class ExecutionContext:
     #: Enable dry-run mode, which avoids changes to filesystem.
     dry_run: bool = False
 
+    #: Number of threads used to run independent steps of a task concurrently.
+    #: The default, 1, runs steps in order.
+    max_workers: int = 1
+
+    #: Use cached qwikstart repos (e.g. for subtasks) without fetching updates.
+    offline: bool = False
+
+    #: Only lint task specs (e.g. for subtasks) if they fail to parse.
+    lazy_lint: bool = False
+
+    #: Fallback directories searched for templates not found in `source_dir`.
+    template_search_paths: Sequence[Path] = ()
+
+    #: In-memory templates keyed by path relative to `source_dir`, which take
+    #: precedence over template files; e.g. for task specs loaded without a repo.
+    template_sources: Optional[Mapping[str, str]] = field(
+        default=None, compare=False, repr=False
+    )
+
+    #: Cache of compiled templates shared by all operations using this context.
+    #: Copies of this context (e.g. for subtasks) share the same cache.
+    template_cache: TemplateCache = field(
+        default_factory=TemplateCache, compare=False, repr=False
+    )
+
+    #: Index of file contents shared by all operations using this context, so that
+    #: repeated searches of the same files only re-read files that have changed.
+    file_index: FileContentIndex = field(
+        default_factory=FileContentIndex, compare=False, repr=False
+    )
+
+    #: Buffer for text edits to files, which are written when the task completes.
+    #: If `None`, operations edit files directly.
+    file_buffer: Optional[FileBuffer] = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Reuse a single loader so that template environments can be shared through
+        # `template_cache`. Use `object.__setattr__` since this dataclass is frozen.
+        template_loader = SourceDirLoader(
+            self.source_dir,
+            search_paths=self.template_search_paths,
+            template_sources=self.template_sources,
+        )
+        object.__setattr__(self, "_template_loader", template_loader)
+
     def get_template_loader(self) -> jinja2.BaseLoader:
-        return jinja2.FileSystemLoader("/")
+        return cast(jinja2.BaseLoader, getattr(self, "_template_loader"))
+
+    @property
+    def skip_file_edits(self) -> bool:
+        """Return True if file edits should be skipped due to dry-run mode.
+
+        Edits to a `file_buffer` aren't skipped: The buffer is responsible for not
+        writing edits in dry-run mode, which allows later operations to see them.
+        """
+        return self.dry_run and self.file_buffer is None
 
     def copy(self, **override_kwargs: Any) -> "ExecutionContext":
-        return replace(self, **override_kwargs)
+        execution_context = replace(self, **override_kwargs)
+        if all(
+            getattr(execution_context, name) == getattr(self, name)
+            for name in TEMPLATE_LOADER_FIELDS
+        ):
+            # Share the loader, so that copies (e.g. for other target directories)
+            # reuse the template environments and templates in `template_cache`.
+            object.__setattr__(
+                execution_context, "_template_loader", self.get_template_loader()
+            )
+        return execution_context
 
 
 @dataclass(frozen=True)
@@ -35,19 +117,38 @@ class BaseContext:
     execution_context: ExecutionContext
 
     @classmethod
-    def from_dict(cls: Type[TContext], field_dict: DictContext) -> TContext:
+    def from_dict(
+        cls: Type[TContext],
+        field_dict: DictContext,
+        parameter_names: Optional[FrozenSet[str]] = None,
+    ) -> TContext:
         """Return instance of context, ignoring unknown keys in `field_dict`.
 
+        Pass `parameter_names` if the names of fields accepted by the context are
+        already known (e.g. from an `OperationPlan`), to skip looking them up.
+
         Adapted from https://stackoverflow.com/a/55096964/260303.
         """
+        if parameter_names is None:
+            parameter_names = get_init_parameter_names(cast(Hashable, cls))
         return cls(
             **{
                 key: value
                 for key, value in field_dict.items()
-                if key in inspect.signature(cls).parameters
+                if key in parameter_names
             }
         )
 
     @classmethod
     def help(cls, field_name: str) -> Optional[str]:
         return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_init_parameter_names(cls: Type[Any]) -> FrozenSet[str]:
+    """Return names of parameters accepted by a class's constructor.
+
+    Results are cached since `inspect.signature` is slow and contexts are created for
+    every operation executed.
+    """
+    return frozenset(inspect.signature(cls).parameters)
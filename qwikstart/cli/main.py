@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
+from pathlib import Path
+from typing import Optional
+
 import click
 
 from ..exceptions import UserFacingError
 from ..parser import get_operations_mapping
+from ..repository import lock_cached_repos
 from ..utils import logging
 from . import utils
 from .resolver import resolve_task
@@ -21,12 +25,73 @@ def cli() -> None:
 )
 @click.option("--dry-run", is_flag=True, help="Enable dry run execution.")
 @click.option("--repo", help="Url for repo containing qwikstart task", default=None)
-def run(task_path: str, verbose: bool, dry_run: bool, repo: str) -> None:
-    """Run task in the current directory."""
+@click.option(
+    "--max-workers",
+    type=int,
+    default=1,
+    help="Number of threads used to run independent steps concurrently.",
+)
+@click.option(
+    "--offline", is_flag=True, help="Use cached repos without fetching updates."
+)
+@click.option(
+    "--no-lint", is_flag=True, help="Only lint task specs that fail to parse."
+)
+@click.option(
+    "--targets",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="File listing target directories (one per line) to run the task against.",
+)
+@click.option(
+    "--target-workers",
+    type=int,
+    default=1,
+    help="Number of processes used to run the task against targets in parallel.",
+)
+def run(
+    task_path: str,
+    verbose: bool,
+    dry_run: bool,
+    repo: str,
+    max_workers: int,
+    offline: bool,
+    no_lint: bool,
+    targets: Optional[str],
+    target_workers: int,
+) -> None:
+    """Run task in the current directory, or in each directory listed in `--targets`."""
     logging.configure_logger("DEBUG" if verbose else "INFO")
-    execution_config = {"dry_run": dry_run}
-    task = resolve_task(task_path, repo_url=repo, execution_config=execution_config)
-    task.execute()
+    execution_config = {
+        "dry_run": dry_run,
+        "max_workers": max_workers,
+        "offline": offline,
+        "lazy_lint": no_lint,
+    }
+    # Keep cached repos locked while the task is loaded and run, so that other runs
+    # don't update them in the meantime.
+    with lock_cached_repos():
+        task = resolve_task(task_path, repo_url=repo, execution_config=execution_config)
+        if targets is None:
+            task.execute()
+            return
+
+        target_dirs = utils.read_target_dirs(Path(targets))
+        results = task.execute_for_targets(target_dirs, max_workers=target_workers)
+    for result in results:
+        if result.succeeded:
+            click.echo(click.style("succeeded", fg="green") + f": {result.target_dir}")
+        else:
+            click.echo(
+                click.style("failed", fg="red")
+                + f": {result.target_dir}: {result.error}"
+            )
+
+    failures = [result for result in results if not result.succeeded]
+    if failures:
+        raise UserFacingError(
+            f"Task failed for {len(failures)} of {len(results)} targets"
+        )
 
 
 @cli.command()
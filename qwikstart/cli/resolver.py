@@ -1,9 +1,12 @@
 from typing import Any, Dict, Optional
 
 from .. import repository
+from ..config import Config, get_user_config
 from ..exceptions import RepoLoaderError, UserFacingError
 from ..parser import parse_task
 from ..tasks import Task
+from ..utils.file_buffer import FileBuffer
+from ..utils.templates import TemplateCache, create_bytecode_cache
 
 
 def resolve_task(
@@ -11,11 +14,31 @@ def resolve_task(
     repo_url: Optional[str] = None,
     execution_config: Optional[Dict[str, Any]] = None,
 ) -> Task:
+    execution_config = execution_config or {}
+    offline = execution_config.get("offline", False)
+    lazy_lint = execution_config.get("lazy_lint", False)
     try:
-        loader = repository.get_repo_loader(task_path, repo_url)
+        loader = repository.get_repo_loader(
+            task_path, repo_url, offline=offline, lazy_lint=lazy_lint
+        )
     except RepoLoaderError as error:
         raise UserFacingError(str(error)) from error
 
-    execution_config = execution_config or {}
     execution_config.setdefault("source_dir", loader.repo_path)
+    # Batch file edits so that each file is written once, when the task completes.
+    dry_run = execution_config.get("dry_run", False)
+    execution_config.setdefault("file_buffer", FileBuffer(dry_run=dry_run))
+
+    template_cache = create_template_cache(get_user_config())
+    if template_cache is not None:
+        execution_config.setdefault("template_cache", template_cache)
+
     return parse_task(loader.task_spec, execution_config=execution_config)
+
+
+def create_template_cache(config: Config) -> Optional[TemplateCache]:
+    """Return template cache backed by persistent bytecode cache, if configured."""
+    if config.bytecode_cache_path is None:
+        return None
+    bytecode_cache = create_bytecode_cache(config.bytecode_cache_path)
+    return TemplateCache(bytecode_cache=bytecode_cache)
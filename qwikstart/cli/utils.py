@@ -13,7 +13,7 @@ from qwikstart.operations import BaseOperation
 from ..parser import get_operations_mapping
 from ..utils import get_dataclass_values, strip_empty_lines
 
-__all__ = ["get_operation_help", "OperationHelp"]
+__all__ = ["get_operation_help", "OperationHelp", "read_target_dirs"]
 
 
 def get_template_environment() -> Environment:
@@ -112,3 +112,10 @@ def get_output_annotations(operation: Type[BaseOperation[Any, Any]]) -> List[Var
             )
         ]
     return []
+
+
+def read_target_dirs(file_path: Path) -> List[Path]:
+    """Return target directories listed in file, ignoring blank lines and comments."""
+    with file_path.open() as f:
+        lines = [line.strip() for line in f]
+    return [Path(line) for line in lines if line and not line.startswith("#")]
@@ -1,7 +1,7 @@
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from . import utils
 from .exceptions import ConfigurationError
@@ -11,8 +11,20 @@ logger = logging.getLogger(__name__)
 
 QWIKSTART_CONFIG_FILE = Path("~/.qwikstart/config.yml").expanduser()
 
+#: Values accepted by the `lint` config.
+LINT_MODES = ("strict", "lazy")
+
 DEFAULT_CONFIG_DICT: Dict[str, Any] = {
     "repo_cache": "~/.qwikstart/cached_repos",
+    "bytecode_cache": None,
+    "repo_cache_ttl": None,
+    "http_cache": "~/.qwikstart/http_cache",
+    "http_timeout": 10,
+    "http_retries": 3,
+    "offline": False,
+    "git_clone_depth": None,
+    "git_sparse_checkout": False,
+    "lint": "strict",
     "git_abbreviations": {
         "gh": "https://github.com/{0}",
         "gl": "https://gitlab.com/{0}",
@@ -25,13 +37,86 @@ DEFAULT_CONFIG_DICT: Dict[str, Any] = {
 class Config:
     repo_cache: str
     git_abbreviations: Dict[str, str]
+    bytecode_cache: Optional[str] = None
+    #: Seconds after syncing a cached repo during which it's used without fetching.
+    repo_cache_ttl: Optional[float] = None
+    #: If True, cached repos are used without fetching updates from remotes.
+    offline: bool = False
+    #: Directory where task specs read from urls are cached; None disables caching.
+    http_cache: Optional[str] = "~/.qwikstart/http_cache"
+    #: Seconds to wait for servers to respond when reading task specs from urls.
+    http_timeout: Optional[float] = 10
+    #: Number of times failed requests for task specs are retried.
+    http_retries: int = 3
+    #: Number of commits fetched when cloning or updating repos; None fetches all.
+    git_clone_depth: Optional[int] = None
+    #: If True, only the part of a repo used by a task is checked out.
+    git_sparse_checkout: bool = False
+    #: If "lazy", task specs are only linted if they fail to parse.
+    lint: str = "strict"
+
+    def __post_init__(self) -> None:
+        if self.lint not in LINT_MODES:
+            msg = f"Expected lint config to be one of {LINT_MODES}, got {self.lint!r}."
+            raise ConfigurationError(msg)
 
     @property
     def repo_cache_path(self) -> Path:
         return Path(self.repo_cache).expanduser()
 
+    @property
+    def http_cache_path(self) -> Optional[Path]:
+        if self.http_cache is None:
+            return None
+        return Path(self.http_cache).expanduser()
+
+    @property
+    def lint_cache_path(self) -> Path:
+        """Return directory where task specs that passed linting are recorded."""
+        return self.repo_cache_path / ".lint_cache"
+
+    @property
+    def bytecode_cache_path(self) -> Optional[Path]:
+        if self.bytecode_cache is None:
+            return None
+        return Path(self.bytecode_cache).expanduser()
+
+
+#: Config returned by `get_user_config` and the modification time of the config file
+#: when the config was loaded.
+_cached_user_config: Optional[Tuple[Optional[int], Config]] = None
+
 
 def get_user_config() -> Config:
+    """Return user config, which is loaded once and reloaded if the config file changes.
+
+    The config is cached for the lifetime of the process. Use `reload_user_config` to
+    force a reload.
+    """
+    global _cached_user_config
+    config_file_mtime = get_config_file_mtime()
+    if _cached_user_config is None or _cached_user_config[0] != config_file_mtime:
+        _cached_user_config = (config_file_mtime, load_user_config())
+    return _cached_user_config[1]
+
+
+def reload_user_config() -> Config:
+    """Clear cached user config and return newly loaded config."""
+    global _cached_user_config
+    _cached_user_config = None
+    return get_user_config()
+
+
+def get_config_file_mtime() -> Optional[int]:
+    """Return modification time of user config file, or None if it doesn't exist."""
+    try:
+        return QWIKSTART_CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_user_config() -> Config:
+    """Return user config loaded from config file, merged with default config."""
     user_config = load_custom_config_file()
     known_config_keys = set(utils.get_dataclass_keys(Config))
 
@@ -49,7 +134,7 @@ def get_user_config() -> Config:
 def load_custom_config_file() -> Dict[str, Any]:
     if QWIKSTART_CONFIG_FILE.exists():
         logger.debug(f"Loading user config from {QWIKSTART_CONFIG_FILE}")
-        user_config = io.load_yaml_file(QWIKSTART_CONFIG_FILE)
+        user_config = io.safe_load_yaml_file(QWIKSTART_CONFIG_FILE)
 
         if not user_config:
             return {}
@@ -1,27 +1,25 @@
-from . import (
-    add_file,
-    add_file_tree,
-    append_text,
-    context_from_regex,
-    define_context,
-    echo,
-    edit_json,
-    edit_yaml,
-    find_files,
-    find_tag_and_insert_text,
-    find_tagged_line,
-    insert_text,
-    prompt,
-    search_and_replace,
-    shell,
-    subtask,
+import importlib
+from types import ModuleType
+
+from .base import (
+    BaseOperation,
+    GenericOperation,
+    OperationConfig,
+    OperationPlan,
+    StepResources,
 )
-from .base import BaseOperation, GenericOperation, OperationConfig
+from .registry import OPERATION_MODULES, OPERATION_REGISTRY, OperationRegistry
 
 __all__ = [
     "BaseOperation",
     "GenericOperation",
+    "OPERATION_MODULES",
+    "OPERATION_REGISTRY",
     "OperationConfig",
+    "OperationPlan",
+    "OperationRegistry",
+    "StepResources",
+    "import_operation_module",
     "add_file",
     "add_file_tree",
     "append_text",
@@ -39,3 +37,15 @@ __all__ = [
     "shell",
     "subtask",
 ]
+
+
+def import_operation_module(module_name: str) -> ModuleType:
+    """Return operation module with the given name, importing it if needed."""
+    return importlib.import_module(f"{__name__}.{module_name}")
+
+
+def __getattr__(name: str) -> ModuleType:
+    # Import operation modules on attribute access, e.g. `operations.echo`.
+    if name in OPERATION_MODULES.values():
+        return import_operation_module(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
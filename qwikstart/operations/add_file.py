@@ -1,4 +1,5 @@
 import logging
+import os
 import shutil
 import textwrap
 from dataclasses import dataclass, field
@@ -7,8 +8,12 @@ from typing import Any, Dict, Optional, Union
 
 from ..base_context import BaseContext
 from ..utils import ensure_path
-from ..utils.templates import DEFAULT_TEMPLATE_VARIABLE_PREFIX, TemplateRenderer
-from .base import BaseOperation
+from ..utils.templates import (
+    DEFAULT_TEMPLATE_VARIABLE_PREFIX,
+    TemplateRenderer,
+    contains_template_syntax,
+)
+from .base import BaseOperation, StepResources
 from .utils import TEMPLATE_VARIABLE_PREFIX_HELP
 
 __all__ = ["Operation"]
@@ -52,6 +57,21 @@ class Operation(BaseOperation[Context, None]):
 
     name: str = "add_file"
 
+    def infer_resources(self) -> Optional[StepResources]:
+        # Paths are only known before execution if they're defined by the step, and
+        # aren't templates rendered using context variables.
+        paths = [
+            self.local_context.get(key) for key in ("target_path", "template_path")
+        ]
+        if any(path is None or contains_template_syntax(str(path)) for path in paths):
+            return None
+        # Normalize paths, so that equivalent paths used by other steps conflict. The
+        # template path is relative to the source directory, which is usually the
+        # working directory when templates are written by earlier steps.
+        target_path, template_path = [os.path.abspath(str(path)) for path in paths]
+        reads = self.get_context_reads() | {template_path}
+        return StepResources(reads=reads, writes=frozenset([target_path]))
+
     def run(self, context: Context) -> None:
         renderer = TemplateRenderer.from_context(context)
 
@@ -63,8 +83,10 @@ class Operation(BaseOperation[Context, None]):
         with ensure_path(context.target_path).open("w") as f:
             f.write(renderer.render(context.template_path))
 
-        # Copy file mode (i.e. permissions) of template to target file.
+        # Copy file mode (i.e. permissions) of template to target file. In-memory
+        # templates (see `ExecutionContext.template_sources`) have no file mode.
         resolved_template_path = renderer.resolve_template_path(context.template_path)
-        shutil.copymode(resolved_template_path, context.target_path)
+        if resolved_template_path.exists():
+            shutil.copymode(resolved_template_path, context.target_path)
 
         logger.info(f"Wrote file to {context.target_path}")
@@ -35,6 +35,24 @@ CONTEXT_HELP = {
             wildcards are accepted. See https://docs.python.org/3/library/fnmatch.html
         """
     ),
+    "max_workers": textwrap.dedent(
+        """
+            Number of workers used to render and copy files concurrently. The default,
+            1, copies files serially.
+        """
+    ),
+    "executor": textwrap.dedent(
+        """
+            Type of worker pool used when `max_workers` is greater than 1: "thread"
+            (best for I/O-bound copies) or "process" (best for CPU-heavy rendering).
+        """
+    ),
+    "incremental": textwrap.dedent(
+        """
+            Skip writing files whose rendered contents already match the target file,
+            which avoids triggering file watchers and rebuilds when re-running a task.
+        """
+    ),
 }
 
 
@@ -45,6 +63,9 @@ class Context(BaseContext):
     template_variables: Dict[str, Any] = field(default_factory=dict)
     template_variable_prefix: str = DEFAULT_TEMPLATE_VARIABLE_PREFIX
     ignore: List[str] = field(default_factory=list)
+    max_workers: int = 1
+    executor: str = "thread"
+    incremental: bool = False
 
     @classmethod
     def help(cls, field_name: str) -> Optional[str]:
@@ -75,8 +96,17 @@ class Operation(BaseOperation[Context, None]):
             return
 
         generator = FileTreeGenerator(
-            Path(source), Path(target), renderer, ignore_patterns=context.ignore
+            Path(source),
+            Path(target),
+            renderer,
+            ignore_patterns=context.ignore,
+            max_workers=context.max_workers,
+            executor=context.executor,
+            incremental=context.incremental,
         )
-        generator.copy()
+        summary = generator.copy()
 
-        logger.info(f"Add file tree at {target}")
+        logger.info(
+            f"Add file tree at {target} "
+            f"({summary.written} written, {summary.skipped} unchanged)"
+        )
@@ -7,6 +7,7 @@ from typing import Optional
 from ..base_context import BaseContext
 from ..exceptions import OperationError
 from ..utils import ensure_path
+from ..utils.file_buffer import read_text, write_text
 from .base import BaseOperation
 from .utils import FILE_PATH_HELP
 
@@ -41,21 +42,28 @@ class Operation(BaseOperation[Context, None]):
     """
 
     name: str = "append_text"
+    uses_file_buffer = True
 
     def run(self, context: Context) -> None:
         file_path = ensure_path(context.file_path)
         if not file_path.is_file():
             raise OperationError(f"File does not exist: {file_path}")
 
-        if context.execution_context.dry_run:
+        execution_context = context.execution_context
+        if execution_context.skip_file_edits:
             logger.info(
                 f"Skipping append_text operation on {file_path} "
                 "due to `--dry-run` option"
             )
             return
 
-        with file_path.open("a") as f:
-            f.write(self.get_text(context))
+        file_buffer = execution_context.file_buffer
+        if file_buffer is None:
+            with file_path.open("a") as f:
+                f.write(self.get_text(context))
+        else:
+            contents = read_text(file_path, file_buffer) + self.get_text(context)
+            write_text(file_path, contents, file_buffer)
 
     def get_text(self, context: Context) -> str:
         return "".join([context.prefix, context.text, context.suffix])
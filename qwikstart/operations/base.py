@@ -1,13 +1,21 @@
 import abc
+import asyncio
+import copy
 import logging
+import os
 from collections import ChainMap
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import (
     Any,
     Dict,
+    FrozenSet,
     Generic,
+    Hashable,
+    Iterator,
     List,
     Mapping,
+    NamedTuple,
     Optional,
     Type,
     TypeVar,
@@ -16,9 +24,21 @@ from typing import (
 )
 
 from .. import utils
-from ..base_context import BaseContext, DictContext
+from ..base_context import BaseContext, DictContext, get_init_parameter_names
+from ..utils.dict_utils import (
+    CompiledKeyMapping,
+    compile_key_mapping,
+    remap_dict_with_key_paths,
+)
+from .registry import OPERATION_REGISTRY
 
-__all__ = ["BaseOperation", "GenericOperation", "OperationConfig"]
+__all__ = [
+    "BaseOperation",
+    "GenericOperation",
+    "OperationConfig",
+    "OperationPlan",
+    "StepResources",
+]
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +58,8 @@ DEFAULT_OPERATION_CONFIG: Dict[str, Any] = dict(
     input_namespace=None,
     output_namespace=None,
     display_description=True,
+    reads=None,
+    writes=None,
 )
 
 
@@ -48,6 +70,8 @@ class OperationConfig:
     input_namespace: Union[str, None]
     output_namespace: Union[str, None]
     display_description: Union[bool]
+    reads: Union[List[str], None]
+    writes: Union[List[str], None]
 
     @classmethod
     def create(cls: Type[TOperationConfig], **kwargs: Any) -> TOperationConfig:
@@ -69,12 +93,50 @@ class OperationConfig:
         return cls(**ChainMap(*ordered_dicts))
 
 
+class OperationPlan(NamedTuple):
+    """Details needed to execute an operation, resolved once when it's created.
+
+    Executing an operation (e.g. for each run of a task in a long-running process)
+    then only uses this plan, instead of re-deriving it from the operation class and
+    its `opconfig` for every step.
+    """
+
+    #: Context class passed to the operation's `run` method.
+    context_class: Type[BaseContext]
+    #: Names of fields accepted by `context_class`.
+    context_fields: FrozenSet[str]
+    input_mapping: CompiledKeyMapping
+    output_mapping: CompiledKeyMapping
+    input_namespace: Optional[str]
+    output_namespace: Optional[str]
+
+
+class StepResources(NamedTuple):
+    """Context variables and file paths read and written by an operation.
+
+    Used to find steps of a task that are independent and can run concurrently.
+    """
+
+    reads: FrozenSet[str] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+
+    def conflicts_with(self, other: "StepResources") -> bool:
+        """Return True if either step writes resources used by the other."""
+        return bool(
+            self.writes & (other.reads | other.writes) or other.writes & self.reads
+        )
+
+
 class BaseOperation(Generic[TContext, TOutput], metaclass=abc.ABCMeta):
     """An operation within a qwikstart `Task`"""
 
     name: str
     aliases: Optional[List[str]] = None
     default_opconfig: Dict[str, Any] = {}
+    #: Set to True for operations that read and write files through the execution
+    #: context's `file_buffer`. Buffered edits are written before running any other
+    #: operation, so that those operations see the edits on disk.
+    uses_file_buffer: bool = False
 
     def __init__(
         self,
@@ -87,38 +149,102 @@ class BaseOperation(Generic[TContext, TOutput], metaclass=abc.ABCMeta):
         self.opconfig = OperationConfig.from_config_dicts(
             self.default_opconfig, opconfig or {}
         )
+        self.plan = self.compile()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Register operations when defined. Skip intermediate classes without names.
+        if "name" in cls.__dict__:
+            OPERATION_REGISTRY.register(cls)
 
     @abc.abstractmethod
     def run(self, context: TContext) -> TOutput:
         """Override with action"""
 
+    async def arun(self, context: TContext) -> TOutput:
+        """Override with asynchronous action. By default, runs `run` in a thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run, context)
+
+    def compile(self) -> OperationPlan:
+        """Return plan for executing operation, which is reused for every execution."""
+        context_class = cast(Type[BaseContext], self.get_context_class())
+        return OperationPlan(
+            context_class=context_class,
+            context_fields=get_init_parameter_names(cast(Hashable, context_class)),
+            input_mapping=compile_key_mapping(self.opconfig.input_mapping),
+            output_mapping=compile_key_mapping(self.opconfig.output_mapping),
+            input_namespace=self.opconfig.input_namespace,
+            output_namespace=self.opconfig.output_namespace,
+        )
+
     def pre_run(self, context_dict: DictContext) -> TContext:
-        context_class = self.get_context_class()
-        context_dict = utils.remap_dict(context_dict, self.opconfig.input_mapping)
+        plan = self.plan
+        if plan.input_mapping:
+            context_dict = remap_dict_with_key_paths(context_dict, plan.input_mapping)
 
-        if self.opconfig.input_namespace is not None:
+        if plan.input_namespace is not None:
             context_dict = {
-                **context_dict[self.opconfig.input_namespace],
+                **context_dict[plan.input_namespace],
                 "execution_context": context_dict["execution_context"],
             }
 
-        merged_dict = utils.merge_nested_dicts(context_dict, self.local_context)
-        return context_class.from_dict(merged_dict)
+        if self.local_context:
+            # Copy local context, since the run context (and values merged into it by
+            # later operations) must not alias this operation's configuration.
+            local_context = copy.deepcopy(self.local_context)
+            context_dict = utils.merge_nested_dicts(context_dict, local_context)
+        context = plan.context_class.from_dict(context_dict, plan.context_fields)
+        return cast(TContext, context)
 
     def post_run(self, output: TOutput) -> DictContext:
         if not output:
             return {}
 
-        if self.opconfig.output_namespace is not None:
-            output = cast(TOutput, {self.opconfig.output_namespace: output})
+        plan = self.plan
+        if plan.output_namespace is not None:
+            output = cast(TOutput, {plan.output_namespace: output})
 
         # If output is not `None`, then it should be a dict; tell mypy.
-        return utils.remap_dict(cast(DictContext, output), self.opconfig.output_mapping)
+        return remap_dict_with_key_paths(cast(DictContext, output), plan.output_mapping)
 
     def execute(self, global_context: DictContext) -> Dict[str, Any]:
+        output_dict = self.get_output(global_context)
+        return utils.merge_nested_dicts(global_context, output_dict, inplace=True)
+
+    def get_output(self, global_context: DictContext) -> DictContext:
+        """Run operation and return output to be merged into the global context.
+
+        Unlike `execute`, the global context is not modified.
+        """
+        if not self.uses_file_buffer:
+            flush_file_buffer(global_context)
+
         context = self.pre_run(global_context)
-        try:
+        with self._log_result():
             output = self.run(context)
+        return self.post_run(output)
+
+    async def aexecute(self, global_context: DictContext) -> Dict[str, Any]:
+        """Asynchronous version of `execute`, which runs operation using `arun`."""
+        output_dict = await self.aget_output(global_context)
+        return utils.merge_nested_dicts(global_context, output_dict, inplace=True)
+
+    async def aget_output(self, global_context: DictContext) -> DictContext:
+        """Asynchronous version of `get_output`, which runs operation using `arun`."""
+        if not self.uses_file_buffer:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, flush_file_buffer, global_context)
+
+        context = self.pre_run(global_context)
+        with self._log_result():
+            output = await self.arun(context)
+        return self.post_run(output)
+
+    @contextmanager
+    def _log_result(self) -> Iterator[None]:
+        try:
+            yield
         except Exception:
             if self.description:
                 logger.error(f"{self.description}: {FAILURE_MARK}")
@@ -126,8 +252,44 @@ class BaseOperation(Generic[TContext, TOutput], metaclass=abc.ABCMeta):
         else:
             if self.description and self.opconfig.display_description:
                 logger.info(f"{self.description}: {SUCCESS_MARK}")
-        output_dict = self.post_run(output)
-        return utils.merge_nested_dicts(global_context, output_dict, inplace=True)
+
+    def get_resources(self) -> Optional[StepResources]:
+        """Return context variables and files used by operation, if known.
+
+        Resources declared by `opconfig.reads` and `opconfig.writes` take precedence
+        over those returned by `infer_resources`. If only one of them is declared, the
+        other falls back to inferred resources, or to context reads and no writes.
+        """
+        reads, writes = self.opconfig.reads, self.opconfig.writes
+        if reads is None and writes is None:
+            return self.infer_resources()
+        resources = self.infer_resources() or StepResources(
+            reads=self.get_context_reads()
+        )
+        if reads is not None:
+            resources = resources._replace(reads=normalize_declared_resources(reads))
+        if writes is not None:
+            resources = resources._replace(writes=normalize_declared_resources(writes))
+        return resources
+
+    def infer_resources(self) -> Optional[StepResources]:
+        """Override to return resources used by operation, or None if unknown.
+
+        Operations with unknown resources never run concurrently with other steps.
+        """
+        return None
+
+    def get_context_reads(self) -> FrozenSet[str]:
+        """Return names of global context variables that operation may read."""
+        if self.plan.input_namespace is not None:
+            return frozenset([self.plan.input_namespace])
+
+        field_names = self.plan.context_fields
+        # Include both sides of mapping, since either may be a global context variable.
+        input_mapping = self.opconfig.input_mapping
+        mapped_keys = [*input_mapping.keys(), *input_mapping.values()]
+        mapped_names = {key.split(".")[0] for key in mapped_keys}
+        return (field_names | mapped_names) - {"execution_context"}
 
     def __repr__(self) -> str:
         return (
@@ -153,3 +315,24 @@ class BaseOperation(Generic[TContext, TOutput], metaclass=abc.ABCMeta):
 
 
 GenericOperation = BaseOperation[BaseContext, Optional[DictContext]]
+
+
+def normalize_declared_resources(names: Optional[List[str]]) -> FrozenSet[str]:
+    """Return declared resource names along with their absolute paths.
+
+    Declared names may be context variables or file paths, so both forms are kept:
+    File paths inferred by operations (e.g. `add_file`) are absolute.
+    """
+    names = names or []
+    return frozenset([*names, *(os.path.abspath(name) for name in names)])
+
+
+def flush_file_buffer(global_context: DictContext) -> None:
+    """Write any edits in the execution context's `file_buffer` to disk.
+
+    In dry-run mode, edits are kept in the buffer so that later operations see them.
+    """
+    execution_context = global_context.get("execution_context")
+    file_buffer = getattr(execution_context, "file_buffer", None)
+    if file_buffer is not None and not file_buffer.dry_run:
+        file_buffer.flush()
@@ -6,7 +6,7 @@ from typing import Dict, List, Optional
 
 from ..base_context import BaseContext
 from ..exceptions import OperationError
-from ..utils import clean_multiline, create_regex_flags, ensure_path, io
+from ..utils import clean_multiline, create_regex_flags, ensure_path
 from .base import BaseOperation
 from .utils import FILE_PATH_HELP, REGEX_FLAGS_HELP
 
@@ -56,7 +56,7 @@ class Operation(BaseOperation[Context, Dict[str, str]]):
                 f"At least one named capture group required in regex: {regex}"
             )
 
-        text = io.read_file_contents(ensure_path(context.file_path))
+        text = self.read_text(context)
         data = {}
         for match in regex.finditer(text):
             data.update(
@@ -74,3 +74,10 @@ class Operation(BaseOperation[Context, Dict[str, str]]):
             )
 
         return data
+
+    def read_text(self, context: Context) -> str:
+        file_path = ensure_path(context.file_path)
+        text = context.execution_context.file_index.read_text(str(file_path))
+        if text is None:
+            raise OperationError(f"Cannot search binary file {file_path}")
+        return text
@@ -6,6 +6,7 @@ from typing import Any, Dict, Optional
 
 from ..base_context import BaseContext
 from ..utils import ensure_path, merge_nested_dicts, pformat_json
+from ..utils.file_buffer import read_text, write_text
 from .base import BaseOperation
 from .utils import FILE_PATH_HELP
 
@@ -37,19 +38,20 @@ class Operation(BaseOperation[Context, None]):
     """
 
     name: str = "edit_json"
+    uses_file_buffer = True
 
     def run(self, context: Context) -> None:
         file_path = ensure_path(context.file_path)
-        with file_path.open() as f:
-            data = json.load(f)
+        file_buffer = context.execution_context.file_buffer
+        data = json.loads(read_text(file_path, file_buffer))
 
         data = merge_nested_dicts(data, context.merge_data)
 
-        if context.execution_context.dry_run:
+        if context.execution_context.skip_file_edits:
             self.on_dry_run(file_path, context.merge_data)
         else:
-            with file_path.open("w") as f:
-                json.dump(data, f, indent=context.indent)
+            json_string = json.dumps(data, indent=context.indent)
+            write_text(file_path, json_string, file_buffer)
 
     @staticmethod
     def on_dry_run(file_path: Path, merge_data: Dict[str, Any]) -> None:
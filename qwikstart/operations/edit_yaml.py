@@ -5,6 +5,7 @@ from typing import Any, Dict, Optional
 
 from ..base_context import BaseContext
 from ..utils import ensure_path, io, merge_nested_dicts, pformat_json
+from ..utils.file_buffer import read_text, write_text
 from .base import BaseOperation
 from .utils import FILE_PATH_HELP
 
@@ -35,17 +36,24 @@ class Operation(BaseOperation[Context, None]):
     """
 
     name: str = "edit_yaml"
+    uses_file_buffer = True
 
     def run(self, context: Context) -> None:
         file_path = ensure_path(context.file_path)
+        file_buffer = context.execution_context.file_buffer
 
-        data = io.load_yaml_file(file_path)
+        if file_buffer is None:
+            data = io.load_yaml_file(file_path)
+        else:
+            data = io.load_yaml_string(read_text(file_path, file_buffer))
         data = merge_nested_dicts(data, context.merge_data, inplace=True)
 
-        if context.execution_context.dry_run:
+        if context.execution_context.skip_file_edits:
             self.on_dry_run(file_path, context.merge_data)
-        else:
+        elif file_buffer is None:
             io.dump_yaml_file(data, file_path)
+        else:
+            write_text(file_path, io.dump_yaml_string(data), file_buffer)
 
     @staticmethod
     def on_dry_run(file_path: Path, merge_data: Dict[str, Any]) -> None:
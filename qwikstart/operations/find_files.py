@@ -1,13 +1,12 @@
 import logging
-import os
 import re
 import textwrap
 from dataclasses import dataclass, field
-from fnmatch import fnmatch
-from typing import Callable, Dict, Iterable, List, Optional, cast
+from typing import Dict, Iterable, List, Optional, Sequence
 
 from ..base_context import BaseContext
-from ..utils import create_regex_flags
+from ..utils import create_regex_flags, search
+from ..utils.file_index import FileContentIndex
 from .base import BaseOperation
 from .utils import REGEX_FLAGS_HELP
 
@@ -28,6 +27,15 @@ CONTEXT_HELP = {
         """
     ),
     "regex_flags": REGEX_FLAGS_HELP,
+    "ignore": textwrap.dedent(
+        """
+        List of file and directory patterns to skip. Matching directories are not
+        searched at all, so this can greatly speed up searches of large repositories;
+        e.g. [".git", "node_modules"]. Unix-shell-style wildcards are accepted.
+        """
+    ),
+    "use_gitignore": "Skip files and directories ignored by `.gitignore` files.",
+    "max_workers": "Number of threads used to search file contents concurrently.",
 }
 
 
@@ -38,6 +46,9 @@ class Context(BaseContext):
     output_name: str = "matching_files"
     path_filter: Optional[str] = None
     regex_flags: List[str] = field(default_factory=list)
+    ignore: List[str] = field(default_factory=list)
+    use_gitignore: bool = False
+    max_workers: int = 1
 
     @classmethod
     def help(cls, field_name: str) -> Optional[str]:
@@ -56,42 +67,36 @@ class Operation(BaseOperation[Context, Dict[str, List[str]]]):
         regex_flags = create_regex_flags(context.regex_flags)
         regex = re.compile(context.regex, flags=regex_flags) if context.regex else None
 
-        matching_files = []
-        for filename in iter_path(context.directory, context.path_filter):
-            if regex:
-                try:
-                    with open(filename) as f:
-                        file_contents = f.read()
-                except (IOError, UnicodeDecodeError):
-                    logger.debug(f"Failed to read file {filename}")
-                    continue
-
-                if not regex.search(file_contents):
-                    continue
-
-            matching_files.append(filename)
-
-        return {context.output_name: matching_files}
-
-
-def iter_path(root_directory: str, path_filter_string: Optional[str]) -> Iterable[str]:
-    path_filter = create_path_filter(path_filter_string)
-    for root, dirs, files in os.walk(root_directory):
-        for filename in files:
-            filename = os.path.join(root, filename)
-            if path_filter(filename):
-                yield filename
-
-
-def create_path_filter(path_filter_string: Optional[str]) -> Callable[[str], bool]:
-    if not path_filter_string:
-
-        def path_filter(path: str) -> bool:
-            return True
-
-    else:
-
-        def path_filter(path: str) -> bool:
-            return fnmatch(path, cast(str, path_filter_string))
-
-    return path_filter
+        file_index = context.execution_context.file_index
+        matching_files = iter_path(
+            context.directory,
+            context.path_filter,
+            ignore_patterns=context.ignore,
+            use_gitignore=context.use_gitignore,
+            file_index=file_index,
+        )
+        if regex:
+            matching_files = search.search_files(
+                matching_files,
+                regex,
+                max_workers=context.max_workers,
+                file_index=file_index,
+            )
+
+        return {context.output_name: list(matching_files)}
+
+
+def iter_path(
+    root_directory: str,
+    path_filter_string: Optional[str],
+    ignore_patterns: Sequence[str] = (),
+    use_gitignore: bool = False,
+    file_index: Optional[FileContentIndex] = None,
+) -> Iterable[str]:
+    return search.iter_files(
+        root_directory,
+        path_filter=path_filter_string or None,
+        ignore_patterns=ignore_patterns,
+        use_gitignore=use_gitignore,
+        file_index=file_index,
+    )
@@ -45,19 +45,21 @@ class Operation(BaseOperation[Context, None]):
     """
 
     name: str = "find_tag_and_insert_text"
+    uses_file_buffer = True
 
     def run(self, context: Context) -> None:
         file_path = ensure_path(context.file_path)
-        output = find_tagged_line_in_file(file_path, context.tag)
+        file_buffer = context.execution_context.file_buffer
+        output = find_tagged_line_in_file(file_path, context.tag, file_buffer)
         text = self.get_text(context, output["column"])
 
-        if context.execution_context.dry_run:
+        if context.execution_context.skip_file_edits:
             logger.info(
                 f"Skipping insert of text to file {file_path} due to `--dry-run` option"
             )
             return
 
-        insert_text_in_file(file_path, output["line"], text)
+        insert_text_in_file(file_path, output["line"], text, file_buffer)
 
     def get_text(self, context: Context, column: int) -> str:
         text = context.text
@@ -8,6 +8,7 @@ from typing_extensions import TypedDict
 from ..base_context import BaseContext
 from ..exceptions import OperationError
 from ..utils import ensure_path
+from ..utils.file_buffer import FileBuffer, read_lines
 from .base import BaseOperation
 from .utils import FILE_PATH_HELP
 
@@ -45,18 +46,21 @@ class Operation(BaseOperation[Context, Output]):
     """
 
     name: str = "find_tagged_line"
+    uses_file_buffer = True
 
     def run(self, context: Context) -> Output:
         file_path = ensure_path(context.file_path)
-        return find_tagged_line_in_file(file_path, context.tag)
-
-
-def find_tagged_line_in_file(file_path: Path, tag: str) -> Output:
-    with file_path.open() as f:
-        for line_number, line in enumerate(f, 1):
-            if tag in line:
-                column = line.find(tag)
-                return Output(line=line_number, column=column)
-        else:
-            msg = f"Failed to find line in {file_path} tagged with {tag!r}"
-            raise OperationError(msg)
+        file_buffer = context.execution_context.file_buffer
+        return find_tagged_line_in_file(file_path, context.tag, file_buffer)
+
+
+def find_tagged_line_in_file(
+    file_path: Path, tag: str, file_buffer: Optional[FileBuffer] = None
+) -> Output:
+    for line_number, line in enumerate(read_lines(file_path, file_buffer), 1):
+        if tag in line:
+            column = line.find(tag)
+            return Output(line=line_number, column=column)
+    else:
+        msg = f"Failed to find line in {file_path} tagged with {tag!r}"
+        raise OperationError(msg)
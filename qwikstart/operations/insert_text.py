@@ -6,6 +6,7 @@ from typing import Optional
 
 from ..base_context import BaseContext
 from ..utils import ensure_path, indent
+from ..utils.file_buffer import FileBuffer, read_lines, write_text
 from .base import BaseOperation
 from .utils import FILE_PATH_HELP
 
@@ -45,18 +46,22 @@ class Operation(BaseOperation[Context, None]):
     """
 
     name: str = "insert_text"
+    uses_file_buffer = True
 
     def run(self, context: Context) -> None:
         file_path = ensure_path(context.file_path)
         text = self.get_text(context)
 
-        if context.execution_context.dry_run:
+        execution_context = context.execution_context
+        if execution_context.skip_file_edits:
             logger.info(
                 f"Skipping insert of text to file {file_path} due to `--dry-run` option"
             )
             return
 
-        insert_text_in_file(file_path, context.line, text)
+        insert_text_in_file(
+            file_path, context.line, text, execution_context.file_buffer
+        )
 
     def get_text(self, context: Context) -> str:
         text = context.text
@@ -67,11 +72,12 @@ class Operation(BaseOperation[Context, None]):
         return text
 
 
-def insert_text_in_file(file_path: Path, line_number: int, text: str) -> None:
-    with file_path.open() as f:
-        contents = f.readlines()
-
+def insert_text_in_file(
+    file_path: Path,
+    line_number: int,
+    text: str,
+    file_buffer: Optional[FileBuffer] = None,
+) -> None:
+    contents = read_lines(file_path, file_buffer)
     contents.insert(line_number, text)
-
-    with file_path.open("w") as f:
-        f.writelines(contents)
+    write_text(file_path, "".join(contents), file_buffer)
@@ -1,7 +1,7 @@
 import logging
 import textwrap
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, FrozenSet, List, Optional, Type
 
 from ..base_context import BaseContext, DictContext, TContext
 from ..exceptions import OperationDefinitionError, OperationError
@@ -51,14 +51,18 @@ class Context(BaseContext):
         return CONTEXT_HELP.get(field_name)
 
     @classmethod
-    def from_dict(cls: Type[TContext], field_dict: DictContext) -> TContext:
+    def from_dict(
+        cls: Type[TContext],
+        field_dict: DictContext,
+        parameter_names: Optional[FrozenSet[str]] = None,
+    ) -> TContext:
         # FIXME: Remove in v0.5; Support "prompts" for backwards compatibility
         if "prompts" in field_dict:
             field_dict = {
                 "inputs": field_dict["prompts"],
                 **{k: v for k, v in field_dict.items() if k != "prompts"},
             }
-        return super().from_dict(field_dict)  # type: ignore
+        return super().from_dict(field_dict, parameter_names)  # type: ignore
 
 
 class Operation(BaseOperation[Context, Output]):
@@ -101,7 +105,7 @@ class Operation(BaseOperation[Context, Output]):
 
         for input_description in context.inputs:
             if "choices_from" in input_description:
-                self._resolve_input_choices_from_template_variables(
+                input_description = self._resolve_input_choices_from_template_variables(
                     input_description, context.template_variables
                 )
             prompt_spec = create_prompt_spec(**input_description)
@@ -118,12 +122,14 @@ class Operation(BaseOperation[Context, Output]):
 
     def _resolve_input_choices_from_template_variables(
         self, input_description: Dict[str, Any], template_variables: Dict[str, Any]
-    ) -> None:
-        """Update `input_description` with `choices` resolved from `template_variables`.
+    ) -> Dict[str, Any]:
+        """Return copy of `input_description` with `choices` from `template_variables`.
 
         The `choices_from` value in `input_description` should be a variable name in
-        `template_variables` mapping to a list of input choices.
+        `template_variables` mapping to a list of input choices. The original input
+        description isn't modified, since it may be shared with the global context.
         """
+        input_description = dict(input_description)
         variable_name = input_description.pop("choices_from")
         choices = template_variables.get(variable_name)
         if not choices:
@@ -133,3 +139,4 @@ class Operation(BaseOperation[Context, Output]):
                 f"not found in template variables: {template_variables}"
             )
         input_description["choices"] = choices
+        return input_description
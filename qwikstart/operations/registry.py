@@ -0,0 +1,157 @@
+"""
+Registry of operation classes, keyed by operation name and aliases.
+
+Operations are registered when their classes are defined (see
+`BaseOperation.__init_subclass__`), so lookups never need to scan subclasses.
+"""
+import importlib
+import logging
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Type,
+    cast,
+)
+
+if TYPE_CHECKING:
+    from .base import GenericOperation
+
+__all__ = [
+    "ENTRY_POINT_GROUP",
+    "OPERATION_MODULES",
+    "OPERATION_REGISTRY",
+    "OperationRegistry",
+]
+
+logger = logging.getLogger(__name__)
+
+#: Entry-point group that packages can use to provide additional operations, e.g.
+#: `my_op = "my_package.my_module:Operation"`.
+ENTRY_POINT_GROUP = "qwikstart.operations"
+
+#: Map operation names (and aliases) to the modules defining those operations.
+#: Operation modules are imported on first use, since some depend on libraries that are
+#: slow to import (e.g. `prompt_toolkit` and `gitpython`).
+OPERATION_MODULES: Dict[str, str] = {
+    "add_file": "add_file",
+    "add_file_tree": "add_file_tree",
+    "append_text": "append_text",
+    "context_from_regex": "context_from_regex",
+    "define_context": "define_context",
+    "echo": "echo",
+    "edit_json": "edit_json",
+    "edit_yaml": "edit_yaml",
+    "find_files": "find_files",
+    "find_tag_and_insert_text": "find_tag_and_insert_text",
+    "find_tagged_line": "find_tagged_line",
+    "insert_text": "insert_text",
+    "prompt": "prompt",
+    "prompt_user": "prompt",
+    "search_and_replace": "search_and_replace",
+    "shell": "shell",
+    "subtask": "subtask",
+}
+
+
+class OperationRegistry(Mapping[str, Type["GenericOperation"]]):
+    """Mapping of operation names (and aliases) to operation classes.
+
+    Args:
+        lazy_modules: Map operation names to importable module names. A module is
+            imported when its operation is first looked up, which registers it.
+        entry_point_group: Name of entry-point group used to find operations defined
+            by other packages. Entry points are only loaded if an operation isn't
+            found otherwise, or when listing all operations.
+    """
+
+    def __init__(
+        self,
+        lazy_modules: Optional[Mapping[str, str]] = None,
+        entry_point_group: Optional[str] = None,
+    ):
+        self._operations: Dict[str, Type["GenericOperation"]] = {}
+        self._lazy_modules = dict(lazy_modules or {})
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = entry_point_group is None
+        self._lock = threading.RLock()
+
+    def register(self, operation_class: Type[Any]) -> None:
+        """Register operation class using its name and any aliases.
+
+        Names replace previously registered operations, but aliases never do.
+        """
+        with self._lock:
+            self._operations[operation_class.name] = operation_class
+            for alias in operation_class.aliases or []:
+                self._operations.setdefault(alias, operation_class)
+
+    def __getitem__(self, name: str) -> Type["GenericOperation"]:
+        operation_class = self._operations.get(name)
+        if operation_class is not None:
+            return operation_class
+
+        with self._lock:
+            if name not in self._operations and name in self._lazy_modules:
+                importlib.import_module(self._lazy_modules[name])
+            if name not in self._operations:
+                self.load_entry_points()
+            return self._operations[name]
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._operations or name in self._lazy_modules:
+            return True
+        self.load_entry_points()
+        return name in self._operations
+
+    def __iter__(self) -> Iterator[str]:
+        self.load_entry_points()
+        # Use dict to remove duplicate names while preserving order.
+        names = dict.fromkeys(self._lazy_modules)
+        names.update(dict.fromkeys(self._operations))
+        return iter(names)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def load_entry_points(self) -> None:
+        """Register operations provided by entry points, if not already loaded."""
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            # `_entry_points_loaded` is False only if the group is defined.
+            group = cast(str, self._entry_point_group)
+            for entry_point in iter_entry_points(group):
+                try:
+                    self.register(entry_point.load())
+                except Exception:
+                    logger.warning(f"Failed to load operation from {entry_point}")
+
+
+def iter_entry_points(group: str) -> Iterable[Any]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover
+        # Entry points aren't supported for Python < 3.8.
+        return []
+
+    # The return type depends on the Python version, so don't type-check it.
+    all_entry_points: Any = entry_points()
+    if hasattr(all_entry_points, "select"):
+        return list(all_entry_points.select(group=group))
+    # Python < 3.10 returns a dict of entry points keyed by group.
+    return list(all_entry_points.get(group, []))  # pragma: no cover
+
+
+OPERATION_REGISTRY = OperationRegistry(
+    lazy_modules={
+        name: f"{__package__}.{module}" for name, module in OPERATION_MODULES.items()
+    },
+    entry_point_group=ENTRY_POINT_GROUP,
+)
@@ -6,6 +6,7 @@ from typing import Optional
 
 from ..base_context import BaseContext
 from ..utils import ensure_path
+from ..utils.file_buffer import read_text, write_text
 from .base import BaseOperation
 from .utils import FILE_PATH_HELP
 
@@ -40,24 +41,23 @@ class Operation(BaseOperation[Context, None]):
     """
 
     name: str = "search_and_replace"
+    uses_file_buffer = True
 
     def run(self, context: Context) -> None:
         file_path = ensure_path(context.file_path)
-
-        with file_path.open() as f:
-            content_before = f.read()
+        file_buffer = context.execution_context.file_buffer
+        content_before = read_text(file_path, file_buffer)
 
         replace = search_and_replace_rx if context.use_regex else search_and_replace
         content_after = replace(context.search, context.replace, content_before)
 
-        if context.execution_context.dry_run:
+        if context.execution_context.skip_file_edits:
             logger.info(
                 f"Skipping search_and_replace on {file_path} due to `--dry-run` option"
             )
             return
 
-        with file_path.open("w") as f:
-            f.write(content_after)
+        write_text(file_path, content_after, file_buffer)
 
 
 def search_and_replace(search_text: str, replace_text: str, content: str) -> str:
@@ -1,9 +1,13 @@
+import collections
 import logging
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from ..base_context import BaseContext
+from ..exceptions import OperationDefinitionError
 from ..utils import text_utils
 from ..utils.templates import DEFAULT_TEMPLATE_VARIABLE_PREFIX, TemplateRenderer
 from .base import BaseOperation
@@ -13,6 +17,7 @@ __all__ = ["Operation"]
 
 logger = logging.getLogger(__name__)
 
+Command = Union[List[str], str]
 
 OUTPUT_PROCESSORS: Dict[str, Callable[[str], str]] = {
     "noop": text_utils.noop,
@@ -21,21 +26,32 @@ OUTPUT_PROCESSORS: Dict[str, Callable[[str], str]] = {
 
 CONTEXT_HELP = {
     "cmd": "Command or list of command arguments to run.",
+    "commands": "List of commands to run, instead of `cmd`.",
     "echo_output": "Toggle display of output to terminal.",
     "output_var": "Variable name in which output is stored.",
     "output_processor": f"Processor to run on output {OUTPUT_PROCESSORS.keys()}",
     "ignore_error_code": "Toggle check for error code returned by shell operation.",
+    "stream_output": (
+        "Toggle display of output line-by-line while commands run. Stderr is combined "
+        "with stdout when streaming."
+    ),
+    "max_output_lines": "Number of output lines kept in memory when streaming output.",
+    "max_workers": "Number of `commands` run concurrently.",
     "template_variable_prefix": TEMPLATE_VARIABLE_PREFIX_HELP,
 }
 
 
 @dataclass(frozen=True)
 class Context(BaseContext):
-    cmd: Union[List[str], str]
+    cmd: Optional[Command] = None
+    commands: List[Command] = field(default_factory=list)
     echo_output: bool = True
     ignore_error_code: bool = False
     output_processor: str = "strip"
     output_var: Optional[str] = None
+    stream_output: bool = False
+    max_output_lines: int = 1000
+    max_workers: int = 1
     template_variables: Dict[str, Any] = field(default_factory=dict)
     template_variable_prefix: str = DEFAULT_TEMPLATE_VARIABLE_PREFIX
 
@@ -44,6 +60,14 @@ class Context(BaseContext):
         return CONTEXT_HELP.get(field_name)
 
 
+class CommandResult(NamedTuple):
+    cmd: Command
+    returncode: int
+    output: str
+    #: Time taken to run command, in seconds.
+    duration: float
+
+
 class Operation(BaseOperation[Context, Dict[str, Any]]):
     """Operation to run an arbitrary shell command.
 
@@ -53,21 +77,59 @@ class Operation(BaseOperation[Context, Dict[str, Any]]):
     name: str = "shell"
 
     def run(self, context: Context) -> Dict[str, Any]:
-        renderer = TemplateRenderer.from_context(context)
-        if isinstance(context.cmd, list):
-            cmd = [renderer.render_string(arg) for arg in context.cmd]
-        else:
-            # FIXME: Ignore mypy complaint caused by `cmd` assignment to list above.
-            cmd = renderer.render_string(context.cmd)  # type: ignore
-
-        logger.info(f"Running command: {cmd}")
+        if (context.cmd is None) == (not context.commands):
+            raise OperationDefinitionError(
+                "Shell operation requires either `cmd` or `commands` (but not both)."
+            )
 
+        renderer = TemplateRenderer.from_context(context)
         if context.execution_context.dry_run:
             logger.warning(
                 "Running with `--dry-run` option, but shell operation will run "
                 "regardless of whether operation modifies filesystem."
             )
 
+        if context.cmd is not None:
+            result = run_command(render_command(context.cmd, renderer), context)
+            return {context.output_var: result.output} if context.output_var else {}
+
+        commands = [render_command(cmd, renderer) for cmd in context.commands]
+        with ThreadPoolExecutor(max_workers=context.max_workers) as executor:
+            futures = [
+                executor.submit(run_command, cmd, context, check=False)
+                for cmd in commands
+            ]
+            results = [future.result() for future in futures]
+
+        failed_results = [result for result in results if result.returncode != 0]
+        if failed_results and not context.ignore_error_code:
+            failure = failed_results[0]
+            raise subprocess.CalledProcessError(
+                failure.returncode, failure.cmd, output=failure.output
+            )
+
+        if not context.output_var:
+            return {}
+        return {context.output_var: [result._asdict() for result in results]}
+
+
+def render_command(cmd: Command, renderer: TemplateRenderer) -> Command:
+    if isinstance(cmd, list):
+        return [renderer.render_string(arg) for arg in cmd]
+    return renderer.render_string(cmd)
+
+
+def run_command(cmd: Command, context: Context, check: bool = True) -> CommandResult:
+    """Run command and return result, with output processed by `output_processor`.
+
+    Unless `check` is False, an error is raised for non-zero return codes if the
+    context doesn't set `ignore_error_code`.
+    """
+    logger.info(f"Running command: {cmd}")
+    start_time = time.perf_counter()
+    if context.stream_output:
+        returncode, raw_output = _run_streaming(cmd, context)
+    else:
         response = subprocess.run(
             cmd,
             shell=isinstance(cmd, str),
@@ -77,13 +139,37 @@ class Operation(BaseOperation[Context, Dict[str, Any]]):
             stderr=subprocess.PIPE,
             universal_newlines=True,
         )
-        if not context.ignore_error_code:
+        if check and not context.ignore_error_code:
             response.check_returncode()
-
-        process_output = OUTPUT_PROCESSORS[context.output_processor]
-        output = process_output(response.stdout)
-
-        if context.echo_output:
-            logger.info(output)
-
-        return {context.output_var: output} if context.output_var else {}
+        returncode, raw_output = response.returncode, response.stdout
+    duration = time.perf_counter() - start_time
+
+    if check and returncode != 0 and not context.ignore_error_code:
+        raise subprocess.CalledProcessError(returncode, cmd, output=raw_output)
+
+    process_output = OUTPUT_PROCESSORS[context.output_processor]
+    output = process_output(raw_output)
+
+    # Streamed output has already been displayed.
+    if context.echo_output and not context.stream_output:
+        logger.info(output)
+
+    return CommandResult(cmd, returncode, output, duration)
+
+
+def _run_streaming(cmd: Command, context: Context) -> Tuple[int, str]:
+    # Keep only the latest lines so that memory use is bounded for large outputs.
+    lines: Deque[str] = collections.deque(maxlen=context.max_output_lines)
+    with subprocess.Popen(
+        cmd,
+        shell=isinstance(cmd, str),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+    ) as process:
+        # Ignore type: `stdout` is defined since it's piped.
+        for line in process.stdout:  # type: ignore
+            if context.echo_output:
+                logger.info(line.rstrip("\n"))
+            lines.append(line)
+    return process.returncode, "".join(lines)
@@ -59,13 +59,19 @@ class Operation(BaseOperation[Context, Dict[str, Any]]):
 
 def load_task(file_path: Path, context: Context) -> "Task":
     # Nested imports to avoid circular import:
-    from ..parser import parse_task_steps
+    from ..parser import parse_task_steps, parse_template_config
     from ..tasks import Task
 
-    execution_context = context.execution_context.copy(source_dir=file_path.parent)
+    loader = get_repo_loader(
+        str(file_path),
+        offline=context.execution_context.offline,
+        lazy_lint=context.execution_context.lazy_lint,
+    )
+    source_dir = file_path.parent
+    execution_context = context.execution_context.copy(
+        source_dir=source_dir, **parse_template_config(loader.task_spec, source_dir)
+    )
     subcontext = {"execution_context": execution_context, **context.subcontext}
-
-    loader = get_repo_loader(str(file_path))
     operations = parse_task_steps(loader.task_spec)
 
     return Task(context=subcontext, operations=operations)
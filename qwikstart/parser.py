@@ -1,10 +1,10 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict, NamedTuple, Optional, Sequence, Type, cast
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Sequence, Type
 
 from . import base_context
 from .exceptions import ObsoleteError, TaskParserError
-from .operations import BaseOperation, GenericOperation
+from .operations import OPERATION_REGISTRY, BaseOperation, GenericOperation
 from .tasks import Task
 from .utils.io import dump_yaml_string
 
@@ -13,11 +13,12 @@ __all__ = [
     "get_operations_mapping",
     "parse_task",
     "parse_task_steps",
+    "parse_template_config",
 ]
 
 logger = logging.getLogger(__name__)
 
-OperationMapping = Dict[str, Type[GenericOperation]]
+OperationMapping = Mapping[str, Type[GenericOperation]]
 RESERVED_WORDS_OPERATION_CONFIG = {
     "opconfig",
     "description",
@@ -105,27 +106,16 @@ def parse_task_steps(task_spec: Dict[str, Any]) -> Sequence[BaseOperation[Any, A
 
 
 def get_operations_mapping() -> OperationMapping:
-    """Return mapping of known operation names to their respective operation classes."""
-    # FIXME: Each subclass of BaseOperation generates two subclasses: The actual
-    # subclass AND the `BaseOperation[TContext, TOutput]` used as superclass. Ignore
-    # operations without names to avoid these classes.
-    operations = [op for op in BaseOperation.__subclasses__() if hasattr(op, "name")]
-    op_mapping = {op.name: op for op in operations}
+    """Return mapping of known operation names to their respective operation classes.
 
-    # Add any operations that have aliases to our mapping:
-    for op in operations:
-        if op.aliases:
-            for name in op.aliases:
-                op_mapping.setdefault(name, op)
-
-    # FIXME: Cast to avoid mypy error due to use of Type with abstract baseclass
-    # See https://github.com/python/mypy/issues/4717
-    return cast(OperationMapping, op_mapping)
+    Operation modules are imported when operation classes are accessed.
+    """
+    return OPERATION_REGISTRY
 
 
 def parse_operation_from_step(
     op_spec: Dict[str, Any],
-    known_operations: Optional[Dict[str, Type[GenericOperation]]] = None,
+    known_operations: Optional[OperationMapping] = None,
 ) -> GenericOperation:
     if known_operations is None:
         known_operations = get_operations_mapping()
@@ -148,8 +138,32 @@ def _initialize_context(
     execution_config = execution_config or {}
     execution_config.setdefault("source_dir", Path("."))
     execution_config.setdefault("target_dir", Path("."))
+    template_config = parse_template_config(task_spec, execution_config["source_dir"])
+    for key, value in template_config.items():
+        execution_config.setdefault(key, value)
 
     return {
         "execution_context": base_context.ExecutionContext(**execution_config),
         **task_spec.get("context", {}),
     }
+
+
+def parse_template_config(
+    task_spec: Dict[str, Any], source_dir: Path
+) -> Dict[str, Any]:
+    """Return execution config for templates defined by the task spec's `source`.
+
+    `source.search_paths` lists fallback template directories, relative to
+    `source_dir`, and `source.templates` maps template names to in-memory templates.
+    """
+    source = task_spec.get("source", {})
+    search_paths = source.get("search_paths", [])
+    if not isinstance(search_paths, list):
+        raise TaskParserError("Task specification `source.search_paths` must be a list")
+    template_sources = source.get("templates")
+    if template_sources is not None and not isinstance(template_sources, dict):
+        raise TaskParserError("Task specification `source.templates` must be a mapping")
+    return {
+        "template_search_paths": tuple(Path(source_dir, path) for path in search_paths),
+        "template_sources": template_sources,
+    }
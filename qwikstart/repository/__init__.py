@@ -1,4 +1,5 @@
 from .core import OperationsList, OperationSpec
+from .git import lock_cached_repos
 from .loaders import BaseRepoLoader, GitRepoLoader, RepoLoader, get_repo_loader
 
 __all__ = [
@@ -8,4 +9,5 @@ __all__ = [
     "OperationsList",
     "RepoLoader",
     "get_repo_loader",
+    "lock_cached_repos",
 ]
@@ -1,20 +1,45 @@
+import json
 import logging
+import os
 import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import NamedTuple, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, NamedTuple, Optional
 
-import git as gitlib
-
-from ..config import get_user_config
+from ..config import Config, get_user_config
 from ..exceptions import RepoLoaderError
+from ..utils.locks import FileLock
+
+if TYPE_CHECKING:
+    from git import Repo
 
 logger = logging.getLogger(__name__)
 
+#: File in a cached repo's git directory that records when the repo was last synced.
+SYNC_METADATA_FILE = "qwikstart_sync.json"
+
+#: Seconds to wait for other processes to finish syncing or using a cached repo.
+REPO_LOCK_TIMEOUT = 600.0
+
+#: Locks on cached repos. Exclusive locks are held while syncing a repo, and shared
+#: locks are held while a repo is in use within `lock_cached_repos`.
+_REPO_LOCKS: Dict[Path, FileLock] = {}
+#: Locks that make threads sync each cached repo one at a time.
+_THREAD_LOCKS: Dict[Path, threading.Lock] = {}
+_REGISTRY_LOCK = threading.Lock()
+#: Number of active `lock_cached_repos` blocks.
+_lock_scopes = 0
+
 # Git url regex adapted from https://stackoverflow.com/a/22312124/260303
-RX_GIT_URL_PREFIX = r"(?P<prefix>(git|ssh|http(s)?))"
+RX_GIT_URL_PREFIX = r"(?P<prefix>(git|ssh|http(s)?|file))"
 RX_GIT_URL_SEPARATOR = r"(?P<separator>(:|@)(//)?)"
 RX_GIT_URL_PATH = r"(?P<path>([\w\.@\:/\-~]+)(\.git)?(/)?)"
 RX_GIT_URL = re.compile(RX_GIT_URL_PREFIX + RX_GIT_URL_SEPARATOR + RX_GIT_URL_PATH)
+RX_COMMIT_HASH = re.compile(r"[0-9a-fA-F]{7,40}")
 
 
 class GitUrl(NamedTuple):
@@ -24,7 +49,8 @@ class GitUrl(NamedTuple):
 
     @property
     def path(self) -> str:
-        return self.raw_path.replace(":", "/")
+        # Strip leading slashes from local paths (e.g. `file:///path/to/repo`).
+        return self.raw_path.replace(":", "/").lstrip("/")
 
 
 def parse_git_url(url: str) -> Optional[GitUrl]:
@@ -38,43 +64,389 @@ def parse_git_url(url: str) -> Optional[GitUrl]:
     )
 
 
-def sync_git_repo_locally(git_url: str) -> Path:
-    """Download or update local copy of git repo and return local path."""
-    git_url = resolve_git_url(git_url)
-    local_repo_path = get_local_repo_path(git_url)
-    if not local_repo_path.exists():
-        download_git_repo(git_url, local_repo_path)
-    else:
-        update_git_repo(local_repo_path)
+def sync_git_repo_locally(
+    git_url: str,
+    ref: Optional[str] = None,
+    sparse_path: str = "",
+    offline: bool = False,
+) -> Path:
+    """Download or update local copy of git repo and return local path.
+
+    Args:
+        git_url: Url of git repo, which may use abbreviations from user config.
+        ref: Branch, tag, or commit to check out. By default, the remote's HEAD is used.
+        sparse_path: Path within repo that is used by the task. If the user config
+            enables `git_sparse_checkout`, only this path is checked out.
+        offline: If True, or if the user config enables `offline`, the cached repo is
+            used without accessing the remote.
+    """
+    config = get_user_config()
+    git_url = resolve_git_url(git_url, config=config)
+    local_repo_path = get_local_repo_path(git_url, config=config)
+    sparse_path = sparse_path if config.git_sparse_checkout else ""
+    offline = offline or config.offline
+    ttl = config.repo_cache_ttl
+
+    with get_thread_lock(local_repo_path):
+        repo_lock = get_repo_lock(local_repo_path)
+        if _lock_scopes:
+            # Repos already in use by this process aren't updated again, as long as
+            # the same ref and path are used.
+            in_use = repo_lock.is_locked
+            # Lock before checking the repo, so that it can't change after the check.
+            _acquire_repo_lock(repo_lock, local_repo_path, exclusive=False)
+            if in_use and is_repo_checked_out(local_repo_path, ref, sparse_path):
+                return local_repo_path
+
+        if is_repo_synced(local_repo_path, ref, sparse_path, ttl=ttl, offline=offline):
+            logger.debug(f"Using cached qwikstart repo at {local_repo_path}")
+            return local_repo_path
+        _sync_git_repo_with_lock(
+            repo_lock,
+            git_url,
+            local_repo_path,
+            ref=ref,
+            depth=config.git_clone_depth,
+            sparse_path=sparse_path,
+            offline=offline,
+            ttl=ttl,
+        )
     return local_repo_path
 
 
-def resolve_git_url(url: str) -> str:
+@contextmanager
+def lock_cached_repos() -> Iterator[None]:
+    """Keep shared locks on cached repos synced within this block, until it exits.
+
+    Other processes wait to sync a locked repo until the block exits, so that repos
+    aren't modified while task specs and templates are read from them.
+    """
+    global _lock_scopes
+    _lock_scopes += 1
+    try:
+        yield
+    finally:
+        _lock_scopes -= 1
+        if not _lock_scopes:
+            with _REGISTRY_LOCK:
+                for repo_lock in _REPO_LOCKS.values():
+                    repo_lock.release()
+
+
+def _sync_git_repo_with_lock(
+    repo_lock: FileLock,
+    git_url: str,
+    local_path: Path,
+    ref: Optional[str],
+    depth: Optional[int],
+    sparse_path: str,
+    offline: bool,
+    ttl: Optional[float],
+) -> None:
+    """Sync repo while holding an exclusive lock on it.
+
+    Within `lock_cached_repos`, a shared lock is acquired again after syncing.
+    """
+    # Never wait for this lock while holding locks on other repos, since another
+    # process could be waiting for those locks while holding this one.
+    with _REGISTRY_LOCK:
+        other_locks = [lock for lock in _REPO_LOCKS.values() if lock is not repo_lock]
+    holds_other_locks = any(lock.is_locked for lock in other_locks)
+    try:
+        _acquire_repo_lock(
+            repo_lock, local_path, exclusive=True, wait=not holds_other_locks
+        )
+    except RepoLoaderError:
+        if not holds_other_locks or not is_repo_checked_out(
+            local_path, ref, sparse_path
+        ):
+            raise
+        logger.warning(f"Using cached qwikstart repo in use elsewhere: {local_path}")
+    else:
+        try:
+            # Check again, since another process may have synced the repo while this
+            # process waited for the exclusive lock.
+            if not is_repo_synced(
+                local_path, ref, sparse_path, ttl=ttl, offline=offline
+            ):
+                _sync_git_repo(
+                    git_url,
+                    local_path,
+                    ref=ref,
+                    depth=depth,
+                    sparse_path=sparse_path,
+                    offline=offline,
+                )
+        finally:
+            repo_lock.release()
+
+    if _lock_scopes:
+        _acquire_repo_lock(repo_lock, local_path, exclusive=False)
+        # Switching to a shared lock isn't atomic, so another process may have checked
+        # out a different ref before the shared lock was acquired.
+        if not is_repo_checked_out(local_path, ref, sparse_path):
+            _sync_git_repo_with_lock(
+                repo_lock,
+                git_url,
+                local_path,
+                ref=ref,
+                depth=depth,
+                sparse_path=sparse_path,
+                offline=offline,
+                ttl=ttl,
+            )
+
+
+def _acquire_repo_lock(
+    repo_lock: FileLock, local_path: Path, exclusive: bool, wait: bool = True
+) -> None:
+    try:
+        repo_lock.acquire(exclusive=exclusive, timeout=REPO_LOCK_TIMEOUT if wait else 0)
+    except TimeoutError as error:
+        raise RepoLoaderError(
+            f"Timed out waiting for other processes using {local_path}"
+        ) from error
+
+
+def _sync_git_repo(
+    git_url: str,
+    local_path: Path,
+    ref: Optional[str],
+    depth: Optional[int],
+    sparse_path: str,
+    offline: bool,
+) -> None:
+    if offline:
+        if not local_path.exists():
+            raise RepoLoaderError(f"Cannot download git repo while offline: {git_url}")
+        use_cached_git_repo(local_path, ref=ref, sparse_path=sparse_path)
+        return
+
+    if not local_path.exists():
+        download_git_repo(
+            git_url, local_path, ref=ref, depth=depth, sparse_path=sparse_path
+        )
+    else:
+        update_git_repo(local_path, ref=ref, depth=depth, sparse_path=sparse_path)
+    write_sync_metadata(local_path, ref=ref)
+
+
+def get_repo_lock(local_path: Path) -> FileLock:
+    """Return lock for cached repo, which is shared by all callers in this process."""
+    with _REGISTRY_LOCK:
+        if local_path not in _REPO_LOCKS:
+            # Lock a file next to the repo, since the repo itself may not exist yet.
+            _REPO_LOCKS[local_path] = FileLock(
+                local_path.with_name(local_path.name + ".lock")
+            )
+        return _REPO_LOCKS[local_path]
+
+
+def get_thread_lock(local_path: Path) -> threading.Lock:
+    """Return lock that threads hold while syncing a cached repo."""
+    with _REGISTRY_LOCK:
+        return _THREAD_LOCKS.setdefault(local_path, threading.Lock())
+
+
+def is_repo_synced(
+    local_path: Path,
+    ref: Optional[str],
+    sparse_path: str,
+    ttl: Optional[float],
+    offline: bool,
+) -> bool:
+    """Return True if cached repo can be used as-is, without syncing."""
+    if offline:
+        # Offline repos are used as-is unless a different ref is requested.
+        return is_repo_checked_out(local_path, ref, sparse_path)
+    if not local_path.joinpath(sparse_path).exists():
+        return False
+    return is_repo_fresh(local_path, ref=ref, ttl=ttl)
+
+
+def is_repo_checked_out(local_path: Path, ref: Optional[str], sparse_path: str) -> bool:
+    """Return True if cached repo contains the sparse path and, if given, ref."""
+    if not local_path.joinpath(sparse_path).exists():
+        return False
+    metadata = read_sync_metadata(local_path) or {}
+    return ref is None or metadata.get("ref") == ref
+
+
+def resolve_git_url(url: str, config: Optional[Config] = None) -> str:
     prefix, _, repo_path = url.partition(":")
-    config = get_user_config()
+    config = config or get_user_config()
     if prefix in config.git_abbreviations:
         url = config.git_abbreviations[prefix].format(repo_path)
     return url
 
 
-def get_local_repo_path(url: str) -> Path:
+def get_local_repo_path(url: str, config: Optional[Config] = None) -> Path:
     git_url = parse_git_url(url)
     if git_url is None:
         raise RepoLoaderError(f"Cannot load from repo with no hostname: {url!r}")
 
-    config = get_user_config()
+    config = config or get_user_config()
     return config.repo_cache_path / git_url.path
 
 
-def download_git_repo(repo_url: str, local_path: Path) -> None:
+def download_git_repo(
+    repo_url: str,
+    local_path: Path,
+    ref: Optional[str] = None,
+    depth: Optional[int] = None,
+    sparse_path: str = "",
+) -> None:
+    # Import on first use, since `gitpython` is slow to import.
+    import git as gitlib
+
     logger.debug(f"Downloading qwikstart repo from {repo_url}")
+    clone_kwargs: Dict[str, Any] = {}
+    if depth:
+        clone_kwargs["depth"] = depth
+    if sparse_path:
+        # Only check out top-level files, until the sparse path is added below.
+        clone_kwargs["sparse"] = True
+
+    # Clone into a temporary directory that's renamed when complete, so that other
+    # processes never see partial clones.
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{local_path.name}-", dir=local_path.parent)
     try:
-        gitlib.Repo.clone_from(repo_url, str(local_path))
+        repo = gitlib.Repo.clone_from(repo_url, tmp_dir, **clone_kwargs)
+        if sparse_path:
+            add_sparse_path(repo, sparse_path)
+        if ref is not None:
+            checkout_ref(repo, ref, depth=depth)
+        os.rename(tmp_dir, local_path)
     except (gitlib.NoSuchPathError, gitlib.GitCommandError):
         raise RepoLoaderError(f"Could not load git repo: {repo_url}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
     logger.debug(f"Downloaded qwikstart repo from {repo_url} to {local_path}")
 
 
-def update_git_repo(local_path: Path) -> None:
+def update_git_repo(
+    local_path: Path,
+    ref: Optional[str] = None,
+    depth: Optional[int] = None,
+    sparse_path: str = "",
+) -> None:
+    import git as gitlib
+
     logger.debug(f"Updating qwikstart repo at {local_path}")
-    gitlib.Repo(str(local_path)).remote().pull()
+    try:
+        repo = gitlib.Repo(str(local_path))
+        if sparse_path:
+            add_sparse_path(repo, sparse_path)
+        # Fetch and check out the remote's HEAD, instead of pulling, so that updates
+        # work the same way for repos pinned to a ref and never require merges.
+        checkout_ref(repo, ref or "HEAD", depth=depth)
+    except (gitlib.InvalidGitRepositoryError, gitlib.GitCommandError):
+        raise RepoLoaderError(f"Could not update git repo at {local_path}")
+
+
+def checkout_ref(repo: "Repo", ref: str, depth: Optional[int] = None) -> None:
+    """Fetch branch, tag, or commit from remote and check it out.
+
+    Raises `RepoLoaderError` if the ref can't be fetched, so that a failed update is
+    never mistaken for a successful one.
+    """
+    import git as gitlib
+
+    fetch_kwargs: Dict[str, Any] = {"depth": depth} if depth else {}
+    try:
+        repo.remote().fetch(ref, **fetch_kwargs)
+        target = "FETCH_HEAD"
+    except gitlib.GitCommandError as error:
+        # Some servers refuse to fetch commits by hash, but commits in full clones
+        # can still be checked out.
+        if not (RX_COMMIT_HASH.fullmatch(ref) and has_commit(repo, ref)):
+            raise RepoLoaderError(f"Could not fetch {ref!r} from remote") from error
+        target = ref
+    repo.git.checkout(target)
+
+
+def has_commit(repo: "Repo", ref: str) -> bool:
+    import git as gitlib
+
+    try:
+        repo.git.cat_file("-e", f"{ref}^{{commit}}")
+    except gitlib.GitCommandError:
+        return False
+    return True
+
+
+def use_cached_git_repo(
+    local_path: Path, ref: Optional[str] = None, sparse_path: str = ""
+) -> None:
+    """Check out ref and sparse path from cached repo, without accessing the remote.
+
+    The ref and sparse path must already exist in the local copy of the repo.
+    """
+    import git as gitlib
+
+    metadata = read_sync_metadata(local_path) or {}
+    ref_changed = ref is not None and metadata.get("ref") != ref
+    repo = gitlib.Repo(str(local_path))
+    try:
+        if sparse_path:
+            add_sparse_path(repo, sparse_path)
+        if ref is not None and ref_changed:
+            repo.git.checkout(ref)
+    except gitlib.GitCommandError:
+        raise RepoLoaderError(f"Could not check out cached git repo at {local_path}")
+
+    if ref_changed:
+        # Keep the original sync time, since nothing was fetched from the remote.
+        synced_at = metadata.get("synced_at", 0)
+        write_sync_metadata(local_path, ref=ref, synced_at=synced_at)
+
+
+def add_sparse_path(repo: "Repo", sparse_path: str) -> None:
+    """Add path to sparse checkout of repo, if repo is sparse and path is missing."""
+    local_path = Path(str(repo.working_tree_dir))
+    if local_path.joinpath(sparse_path).exists() or not is_sparse_checkout(repo):
+        return
+    logger.debug(f"Adding {sparse_path} to sparse checkout of {local_path}")
+    repo.git.sparse_checkout("add", sparse_path)
+
+
+def is_sparse_checkout(repo: "Repo") -> bool:
+    import git as gitlib
+
+    # Use git instead of `repo.config_reader`, which ignores worktree config files
+    # where git stores sparse-checkout settings.
+    try:
+        return bool(repo.git.config("--bool", "core.sparseCheckout") == "true")
+    except gitlib.GitCommandError:
+        return False
+
+
+def is_repo_fresh(local_path: Path, ref: Optional[str], ttl: Optional[float]) -> bool:
+    """Return True if repo was synced to `ref` less than `ttl` seconds ago."""
+    if ttl is None:
+        return False
+    metadata = read_sync_metadata(local_path)
+    if metadata is None or metadata.get("ref") != ref:
+        return False
+    return bool(time.time() - metadata.get("synced_at", 0) < ttl)
+
+
+def read_sync_metadata(local_path: Path) -> Optional[Dict[str, Any]]:
+    metadata_path = local_path / ".git" / SYNC_METADATA_FILE
+    try:
+        with metadata_path.open() as f:
+            return dict(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+def write_sync_metadata(
+    local_path: Path, ref: Optional[str], synced_at: Optional[float] = None
+) -> None:
+    metadata_path = local_path / ".git" / SYNC_METADATA_FILE
+    if not metadata_path.parent.is_dir():
+        return
+    synced_at = time.time() if synced_at is None else synced_at
+    with metadata_path.open("w") as f:
+        json.dump({"ref": ref, "synced_at": synced_at}, f)
@@ -1,8 +1,11 @@
 import abc
+import copy
+import functools
 from pathlib import Path
 from typing import Any, Dict, Optional, cast
 
-from ..exceptions import RepoLoaderError
+from ..config import get_user_config
+from ..exceptions import RepoLoaderError, TaskParserError
 from ..utils import http, io
 from . import git, yamllint
 from .core import QWIKSTART_TASK_SPEC_FILE
@@ -22,18 +25,35 @@ class BaseRepoLoader(abc.ABC):
         """Return local path to qwikstart repo."""
 
 
-def get_repo_loader(task_path: str, repo_url: Optional[str] = None) -> BaseRepoLoader:
+def get_repo_loader(
+    task_path: str,
+    repo_url: Optional[str] = None,
+    offline: bool = False,
+    lazy_lint: bool = False,
+) -> BaseRepoLoader:
     if repo_url is not None:
-        return GitRepoLoader(repo_url, task_path)
-    return RepoLoader(task_path)
+        return GitRepoLoader(repo_url, task_path, offline=offline, lazy_lint=lazy_lint)
+    return RepoLoader(task_path, offline=offline, lazy_lint=lazy_lint)
 
 
 class GitRepoLoader(BaseRepoLoader):
     """Loader for qwikstart task repos stored in git repos."""
 
-    def __init__(self, git_url: str, path: str = ""):
-        local_path = git.sync_git_repo_locally(git_url) / path
-        self._local_loader = RepoLoader(str(local_path))
+    def __init__(
+        self,
+        git_url: str,
+        path: str = "",
+        offline: bool = False,
+        lazy_lint: bool = False,
+    ):
+        # Sparse checkouts need the directory containing the task spec, if given a file.
+        sparse_path = str(Path(path).parent) if Path(path).suffix else path
+        local_repo_path = git.sync_git_repo_locally(
+            git_url, sparse_path=sparse_path, offline=offline
+        )
+        self._local_loader = RepoLoader(
+            str(local_repo_path / path), offline=offline, lazy_lint=lazy_lint
+        )
 
     @property
     def task_spec(self) -> Dict[str, Any]:
@@ -49,26 +69,33 @@ class RepoLoader(BaseRepoLoader):
     """Loader for qwikstart task spec.
 
     The task spec must specify a source url for the location of the qwikstart repo.
+
+    If `lazy_lint` is True (or the user config sets `lint: lazy`), the task spec is
+    only linted if it fails to parse, to report helpful errors.
     """
 
-    def __init__(self, url_or_path: str = ""):
+    def __init__(
+        self, url_or_path: str = "", offline: bool = False, lazy_lint: bool = False
+    ):
         if http.is_url(url_or_path):
             self._repo_path = None
-            spec_contents = http.read_from_url(url_or_path)
+            spec_contents = read_task_spec_from_url(url_or_path, offline=offline)
         else:
             local_path = _resolve_task_spec_path(url_or_path)
             # This repo path may get overwritten if task spec defines `source.url`
             self._repo_path = local_path.parent
             spec_contents = io.read_file_contents(local_path)
 
-        yamllint.assert_no_errors(spec_contents)
-        self._task_spec = io.load_yaml_string(spec_contents)
+        self._task_spec = load_task_spec(spec_contents, lazy_lint=lazy_lint)
 
         source = self._task_spec.get("source", {})
         git_url = source.get("url")
         if git_url:
-            local_git_repo = git.sync_git_repo_locally(git_url)
-            self._repo_path = local_git_repo / source.get("path", "")
+            source_path = source.get("path", "")
+            local_git_repo = git.sync_git_repo_locally(
+                git_url, ref=source.get("ref"), sparse_path=source_path, offline=offline
+            )
+            self._repo_path = local_git_repo / source_path
 
         if self._repo_path is None:
             raise RepoLoaderError(
@@ -87,6 +114,48 @@ class RepoLoader(BaseRepoLoader):
         return cast(Path, self._repo_path)
 
 
+def read_task_spec_from_url(url: str, offline: bool = False) -> str:
+    config = get_user_config()
+    return http.read_from_url(
+        url,
+        cache_dir=config.http_cache_path,
+        timeout=config.http_timeout,
+        retries=config.http_retries,
+        offline=offline or config.offline,
+    )
+
+
+def load_task_spec(spec_contents: str, lazy_lint: bool = False) -> Dict[str, Any]:
+    """Return task spec parsed from yaml string, after checking for lint errors.
+
+    Parsed specs are cached, so loading the same spec again (e.g. for a subtask that's
+    run in a loop) only copies the cached spec.
+    """
+    config = get_user_config()
+    lazy_lint = lazy_lint or config.lint == "lazy"
+    lint_cache_path = None if lazy_lint else config.lint_cache_path
+    task_spec = _parse_task_spec(spec_contents, lazy_lint, lint_cache_path)
+    # Return a copy so that callers can't modify the cached spec.
+    return copy.deepcopy(task_spec)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_task_spec(
+    spec_contents: str, lazy_lint: bool, lint_cache_path: Optional[Path]
+) -> Dict[str, Any]:
+    if not lazy_lint:
+        # Specs that passed linting before (e.g. in cached repos) aren't linted again.
+        yamllint.assert_no_errors(spec_contents, cache_dir=lint_cache_path)
+        return io.safe_load_yaml_string(spec_contents)
+
+    try:
+        return io.safe_load_yaml_string(spec_contents)
+    except Exception as error:
+        # Lint to display problems with the spec, which are clearer than parse errors.
+        yamllint.assert_no_errors(spec_contents)
+        raise TaskParserError(f"Failed to read yaml file: {error}") from error
+
+
 def _resolve_task_spec_path(path_string: str) -> Path:
     """Return Path to task spec from string path.
 
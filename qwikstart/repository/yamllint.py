@@ -1,38 +1,83 @@
 """
 Thin wrapper around `yamllint` library to provide helpful error info for yaml files.
 """
+import functools
+import hashlib
 import logging
 import textwrap
-from typing import List
-
-from yamllint import cli, linter
-from yamllint.config import YamlLintConfig
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
 
 from ..exceptions import TaskParserError
 
+if TYPE_CHECKING:
+    from yamllint.config import YamlLintConfig
+    from yamllint.linter import LintProblem
+
 logger = logging.getLogger(__name__)
 
 # Use very relaxed linting configuration, since we only want real errors reported:
-YAMLLINT_CONFIG = YamlLintConfig(
-    content=textwrap.dedent(
-        """
-        extends: relaxed
-        rules:
-            new-line-at-end-of-file: disable
-        """
-    )
+YAMLLINT_CONFIG_STRING = textwrap.dedent(
+    """
+    extends: relaxed
+    rules:
+        new-line-at-end-of-file: disable
+    """
 )
 
 
-def linter_errors(text: str) -> List[linter.LintProblem]:
-    problems = linter.run(text, YAMLLINT_CONFIG)
+@functools.lru_cache(maxsize=None)
+def get_yamllint_config() -> "YamlLintConfig":
+    # Import on first use, since `yamllint` is slow to import.
+    from yamllint.config import YamlLintConfig
+
+    return YamlLintConfig(content=YAMLLINT_CONFIG_STRING)
+
+
+def linter_errors(text: str) -> List["LintProblem"]:
+    from yamllint import linter
+
+    problems = linter.run(text, get_yamllint_config())
     return [p for p in problems if p.level == "error"]
 
 
-def assert_no_errors(text: str, display_warnings: bool = True) -> None:
+def assert_no_errors(
+    text: str, display_warnings: bool = True, cache_dir: Optional[Path] = None
+) -> None:
+    """Raise `TaskParserError` if linter detects errors in yaml text.
+
+    If `cache_dir` is given, text that passes is recorded there so it's only linted
+    once, even across processes.
+    """
+    if cache_dir is not None and is_validated(text, cache_dir):
+        return
+
     problems = linter_errors(text)
     if not problems:
+        if cache_dir is not None:
+            mark_validated(text, cache_dir)
         return
+    from yamllint import cli
+
     logger.warning("Detected issues with in yaml file")
     cli.show_problems(problems, "stdin", args_format="colored", no_warn=False)
     raise TaskParserError("Failed to read yaml file")
+
+
+def is_validated(text: str, cache_dir: Path) -> bool:
+    """Return True if text previously passed linting."""
+    return cache_dir.joinpath(get_cache_key(text)).exists()
+
+
+def mark_validated(text: str, cache_dir: Path) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_dir.joinpath(get_cache_key(text)).touch()
+    except OSError:
+        logger.debug(f"Failed to record lint result in {cache_dir}")
+
+
+def get_cache_key(text: str) -> str:
+    # Include linter config, since changes to the config can change lint results.
+    data = YAMLLINT_CONFIG_STRING + text
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
@@ -0,0 +1,85 @@
+"""
+Scheduler for running independent steps of a task concurrently.
+
+Steps are grouped into "waves" of steps that don't depend on each other, based on the
+context variables and files each step reads and writes (see `StepResources`). Steps
+with unknown resources run alone. Outputs are merged into the global context in a
+fixed order after each wave, so results don't depend on the timing of threads.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import utils
+from .operations import BaseOperation, StepResources
+
+__all__ = ["aexecute_concurrently", "execute_concurrently", "schedule_steps"]
+
+# FIXME: Allow subclasses of BaseOperation and specify type parameters.
+Operations = Sequence[BaseOperation]  # type:ignore
+
+
+def schedule_steps(operations: Operations) -> List[List[int]]:
+    """Return indices of operations grouped into waves of independent steps.
+
+    Each step is scheduled in the wave after the last earlier step it depends on.
+    """
+    all_resources = [operation.get_resources() for operation in operations]
+    step_waves: List[int] = []
+    for index, resources in enumerate(all_resources):
+        wave = 0
+        for earlier_index in range(index):
+            if _depends_on(resources, all_resources[earlier_index]):
+                wave = max(wave, step_waves[earlier_index] + 1)
+        step_waves.append(wave)
+
+    waves: List[List[int]] = [[] for _ in range(max(step_waves, default=-1) + 1)]
+    for index, wave in enumerate(step_waves):
+        waves[wave].append(index)
+    return waves
+
+
+def execute_concurrently(
+    operations: Operations, context: Dict[str, Any], max_workers: int
+) -> Dict[str, Any]:
+    """Execute operations on a pool of `max_workers` threads and return context."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for wave in schedule_steps(operations):
+            wave_operations = [operations[index] for index in wave]
+            if len(wave_operations) == 1:
+                outputs = [wave_operations[0].get_output(context)]
+            else:
+                outputs = list(
+                    executor.map(lambda op: op.get_output(context), wave_operations)
+                )
+            for output in outputs:
+                utils.merge_nested_dicts(context, output, inplace=True)
+    return context
+
+
+async def aexecute_concurrently(
+    operations: Operations, context: Dict[str, Any], max_workers: int
+) -> Dict[str, Any]:
+    """Asynchronous version of `execute_concurrently`.
+
+    Independent steps are awaited together, with at most `max_workers` running at once.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def get_output(operation: BaseOperation) -> Any:  # type:ignore
+        async with semaphore:
+            return await operation.aget_output(context)
+
+    for wave in schedule_steps(operations):
+        outputs = await asyncio.gather(*(get_output(operations[i]) for i in wave))
+        for output in outputs:
+            utils.merge_nested_dicts(context, output, inplace=True)
+    return context
+
+
+def _depends_on(
+    resources: Optional[StepResources], earlier_resources: Optional[StepResources]
+) -> bool:
+    if resources is None or earlier_resources is None:
+        return True
+    return resources.conflicts_with(earlier_resources)
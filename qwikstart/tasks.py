@@ -1,9 +1,42 @@
+import asyncio
+import copy
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Sequence
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
 
+from . import scheduler
 from .operations import BaseOperation
+from .utils.file_buffer import FileBuffer
 
-__all__ = ["Task"]
+__all__ = ["TargetResult", "Task"]
+
+logger = logging.getLogger(__name__)
+
+
+class TargetResult(NamedTuple):
+    """Result of executing a task against a single target directory."""
+
+    target_dir: Path
+    #: Error message if the task failed, or None if it succeeded.
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
 
 
 @dataclass
@@ -16,6 +49,114 @@ class Task:
 
     def execute(self) -> Dict[str, Any]:
         context = self.context
-        for operation in self.operations:
-            context = operation.execute(context)
+        max_workers = getattr(context.get("execution_context"), "max_workers", 1)
+        if max_workers > 1:
+            context = scheduler.execute_concurrently(
+                self.operations, context, max_workers
+            )
+        else:
+            for operation in self.operations:
+                context = operation.execute(context)
+
+        file_buffer = self.get_file_buffer()
+        if file_buffer is not None:
+            file_buffer.flush()
+        return context
+
+    async def aexecute(self) -> Dict[str, Any]:
+        """Asynchronous version of `execute`, for use within a running event loop.
+
+        Operations are run using `BaseOperation.arun`, which runs synchronous operations
+        in threads so that they don't block the event loop.
+        """
+        context = self.context
+        max_workers = getattr(context.get("execution_context"), "max_workers", 1)
+        if max_workers > 1:
+            context = await scheduler.aexecute_concurrently(
+                self.operations, context, max_workers
+            )
+        else:
+            for operation in self.operations:
+                context = await operation.aexecute(context)
+
+        file_buffer = self.get_file_buffer()
+        if file_buffer is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, file_buffer.flush)
         return context
+
+    def get_file_buffer(self) -> Optional[FileBuffer]:
+        execution_context = self.context.get("execution_context")
+        return getattr(execution_context, "file_buffer", None)
+
+    def copy_for_target(self, target_dir: Union[Path, str]) -> "Task":
+        """Return task that runs the same operations against another target directory.
+
+        The copy gets a fresh copy of the context (and its own file buffer), so this
+        task can be copied again to run against any number of targets. Operations and
+        caches in the execution context (e.g. compiled templates) are shared.
+        """
+        execution_context = self.context["execution_context"]
+        file_buffer = execution_context.file_buffer
+        if file_buffer is not None:
+            file_buffer = FileBuffer(dry_run=file_buffer.dry_run)
+
+        context = {
+            key: copy.deepcopy(value)
+            for key, value in self.context.items()
+            if key != "execution_context"
+        }
+        context["execution_context"] = execution_context.copy(
+            target_dir=Path(target_dir).resolve(), file_buffer=file_buffer
+        )
+        return Task(operations=self.operations, context=context)
+
+    def execute_for_targets(
+        self, target_dirs: Iterable[Union[Path, str]], max_workers: int = 1
+    ) -> List[TargetResult]:
+        """Execute task against each target directory and return results in order.
+
+        Failures are reported in the results instead of stopping other targets.
+
+        Args:
+            target_dirs: Target directories, each of which gets a fresh copy of the
+                task's context; see `copy_for_target`.
+            max_workers: Number of processes used to run targets in parallel. The
+                default, 1, runs targets in order in this process. Note that running
+                targets in this process changes the working directory while each
+                target runs, so it shouldn't run concurrently with other threads.
+        """
+        target_paths = [Path(target_dir).resolve() for target_dir in target_dirs]
+        if max_workers <= 1:
+            return [execute_for_target(self, path) for path in target_paths]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(execute_for_target, self, path) for path in target_paths
+            ]
+            return [future.result() for future in futures]
+
+
+def execute_for_target(task: Task, target_dir: Path) -> TargetResult:
+    """Execute copy of task against `target_dir` and return the result.
+
+    Operations resolve relative paths from the working directory (like the CLI, which
+    runs tasks in the current directory), so the task is run from `target_dir`.
+    """
+    try:
+        with working_directory(target_dir):
+            task.copy_for_target(target_dir).execute()
+    except Exception as error:
+        logger.error(f"Task failed for {target_dir}: {error}")
+        return TargetResult(target_dir, error=str(error) or repr(error))
+    return TargetResult(target_dir)
+
+
+@contextmanager
+def working_directory(path: Path) -> Iterator[None]:
+    original_path = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(original_path)
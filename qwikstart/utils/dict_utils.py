@@ -1,5 +1,24 @@
 import copy
-from typing import Any, Dict, Mapping, Tuple, cast
+from typing import Any, Dict, Mapping, NamedTuple, Tuple, cast
+
+
+class KeyPath(NamedTuple):
+    """Nested dictionary key (e.g. "a.b") split into the keys at each level."""
+
+    key: str
+    parts: Tuple[str, ...]
+
+    @classmethod
+    def parse(cls, nested_key: str, separator: str = ".") -> "KeyPath":
+        return cls(nested_key, tuple(nested_key.split(separator)))
+
+    @property
+    def is_nested(self) -> bool:
+        return len(self.parts) > 1
+
+
+#: Key mapping (see `remap_dict`) with keys parsed into `KeyPath`s ahead of time.
+CompiledKeyMapping = Tuple[Tuple[KeyPath, KeyPath], ...]
 
 
 def merge_nested_dicts(
@@ -10,6 +29,9 @@ def merge_nested_dicts(
     Dict values that are dictionaries themselves will be updated, whilst preserving
     existing keys.
 
+    Unless `inplace` is True, only dictionaries that are updated are copied: The new
+    dictionary shares all other values with `default`, which is never modified.
+
     Args:
         default: Dictionary containing default values
         overwrite: Dictionary containing values that will overwrite default values.
@@ -20,7 +42,7 @@ def merge_nested_dicts(
     """
     # FIXME: Require Dict instead of Mapping for `default` to remove casting op:
     default = cast(Dict[str, Any], default)
-    new_dict = default if inplace else copy.deepcopy(default)
+    new_dict = default if inplace else copy.copy(default)
 
     for k, v in overwrite.items():
         merge_needed = isinstance(v, dict) and isinstance(default.get(k), dict)
@@ -35,7 +57,7 @@ def get_nested_dict_value(
     nested_dict: Dict[str, Any], nested_key: str, separator: str = "."
 ) -> Any:
     final_key, sub_dict = _get_final_nested_dict_and_key(
-        nested_dict, nested_key, separator=separator
+        nested_dict, KeyPath.parse(nested_key, separator)
     )
     return sub_dict[final_key]
 
@@ -44,7 +66,7 @@ def pop_nested_dict_value(
     nested_dict: Dict[str, Any], nested_key: str, separator: str = "."
 ) -> Any:
     final_key, sub_dict = _get_final_nested_dict_and_key(
-        nested_dict, nested_key, separator=separator
+        nested_dict, KeyPath.parse(nested_key, separator)
     )
     return sub_dict.pop(final_key)
 
@@ -52,18 +74,20 @@ def pop_nested_dict_value(
 def set_nested_dict_value(
     nested_dict: Dict[str, Any], nested_key: str, value: Any, separator: str = "."
 ) -> None:
-    sub_dict = nested_dict
-    *sub_keys, final_key = nested_key.split(separator)
-    for key in sub_keys:
-        if key not in sub_dict:
-            sub_dict[key] = {}
+    _set_nested_value(nested_dict, KeyPath.parse(nested_key, separator), value)
 
-        sub_dict = sub_dict[key]
-        if not isinstance(sub_dict, dict):
-            msg = f"Expected key {key!r} to contain dict but given {sub_dict}"
-            raise ValueError(msg)
 
-    sub_dict[final_key] = value
+def compile_key_mapping(
+    key_mapping: Mapping[str, str], nested_key_separator: str = "."
+) -> CompiledKeyMapping:
+    """Return key mapping with keys parsed, for use with `remap_dict_with_key_paths`."""
+    return tuple(
+        (
+            KeyPath.parse(original_key, nested_key_separator),
+            KeyPath.parse(new_key, nested_key_separator),
+        )
+        for original_key, new_key in key_mapping.items()
+    )
 
 
 def remap_dict(
@@ -79,31 +103,79 @@ def remap_dict(
             Any keys not in `key_mapping` are returned unchanged.
         nested_key_separator: Separator used in keys in `key_mapping` to specify nested
             dictionaries.
+
+    Only dictionaries containing renamed keys are copied: The new dictionary shares all
+    other values with `original_dict`, which is never modified.
     """
-    new_dict = copy.deepcopy(cast(Dict[str, Any], original_dict))
-    for original_key, new_key in key_mapping.items():
-        if nested_key_separator in original_key:
-            value = pop_nested_dict_value(new_dict, original_key)
-        elif original_key in new_dict:
-            value = new_dict.pop(original_key)
+    compiled_mapping = compile_key_mapping(key_mapping, nested_key_separator)
+    return remap_dict_with_key_paths(original_dict, compiled_mapping)
+
+
+def remap_dict_with_key_paths(
+    original_dict: Mapping[str, Any], key_mapping: CompiledKeyMapping
+) -> Dict[str, Any]:
+    """Return dict with keys renamed, like `remap_dict`, using a compiled key mapping.
+
+    Compiling the key mapping once avoids parsing keys each time a dict is remapped.
+    """
+    new_dict = copy.copy(cast(Dict[str, Any], original_dict))
+    for original_path, new_path in key_mapping:
+        if original_path.is_nested:
+            _copy_nested_dicts_on_path(new_dict, original_path)
+            final_key, sub_dict = _get_final_nested_dict_and_key(
+                new_dict, original_path
+            )
+            value = sub_dict.pop(final_key)
+        elif original_path.key in new_dict:
+            value = new_dict.pop(original_path.key)
         else:
             continue  # pragma: no cover
 
-        if nested_key_separator in new_key:
-            set_nested_dict_value(new_dict, new_key, value)
+        if new_path.is_nested:
+            _copy_nested_dicts_on_path(new_dict, new_path)
+            _set_nested_value(new_dict, new_path, value)
         else:
-            new_dict[new_key] = value
+            new_dict[new_path.key] = value
     return new_dict
 
 
+def _set_nested_value(nested_dict: Dict[str, Any], path: KeyPath, value: Any) -> None:
+    sub_dict = nested_dict
+    *sub_keys, final_key = path.parts
+    for key in sub_keys:
+        if key not in sub_dict:
+            sub_dict[key] = {}
+
+        sub_dict = sub_dict[key]
+        if not isinstance(sub_dict, dict):
+            msg = f"Expected key {key!r} to contain dict but given {sub_dict}"
+            raise ValueError(msg)
+
+    sub_dict[final_key] = value
+
+
+def _copy_nested_dicts_on_path(nested_dict: Dict[str, Any], path: KeyPath) -> None:
+    """Replace dicts containing `path` with copies, so they can be modified.
+
+    Copies are made in-place in `nested_dict`, which should itself be a copy. Values
+    that aren't dicts are left alone, so that errors are raised by callers.
+    """
+    sub_dict = nested_dict
+    for key in path.parts[:-1]:
+        if not isinstance(sub_dict.get(key), dict):
+            return
+        sub_dict[key] = copy.copy(sub_dict[key])
+        sub_dict = sub_dict[key]
+
+
 def _get_final_nested_dict_and_key(
-    nested_dict: Dict[str, Any], nested_key: str, separator: str = "."
+    nested_dict: Dict[str, Any], path: KeyPath
 ) -> Tuple[str, Dict[str, Any]]:
     sub_dict = nested_dict
-    *sub_keys, final_key = nested_key.split(separator)
+    *sub_keys, final_key = path.parts
     for key in sub_keys:
         if key not in sub_dict:
-            raise KeyError(f"Nested key {nested_key!r} not found in {nested_dict}")
+            raise KeyError(f"Nested key {path.key!r} not found in {nested_dict}")
 
         sub_dict = sub_dict[key]
         if not isinstance(sub_dict, dict):
@@ -111,6 +183,6 @@ def _get_final_nested_dict_and_key(
             raise ValueError(msg)
 
     if final_key not in sub_dict:
-        raise KeyError(f"Nested key {nested_key!r} not found in {nested_dict}")
+        raise KeyError(f"Nested key {path.key!r} not found in {nested_dict}")
 
     return final_key, sub_dict
@@ -0,0 +1,162 @@
+"""
+In-memory buffer for batching text edits to files.
+
+Operations that edit files read from and write to the buffer, so a task making many
+edits to the same file reads and writes it once. Buffered edits are written atomically
+when the buffer is flushed, or displayed as a diff (without writing) in dry-run mode.
+"""
+import difflib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FileBuffer:
+    """Buffer of file contents edited in-memory and flushed to disk in a single write.
+
+    Args:
+        dry_run: If True, `flush` displays buffered changes instead of writing them.
+    """
+
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        # Map resolved file paths to original and edited file contents. Paths are
+        # resolved so that different spellings of a path share the same edits.
+        self._files: Dict[Path, Tuple[str, str]] = {}
+        self._lock = threading.RLock()
+
+    def read_text(self, file_path: Path) -> str:
+        """Return contents of file, including any buffered edits.
+
+        In dry-run mode, files that don't exist (e.g. because an operation skipped
+        creating them) are read as empty files.
+        """
+        key = resolve_key(file_path)
+        with self._lock:
+            if key not in self._files:
+                if self.dry_run and not file_path.exists():
+                    logger.debug(f"Reading missing {file_path} as empty in dry-run")
+                    contents = ""
+                else:
+                    contents = read_file(file_path)
+                self._files[key] = (contents, contents)
+            return self._files[key][1]
+
+    def write_text(self, file_path: Path, text: str) -> None:
+        """Replace contents of file in buffer. File is not written until flushed."""
+        with self._lock:
+            original = self.read_text(file_path)
+            self._files[resolve_key(file_path)] = (original, text)
+
+    @property
+    def changed_paths(self) -> List[Path]:
+        with self._lock:
+            return [path for path, (old, new) in self._files.items() if old != new]
+
+    def flush(self) -> List[Path]:
+        """Write changed files to disk and return paths to those files.
+
+        In dry-run mode, a diff of changes is logged instead and nothing is written.
+        """
+        with self._lock:
+            changed_paths = self.changed_paths
+            for file_path in changed_paths:
+                original, contents = self._files[file_path]
+                if self.dry_run:
+                    logger.info(
+                        f"Skipping the following edits to {file_path} due to "
+                        "`--dry-run` option:\n" + diff_text(original, contents)
+                    )
+                else:
+                    write_file_atomically(file_path, contents)
+                    logger.debug(f"Wrote buffered edits to {file_path}")
+            self._files.clear()
+        return changed_paths
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> "FileBuffer":
+        # Edits must be written by whichever context flushes the buffer, so deep copies
+        # share it. `Task.copy_for_target` creates a separate buffer for each target.
+        return self
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Drop the lock, which can't be pickled, so buffers can be sent to processes.
+        with self._lock:
+            state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+
+def resolve_key(file_path: Path) -> Path:
+    return Path(os.path.realpath(file_path))
+
+
+def read_file(file_path: Path) -> str:
+    with file_path.open() as f:
+        return str(f.read())
+
+
+def read_text(file_path: Path, file_buffer: Optional[FileBuffer] = None) -> str:
+    """Return contents of file, reading through `file_buffer` if given."""
+    if file_buffer is None:
+        return read_file(file_path)
+    return file_buffer.read_text(file_path)
+
+
+def write_text(
+    file_path: Path, text: str, file_buffer: Optional[FileBuffer] = None
+) -> None:
+    """Write `text` to file, or to `file_buffer` if given."""
+    if file_buffer is None:
+        with file_path.open("w") as f:
+            f.write(text)
+    else:
+        file_buffer.write_text(file_path, text)
+
+
+def read_lines(file_path: Path, file_buffer: Optional[FileBuffer] = None) -> List[str]:
+    """Return lines of file (including line endings), like `readlines`."""
+    return io.StringIO(read_text(file_path, file_buffer)).readlines()
+
+
+def write_file_atomically(file_path: Path, text: str) -> None:
+    """Write `text` to a temporary file and then move it to `file_path`.
+
+    This ensures that `file_path` is never left partially written. The file mode of
+    an existing file is preserved. Symlinks are followed, so the file they point to is
+    replaced instead of the link itself.
+    """
+    file_path = Path(os.path.realpath(file_path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=str(file_path.parent), prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        if file_path.exists():
+            shutil.copymode(str(file_path), temp_path)
+        os.replace(temp_path, str(file_path))
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def diff_text(original: str, contents: str) -> str:
+    return "".join(
+        difflib.unified_diff(
+            original.splitlines(keepends=True),
+            contents.splitlines(keepends=True),
+            fromfile="original",
+            tofile="edited",
+        )
+    )
@@ -0,0 +1,175 @@
+"""
+In-memory index of file contents and directory listings.
+
+The index allows repeated searches of the same file tree (e.g. multiple `find_files`
+operations in a task) to be served from memory. Entries are validated against the
+size and modification time of files and directories, so only changed paths are re-read.
+File contents are limited to a total size, and the least recently used files are
+evicted first.
+"""
+import locale
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+BINARY_CHECK_SIZE = 8192
+
+#: Files larger than this are read from disk every time instead of being indexed.
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+
+#: Total size of indexed files, beyond which the least recently used are evicted.
+DEFAULT_MAX_TOTAL_SIZE = 64 * 1024 * 1024
+
+#: Paths modified within this many seconds of being read aren't indexed: Another
+#: write within the resolution of filesystem timestamps would go undetected.
+RACY_TIMESTAMP_SECONDS = 2.0
+
+StatSignature = Tuple[int, int]
+
+
+class DirectoryEntry(NamedTuple):
+    name: str
+    is_dir: bool
+    is_symlink: bool
+
+
+def is_binary_data(data: bytes) -> bool:
+    """Return True if `data` (the start of a file) looks like binary data."""
+    return b"\0" in data[:BINARY_CHECK_SIZE]
+
+
+def read_text_file(path: str) -> Optional[str]:
+    """Return text contents of file at `path`, or None if the file is binary.
+
+    Raises `OSError` if the file can't be read and `UnicodeDecodeError` if it can't be
+    decoded using the preferred encoding, which is the default for `open`. Newlines are
+    translated to "\\n", matching universal newlines mode used by `open`.
+    """
+    with open(path, "rb") as f:
+        contents = f.read()
+    if is_binary_data(contents):
+        return None
+    text = contents.decode(locale.getpreferredencoding(False))
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def scan_directory(path: str) -> List[DirectoryEntry]:
+    """Return entries in directory at `path`, sorted by name."""
+    with os.scandir(path) as it:
+        entries = [
+            DirectoryEntry(entry.name, entry.is_dir(), entry.is_symlink())
+            for entry in it
+        ]
+    return sorted(entries)
+
+
+class FileContentIndex:
+    """Index of file contents and directory listings, keyed by path.
+
+    Args:
+        max_file_size: Files larger than this (in bytes) are not indexed.
+        max_total_size: Total size (in bytes) of indexed files, beyond which the least
+            recently used files are evicted.
+    """
+
+    def __init__(
+        self,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        max_total_size: int = DEFAULT_MAX_TOTAL_SIZE,
+    ):
+        self.max_file_size = max_file_size
+        self.max_total_size = max_total_size
+        self._files: "OrderedDict[str, Tuple[StatSignature, Optional[str]]]" = (
+            OrderedDict()
+        )
+        self._total_size = 0
+        self._directories: Dict[str, Tuple[StatSignature, List[DirectoryEntry]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def total_size(self) -> int:
+        """Return total size (in bytes) of indexed files."""
+        return self._total_size
+
+    def read_text(self, path: str) -> Optional[str]:
+        """Return text contents of file at `path`, or None if the file is binary.
+
+        Raises the same errors as `read_text_file`.
+        """
+        path = os.path.abspath(path)
+        stat_result = os.stat(path)
+        signature = (stat_result.st_size, stat_result.st_mtime_ns)
+
+        with self._lock:
+            cached_signature, contents = self._files.get(path, (None, None))
+            if cached_signature == signature:
+                self._files.move_to_end(path)
+                return contents
+
+        contents = read_text_file(path)
+        if stat_result.st_size <= self.max_file_size and not _is_racy(stat_result):
+            with self._lock:
+                self._add_file(path, signature, contents)
+        return contents
+
+    def _add_file(
+        self, path: str, signature: StatSignature, contents: Optional[str]
+    ) -> None:
+        # Signatures start with the file size, which is used as the size of the entry.
+        previous_entry = self._files.pop(path, None)
+        if previous_entry is not None:
+            self._total_size -= previous_entry[0][0]
+        self._files[path] = (signature, contents)
+        self._total_size += signature[0]
+        while self._total_size > self.max_total_size:
+            _, (evicted_signature, _) = self._files.popitem(last=False)
+            self._total_size -= evicted_signature[0]
+
+    def scan_directory(self, path: str) -> List[DirectoryEntry]:
+        """Return entries in directory at `path`, sorted by name.
+
+        Raises `OSError` if the directory can't be read.
+        """
+        path = os.path.abspath(path)
+        stat_result = os.stat(path)
+        signature = (stat_result.st_size, stat_result.st_mtime_ns)
+
+        cached = self._directories.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        entries = scan_directory(path)
+        if not _is_racy(stat_result):
+            with self._lock:
+                self._directories[path] = (signature, entries)
+        return entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+            self._total_size = 0
+            self._directories.clear()
+
+    def __len__(self) -> int:
+        return len(self._files) + len(self._directories)
+
+    def __deepcopy__(self, memo: Dict[int, object]) -> "FileContentIndex":
+        # Entries are validated against file modification times, so deep copies of
+        # contexts (e.g. values copied by `Task.copy_for_target`) can share the index.
+        return self
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Locks can't be pickled, so worker processes start with an empty index.
+        return {
+            "max_file_size": self.max_file_size,
+            "max_total_size": self.max_total_size,
+        }
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__init__(**state)  # type: ignore
+
+
+def _is_racy(stat_result: os.stat_result) -> bool:
+    return time.time() - stat_result.st_mtime < RACY_TIMESTAMP_SECONDS
@@ -1,10 +1,25 @@
 import fnmatch
+import hashlib
+import locale
 import logging
+import math
 import os
 import re
 import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Optional, Pattern
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
 
 from binaryornot.check import is_binary
 
@@ -15,6 +30,88 @@ logger = logging.getLogger(__name__)
 
 MATCH_NOTHING = re.compile("(?!.*)")
 
+#: Executors used to copy files when `FileTreeGenerator.max_workers > 1`. Threads are
+#: best for I/O-bound copies; processes are useful for CPU-heavy template rendering.
+EXECUTOR_CLASSES: Dict[str, Callable[..., Executor]] = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+CopyJob = Tuple[Path, Path]
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+#: Number of chunks of files submitted per worker when copying concurrently.
+CHUNKS_PER_WORKER = 4
+
+
+class CopySummary(NamedTuple):
+    #: Number of files written to the target directory.
+    written: int
+    #: Number of files skipped because the target file already matched.
+    skipped: int
+
+
+class FileCopier:
+    """Copies binary files and renders text files from a template tree.
+
+    Copiers are sent once to each worker process when copying with the "process"
+    executor, so that workers reuse the same renderer (and its compiled templates).
+    """
+
+    def __init__(self, renderer: TemplateRenderer, incremental: bool = False):
+        self.renderer = renderer
+        # If True, skip writing files whose contents already match the target file.
+        self.incremental = incremental
+        # Templates are named relative to the renderer's source directory, so that
+        # cached templates are keyed by portable names.
+        self._template_root = renderer.source_dir.resolve()
+
+    def copy_files(self, copy_jobs: Iterable[CopyJob]) -> List[bool]:
+        """Copy or render files and return False for each write that was skipped."""
+        return [self.copy_file(src_path, tgt_path) for src_path, tgt_path in copy_jobs]
+
+    def copy_file(self, src_path: Path, tgt_path: Path) -> bool:
+        """Copy or render file and return False if the write was skipped."""
+        if is_binary(str(src_path)):
+            written = self._copy_binary_file(src_path, tgt_path)
+        else:
+            written = self._render_file(src_path, tgt_path)
+
+        # Copy file mode (i.e. permissions) of `src_path` to `tgt_path`
+        if written or not file_modes_match(src_path, tgt_path):
+            shutil.copymode(src_path, tgt_path)
+        return written
+
+    def _copy_binary_file(self, src_path: Path, tgt_path: Path) -> bool:
+        if self.incremental and tgt_path.is_file():
+            if hash_file(src_path) == hash_file(tgt_path):
+                logger.debug(f"Skipped unchanged binary file {tgt_path}")
+                return False
+
+        shutil.copy(src_path, tgt_path)
+        logger.debug(f"Copied binary file from {src_path} to {tgt_path}")
+        return True
+
+    def _render_file(self, src_path: Path, tgt_path: Path) -> bool:
+        contents = self.renderer.render(self._get_template_name(src_path))
+        if self.incremental and tgt_path.is_file():
+            if hash_text(contents) == hash_file(tgt_path):
+                logger.debug(f"Skipped unchanged file {tgt_path}")
+                return False
+
+        with tgt_path.open("w") as f:
+            f.write(contents)
+        logger.debug(f"Rendered template from {src_path} to {tgt_path}")
+        return True
+
+    def _get_template_name(self, src_path: Path) -> str:
+        try:
+            return src_path.relative_to(self._template_root).as_posix()
+        except ValueError:
+            # Files outside of the renderer's source directory keep absolute names.
+            return str(src_path)
+
 
 class FileTreeGenerator:
     def __init__(
@@ -23,7 +120,16 @@ class FileTreeGenerator:
         target_dir: Path,
         renderer: TemplateRenderer,
         ignore_patterns: Optional[List[str]] = None,
+        max_workers: int = 1,
+        executor: str = "thread",
+        incremental: bool = False,
     ):
+        if executor not in EXECUTOR_CLASSES:
+            known_executors = ", ".join(EXECUTOR_CLASSES)
+            raise ValueError(
+                f"Unknown executor {executor!r}; expected one of: {known_executors}"
+            )
+
         if not target_dir.exists():
             target_dir.mkdir()
 
@@ -31,43 +137,66 @@ class FileTreeGenerator:
         self.source_dir = source_dir.resolve()
         self.renderer = renderer
         self.ignore_pattern = fnmatches_to_regex(ignore_patterns)
+        self.max_workers = max_workers
+        self.executor = executor
+        self.copier = FileCopier(renderer, incremental=incremental)
 
         # Keep a mapping between source directories and target directories.
         # This simplifies resolution of rendered directory names.
         self._directory_mapping = {str(source_dir): target_dir}
 
-    def copy(self) -> None:
+    def copy(self) -> CopySummary:
+        # Directories are created while walking the source tree, so every target
+        # directory exists before any file is copied, even when copying concurrently.
+        copy_jobs = list(self._iter_copy_jobs())
+
+        if self.max_workers <= 1:
+            results = self.copier.copy_files(copy_jobs)
+        else:
+            results = self._copy_files_concurrently(copy_jobs)
+
+        written = sum(results)
+        return CopySummary(written=written, skipped=len(results) - written)
+
+    def _copy_files_concurrently(self, copy_jobs: List[CopyJob]) -> List[bool]:
+        if self.executor == "process":
+            # Send the copier to each worker once, instead of with every job.
+            executor_kwargs: Dict[str, Any] = {
+                "initializer": _initialize_worker,
+                "initargs": (self.copier,),
+            }
+            copy_files: Callable[[List[CopyJob]], List[bool]] = _copy_files_in_worker
+        else:
+            executor_kwargs = {}
+            copy_files = self.copier.copy_files
+
+        executor_class = EXECUTOR_CLASSES[self.executor]
+        with executor_class(
+            max_workers=self.max_workers, **executor_kwargs
+        ) as executor:
+            futures = [
+                executor.submit(copy_files, chunk)
+                for chunk in chunk_jobs(copy_jobs, self.max_workers)
+            ]
+            # Wait on results in order so errors are raised deterministically.
+            return [written for future in futures for written in future.result()]
+
+    def _iter_copy_jobs(self) -> Iterator[CopyJob]:
+        """Yield source and target paths for files, creating directories as needed."""
         for root, dirs, files in os.walk(self.source_dir):
             source_root = Path(root)
             target_root = self._directory_mapping[str(source_root)]
 
             for filename in files:
-                self._copy_file(filename, source_root, target_root)
+                if self.ignore_pattern.match(filename):
+                    continue
+                # Render filename since it may be a template:
+                tgt_path = target_root / self.renderer.render_string(filename)
+                yield Path(source_root, filename), tgt_path
 
             for subdir in dirs:
                 self._ensure_dir_exists(subdir, source_root, target_root)
 
-    def _copy_file(
-        self, source_filename: str, source_root: Path, target_root: Path
-    ) -> None:
-        # Render source_filename since it may be a template:
-        tgt_path = target_root / self.renderer.render_string(source_filename)
-
-        if self.ignore_pattern.match(source_filename):
-            return
-
-        src_path = Path(source_root, source_filename)
-        if is_binary(str(src_path)):
-            shutil.copy(src_path, tgt_path)
-            logger.debug(f"Copied binary file from {src_path} to {tgt_path}")
-        else:
-            with tgt_path.open("w") as f:
-                f.write(self.renderer.render(str(src_path)))
-            logger.debug(f"Rendered template from {src_path} to {tgt_path}")
-
-        # Copy file mode (i.e. permissions) of `src_path` to `tgt_path`
-        shutil.copymode(src_path, tgt_path)
-
     def _ensure_dir_exists(
         self, source_subdir: str, source_root: Path, target_root: Path
     ) -> None:
@@ -83,6 +212,49 @@ class FileTreeGenerator:
         logger.debug(f"Created directory {tgt_path}")
 
 
+def chunk_jobs(copy_jobs: List[CopyJob], max_workers: int) -> List[List[CopyJob]]:
+    """Split jobs into chunks, a few per worker so that work stays balanced."""
+    chunk_size = max(1, math.ceil(len(copy_jobs) / (max_workers * CHUNKS_PER_WORKER)))
+    return [
+        copy_jobs[start : start + chunk_size]
+        for start in range(0, len(copy_jobs), chunk_size)
+    ]
+
+
+#: Copier used by a worker process, which is set when the worker starts.
+_worker_copier: Optional[FileCopier] = None
+
+
+def _initialize_worker(copier: FileCopier) -> None:
+    global _worker_copier
+    _worker_copier = copier
+
+
+def _copy_files_in_worker(copy_jobs: List[CopyJob]) -> List[bool]:
+    assert _worker_copier is not None, "Worker wasn't initialized with a copier"
+    return _worker_copier.copy_files(copy_jobs)
+
+
+def hash_file(path: Path) -> str:
+    """Return hash of the contents of file at `path`."""
+    file_hash = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Return hash of the contents of a file after writing `text` in text mode."""
+    # Match the newline translation and encoding used when writing text files.
+    data = text.replace("\n", os.linesep).encode(locale.getpreferredencoding(False))
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_modes_match(path_1: Path, path_2: Path) -> bool:
+    return path_1.stat().st_mode == path_2.stat().st_mode
+
+
 def fnmatches_to_regex(
     patterns: Optional[Iterable[str]], case_insensitive: bool = False, flags: int = 0
 ) -> Pattern[str]:
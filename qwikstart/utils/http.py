@@ -1,12 +1,154 @@
+"""
+Helpers for reading files from urls.
+
+Requests share a session, so connections to the same host are reused. Responses can be
+cached on disk and revalidated using `ETag` and `Last-Modified` headers, so files that
+haven't changed aren't downloaded again.
+"""
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
 from urllib.parse import urlparse
 
-import requests
+from ..exceptions import RepoLoaderError
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+#: Status codes of failed requests that are retried.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
 
 def is_url(url: str) -> bool:
     return bool(urlparse(url).scheme)
 
 
-def read_from_url(url: str) -> str:
-    response = requests.get(url)
+def read_from_url(
+    url: str,
+    cache_dir: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    retries: int = 0,
+    offline: bool = False,
+) -> str:
+    """Return text read from url.
+
+    Args:
+        url: Url of file to read.
+        cache_dir: Directory where responses are cached. Cached responses are also
+            used if the server can't be reached or responds with a server error. By
+            default, responses aren't cached.
+        timeout: Seconds to wait for the server to respond; None waits forever.
+        retries: Number of times failed requests (including connection errors and
+            server errors) are retried.
+        offline: If True, the cached response is returned without a request.
+    """
+    cached = read_cached_response(url, cache_dir) if cache_dir else None
+    if offline:
+        if cached is None:
+            raise RepoLoaderError(f"Cannot read from url while offline: {url}")
+        return str(cached["text"])
+
+    # Import on first use, since `requests` is slow to import.
+    import requests
+
+    headers = get_conditional_headers(cached) if cached else {}
+    try:
+        response = get_session(retries).get(url, headers=headers, timeout=timeout)
+        if cached is not None and response.status_code == requests.codes.not_modified:
+            logger.debug(f"Using cached response from {url}")
+            return str(cached["text"])
+        response.raise_for_status()
+    except requests.RequestException as error:
+        # Client errors (e.g. a missing file) mean the cached response is stale.
+        if cached is None or not is_server_unavailable(error):
+            raise RepoLoaderError(f"Could not read from url {url}: {error}") from error
+        logger.warning(f"Using cached response from {url} after request failed")
+        return str(cached["text"])
+
+    if cache_dir is not None:
+        write_cached_response(url, cache_dir, response)
     return response.text
+
+
+def is_server_unavailable(error: "requests.RequestException") -> bool:
+    """Return True if request failed to reach the server or the server failed.
+
+    Retried requests that still fail (see `RETRY_STATUS_CODES`) count as failures.
+    """
+    from requests import exceptions
+
+    if isinstance(error, exceptions.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return isinstance(
+        error, (exceptions.ConnectionError, exceptions.Timeout, exceptions.RetryError)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_session(retries: int = 0) -> "requests.Session":
+    """Return session shared by all requests in this process, to reuse connections."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries, backoff_factor=0.5, status_forcelist=RETRY_STATUS_CODES
+    )
+    adapter = HTTPAdapter(max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_conditional_headers(cached: Dict[str, Any]) -> Dict[str, str]:
+    """Return headers requesting a response only if cached response has changed."""
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    return headers
+
+
+def read_cached_response(url: str, cache_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with get_cache_path(url, cache_dir).open() as f:
+            cached = dict(json.load(f))
+    except (OSError, ValueError):
+        return None
+    # Ignore cached responses for different urls with the same hash, however unlikely.
+    return cached if cached.get("url") == url else None
+
+
+def write_cached_response(
+    url: str, cache_dir: Path, response: "requests.Response"
+) -> None:
+    cached = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "text": response.text,
+    }
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file that replaces the cached response when complete,
+        # so that concurrent processes never read partially written responses.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(cached, f)
+        os.replace(tmp_path, get_cache_path(url, cache_dir))
+    except OSError:
+        logger.debug(f"Failed to cache response from {url} in {cache_dir}")
+
+
+def get_cache_path(url: str, cache_dir: Path) -> Path:
+    url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return cache_dir / f"{url_hash}.json"
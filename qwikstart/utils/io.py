@@ -1,15 +1,34 @@
+import functools
 from io import StringIO
 from pathlib import Path
-from typing import Any, Dict, cast
+from typing import TYPE_CHECKING, Any, Dict, cast
 
-from ruamel.yaml import YAML
+if TYPE_CHECKING:
+    from ruamel.yaml import YAML
 
-_yaml = YAML()
-# Use 4-space indent for mappings and list-bullet offsets and
-# 6-space indent (from beginning) for list-item text.
-# `sequence = offset + 2` to provide space for bullet and single space`.
-# See https://yaml.readthedocs.io/en/latest/detail.html#indentation-of-block-sequences
-_yaml.indent(mapping=4, sequence=6, offset=4)
+
+@functools.lru_cache(maxsize=None)
+def _get_yaml() -> "YAML":
+    # Import on first use, since `ruamel.yaml` is slow to import.
+    from ruamel.yaml import YAML
+
+    yaml = YAML()
+    # Use 4-space indent for mappings and list-bullet offsets and
+    # 6-space indent (from beginning) for list-item text.
+    # `sequence = offset + 2` to provide space for bullet and single space`.
+    # See https://yaml.readthedocs.io/en/latest/detail.html#indentation-of-block-sequences  # noqa: E501
+    yaml.indent(mapping=4, sequence=6, offset=4)
+    return yaml
+
+
+@functools.lru_cache(maxsize=None)
+def _get_safe_yaml() -> "YAML":
+    from ruamel.yaml import YAML
+
+    # The safe loader uses the C-based parser from `libyaml`, if it's installed, and
+    # returns plain python objects, without the comments and formatting that the
+    # round-trip loader tracks. That makes it much faster for files that are only read.
+    return YAML(typ="safe")
 
 
 def read_file_contents(file_path: Path) -> str:
@@ -19,21 +38,32 @@ def read_file_contents(file_path: Path) -> str:
 
 def load_yaml_file(file_path: Path) -> Dict[str, Any]:
     with file_path.open() as f:
-        return cast(Dict[str, Any], _yaml.load(f))
+        return cast(Dict[str, Any], _get_yaml().load(f))
 
 
 def load_yaml_string(yaml_contents: str) -> Dict[str, Any]:
     # Ignore typing: load can handle strings, but mypy doesn't recognize that.
-    return _yaml.load(yaml_contents)  # type: ignore
+    return _get_yaml().load(yaml_contents)  # type: ignore
+
+
+def safe_load_yaml_file(file_path: Path) -> Dict[str, Any]:
+    """Return data loaded from yaml file, which won't be written back to a file."""
+    with file_path.open() as f:
+        return cast(Dict[str, Any], _get_safe_yaml().load(f))
+
+
+def safe_load_yaml_string(yaml_contents: str) -> Dict[str, Any]:
+    """Return data loaded from yaml string, which won't be written back to a file."""
+    return cast(Dict[str, Any], _get_safe_yaml().load(yaml_contents))
 
 
 def dump_yaml_string(data: Dict[str, Any]) -> str:
     """Return yaml string representation of data."""
     string_buffer = StringIO()
-    _yaml.dump(data, string_buffer)
+    _get_yaml().dump(data, string_buffer)
     return string_buffer.getvalue()
 
 
 def dump_yaml_file(data: Dict[str, Any], file_path: Path) -> None:
     with file_path.open("w") as f:
-        _yaml.dump(data, f)
+        _get_yaml().dump(data, f)
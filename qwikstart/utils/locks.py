@@ -0,0 +1,78 @@
+"""
+Advisory file locks for synchronizing processes that share files, e.g. cached repos.
+
+Locks use `fcntl.flock`, so they're only enforced on POSIX systems. Elsewhere, locks
+are always granted immediately.
+"""
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # `fcntl` is only available on POSIX systems.
+    fcntl = None  # type: ignore
+
+#: Seconds between attempts to acquire a lock when waiting with a timeout.
+POLL_INTERVAL = 0.05
+
+
+class FileLock:
+    """Shared or exclusive lock on a file, which is created if it doesn't exist.
+
+    Any number of processes can hold a shared lock, while an exclusive lock excludes
+    all other processes. Locks belong to a `FileLock` instance (i.e. an open file), so
+    a process should use a single instance for each locked file.
+
+    Switching between shared and exclusive locks releases the lock before acquiring
+    the new one, so another process may acquire the lock in between.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.exclusive: Optional[bool] = None
+        self._fd: Optional[int] = None
+
+    @property
+    def is_locked(self) -> bool:
+        return self.exclusive is not None
+
+    def acquire(self, exclusive: bool = False, timeout: Optional[float] = None) -> None:
+        """Acquire lock, blocking until other processes release conflicting locks.
+
+        Raises `TimeoutError` if the lock isn't acquired within `timeout` seconds, in
+        which case any lock held before is released. By default, waits forever.
+        """
+        if self.exclusive == exclusive:
+            return
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        if fcntl is not None:
+            lock_type = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            if timeout is None:
+                fcntl.flock(self._fd, lock_type)
+            else:
+                self._acquire_with_timeout(self._fd, lock_type, timeout)
+        self.exclusive = exclusive
+
+    def _acquire_with_timeout(self, fd: int, lock_type: int, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, lock_type | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    self.release()
+                    raise TimeoutError(f"Timed out waiting for lock on {self.path}")
+                time.sleep(POLL_INTERVAL)
+
+    def release(self) -> None:
+        if self._fd is not None:
+            # Closing the file releases the lock.
+            os.close(self._fd)
+        self._fd = None
+        self.exclusive = None
@@ -0,0 +1,270 @@
+"""
+Utilities for searching file trees for text matching a regex.
+"""
+import fnmatch
+import logging
+import mmap
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from .file_index import (
+    BINARY_CHECK_SIZE,
+    DirectoryEntry,
+    FileContentIndex,
+    is_binary_data,
+    read_text_file,
+    scan_directory,
+)
+from .filesystem import fnmatches_to_regex
+
+logger = logging.getLogger(__name__)
+
+GITIGNORE_FILE = ".gitignore"
+
+#: Files at least this large are scanned using `mmap` instead of being read into memory.
+MMAP_THRESHOLD = 1024 * 1024
+
+# Regex syntax that can match a single, possibly non-ASCII, character.
+RX_CHARACTER_MATCHERS = re.compile(r"\.|\[\^|\\[wWbBdDsS]")
+# Regex syntax that's invalid, or has a different meaning, in bytes patterns: Escapes
+# for characters by code point or name, and the inline unicode flag.
+RX_UNICODE_SYNTAX = re.compile(r"\\[uUNx]|\(\?[a-zA-Z-]*u")
+# Regex syntax that matches line endings, which are translated when reading text.
+RX_NEWLINE_SYNTAX = re.compile(r"\$|\\[nr]|[\n\r]")
+
+# A list of (compiled pattern, match directories only) tuples.
+IgnoreRules = List[Tuple[Pattern[str], bool]]
+
+
+def iter_files(
+    root_directory: str,
+    path_filter: Optional[str] = None,
+    ignore_patterns: Sequence[str] = (),
+    use_gitignore: bool = False,
+    file_index: Optional[FileContentIndex] = None,
+) -> Iterator[str]:
+    """Yield paths to files in `root_directory`, pruning ignored directories.
+
+    Args:
+        root_directory: Directory to search. Yielded paths start with this directory.
+        path_filter: `fnmatch` pattern that file paths must match.
+        ignore_patterns: `fnmatch` patterns for file and directory names (or paths
+            relative to `root_directory`) that are skipped. Directories matching these
+            patterns are not traversed.
+        use_gitignore: If True, also skip files and directories ignored by
+            `.gitignore` files. Only basic patterns are supported: Negated patterns
+            (starting with "!") are ignored.
+        file_index: Index used to cache directory listings and `.gitignore` files.
+    """
+    ignore_pattern = fnmatches_to_regex(ignore_patterns)
+    yield from _iter_directory(
+        root_directory,
+        "",
+        ignore_pattern,
+        [],
+        path_filter,
+        use_gitignore,
+        file_index,
+    )
+
+
+def _iter_directory(
+    directory: str,
+    relative_dir: str,
+    ignore_pattern: Pattern[str],
+    ignore_rules: IgnoreRules,
+    path_filter: Optional[str],
+    use_gitignore: bool,
+    file_index: Optional[FileContentIndex],
+) -> Iterator[str]:
+    if use_gitignore:
+        gitignore_rules = read_gitignore_rules(directory, relative_dir, file_index)
+        ignore_rules = ignore_rules + gitignore_rules
+
+    subdirectories = []
+    for entry in _list_directory(directory, file_index):
+        relative_path = f"{relative_dir}{entry.name}"
+        is_dir = entry.is_dir
+        if _is_skipped(entry.name, relative_path, is_dir, ignore_pattern, ignore_rules):
+            continue
+
+        path = os.path.join(directory, entry.name)
+        if is_dir:
+            # Like `os.walk`, don't follow symlinks to directories.
+            if not entry.is_symlink:
+                subdirectories.append((path, relative_path))
+        elif path_filter is None or fnmatch.fnmatch(path, path_filter):
+            yield path
+
+    # Match `os.walk` (top-down) ordering: files in a directory before subdirectories.
+    for path, relative_path in subdirectories:
+        yield from _iter_directory(
+            path,
+            relative_path + "/",
+            ignore_pattern,
+            ignore_rules,
+            path_filter,
+            use_gitignore,
+            file_index,
+        )
+
+
+def _list_directory(
+    directory: str, file_index: Optional[FileContentIndex]
+) -> List[DirectoryEntry]:
+    try:
+        if file_index is None:
+            return scan_directory(directory)
+        return file_index.scan_directory(directory)
+    except OSError:
+        logger.debug(f"Failed to read directory {directory}")
+        return []
+
+
+def _is_skipped(
+    name: str,
+    relative_path: str,
+    is_dir: bool,
+    ignore_pattern: Pattern[str],
+    ignore_rules: IgnoreRules,
+) -> bool:
+    if ignore_pattern.match(name) or ignore_pattern.match(relative_path):
+        return True
+    return is_ignored(relative_path, is_dir, ignore_rules)
+
+
+def read_gitignore_rules(
+    directory: str,
+    relative_dir: str = "",
+    file_index: Optional[FileContentIndex] = None,
+) -> IgnoreRules:
+    """Return ignore rules from the `.gitignore` file in `directory`, if any."""
+    path = os.path.join(directory, GITIGNORE_FILE)
+    try:
+        if file_index is None:
+            text = read_text_file(path)
+        else:
+            text = file_index.read_text(path)
+    except (IOError, UnicodeDecodeError):
+        return []
+    lines = text.splitlines() if text else []
+
+    rules: IgnoreRules = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("!"):
+            continue
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if "/" in line:
+            # Patterns containing a slash are relative to the `.gitignore` location.
+            patterns = [relative_dir + line.lstrip("/")]
+        else:
+            # Other patterns match names at any depth below the `.gitignore` location.
+            patterns = [relative_dir + line, f"{relative_dir}*/{line}"]
+        rules.extend((_compile_fnmatch(pattern), dir_only) for pattern in patterns)
+    return rules
+
+
+def _compile_fnmatch(pattern: str) -> Pattern[str]:
+    return re.compile(fnmatch.translate(pattern))
+
+
+def is_ignored(relative_path: str, is_dir: bool, ignore_rules: IgnoreRules) -> bool:
+    return any(
+        pattern.match(relative_path)
+        for pattern, dir_only in ignore_rules
+        if is_dir or not dir_only
+    )
+
+
+def search_file(
+    path: str,
+    regex: Pattern[str],
+    bytes_regex: Optional[Pattern[bytes]] = None,
+    mmap_threshold: int = MMAP_THRESHOLD,
+    file_index: Optional[FileContentIndex] = None,
+) -> bool:
+    """Return True if the contents of file at `path` match `regex`.
+
+    Binary and unreadable files never match. Files larger than `mmap_threshold` are
+    scanned using memory-mapping and `bytes_regex`, if given, to avoid reading the
+    entire file into memory. Otherwise, contents are read through `file_index`, if
+    given, so that unchanged files are only read once.
+    """
+    try:
+        if bytes_regex is not None and os.stat(path).st_size >= mmap_threshold:
+            return _search_mmap(path, bytes_regex)
+        if file_index is None:
+            text = read_text_file(path)
+        else:
+            text = file_index.read_text(path)
+    except (IOError, ValueError):
+        # Note that `UnicodeDecodeError` is a subclass of `ValueError`.
+        logger.debug(f"Failed to read file {path}")
+        return False
+    return text is not None and bool(regex.search(text))
+
+
+def _search_mmap(path: str, bytes_regex: Pattern[bytes]) -> bool:
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if is_binary_data(data[:BINARY_CHECK_SIZE]):
+                return False
+            return bool(bytes_regex.search(data))
+
+
+def search_files(
+    paths: Iterable[str],
+    regex: Pattern[str],
+    max_workers: int = 1,
+    mmap_threshold: int = MMAP_THRESHOLD,
+    file_index: Optional[FileContentIndex] = None,
+) -> List[str]:
+    """Return paths to files whose contents match `regex`, in the order given."""
+    bytes_regex = to_bytes_regex(regex)
+
+    def is_match(path: str) -> bool:
+        return search_file(
+            path,
+            regex,
+            bytes_regex,
+            mmap_threshold=mmap_threshold,
+            file_index=file_index,
+        )
+
+    paths = list(paths)
+    if max_workers <= 1:
+        return [path for path in paths if is_match(path)]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        matches = executor.map(is_match, paths)
+        return [path for path, match in zip(paths, matches) if match]
+
+
+def to_bytes_regex(regex: Pattern[str]) -> Optional[Pattern[bytes]]:
+    """Return equivalent regex for searching bytes, if one exists.
+
+    Only simple ASCII patterns are converted: Patterns that can match a single
+    character (e.g. ".", "[^a]", or "\\w") or that ignore case behave differently
+    for multi-byte characters when searching bytes, and character escapes (e.g.
+    "\\xe9" or "\\u00e9") match code points in strings but raw bytes in bytes.
+    Patterns matching line endings (e.g. "$" or "\\n") are also skipped, since text
+    is read with universal newlines but memory-mapped files are not.
+    """
+    if (
+        not regex.pattern.isascii()
+        or regex.flags & re.IGNORECASE
+        or RX_CHARACTER_MATCHERS.search(regex.pattern)
+        or RX_UNICODE_SYNTAX.search(regex.pattern)
+        or RX_NEWLINE_SYNTAX.search(regex.pattern)
+    ):
+        return None
+    flags = regex.flags & ~re.UNICODE
+    try:
+        return re.compile(regex.pattern.encode("ascii"), flags=flags)
+    except re.error:
+        return None
@@ -1,20 +1,48 @@
+import os
+import re
+import threading
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Type, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import jinja2
+from jinja2.utils import LRUCache
 from typing_extensions import Protocol
 
-from ..base_context import ExecutionContext
 from .core import ensure_path, resolve_path
 
+if TYPE_CHECKING:
+    from ..base_context import ExecutionContext  # pragma: no cover
+
 DEFAULT_TEMPLATE_VARIABLE_PREFIX = "qwikstart"
 TEMPLATE_VARIABLE_META_PREFIX = "_meta_"
+#: Maximum number of compiled templates kept by `TemplateCache` (and by each jinja
+#: environment it creates) before the least-recently-used template is evicted.
+DEFAULT_TEMPLATE_CACHE_SIZE = 400
+#: Maximum number of jinja environments (i.e. distinct template loader and filter
+#: combinations) kept by `TemplateCache`.
+MAX_CACHED_ENVIRONMENTS = 50
+#: Start of jinja expressions, statements, and comments.
+RX_TEMPLATE_SYNTAX = re.compile(r"{{|{%|{#")
 TRenderer = TypeVar("TRenderer", bound="TemplateRenderer")
+TemplateFilters = Mapping[str, Callable[..., str]]
 
 
 class TemplateContext(Protocol):
     @property
-    def execution_context(self) -> ExecutionContext:
+    def execution_context(self) -> "ExecutionContext":
         pass  # pragma: no cover
 
     @property
@@ -26,6 +54,169 @@ class TemplateContext(Protocol):
         pass  # pragma: no cover
 
 
+class SourceDirLoader(jinja2.BaseLoader):
+    """Template loader rooted at a qwikstart repo's `source_dir`.
+
+    Template names are paths relative to `source_dir`, so lookups don't depend on how
+    deeply `source_dir` is nested and cached templates are keyed by portable names.
+    Templates are searched for in `template_sources` (in-memory templates keyed by
+    name), then `source_dir`, and then any fallback `search_paths`. Absolute names,
+    and names pointing outside of `source_dir`, are loaded directly from the filesystem.
+
+    Loaders with the same configuration compare equal, so that they share environments
+    in `TemplateCache`.
+    """
+
+    def __init__(
+        self,
+        source_dir: Union[Path, str],
+        search_paths: Sequence[Union[Path, str]] = (),
+        template_sources: Optional[Mapping[str, str]] = None,
+    ):
+        self.source_dir = os.fspath(source_dir)
+        self.search_paths = tuple(os.fspath(path) for path in search_paths)
+        self.template_sources = dict(template_sources or {})
+        self._key = (
+            self.source_dir,
+            self.search_paths,
+            tuple(sorted(self.template_sources.items())),
+        )
+        self._loaders: List[jinja2.BaseLoader] = []
+        if self.template_sources:
+            self._loaders.append(jinja2.DictLoader(self.template_sources))
+        self._loaders.append(
+            jinja2.FileSystemLoader([self.source_dir, *self.search_paths])
+        )
+        self._root_loader = jinja2.FileSystemLoader("/")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, SourceDirLoader) and other._key == self._key
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def get_source(
+        self, environment: jinja2.Environment, template: str
+    ) -> Tuple[str, Optional[str], Optional[Callable[[], bool]]]:
+        if os.path.isabs(template) or ".." in template.split("/"):
+            path = os.path.normpath(os.path.join(self.source_dir, template))
+            return self._root_loader.get_source(environment, os.path.abspath(path))
+
+        for loader in self._loaders:
+            try:
+                return loader.get_source(environment, template)
+            except jinja2.TemplateNotFound:
+                continue
+        raise jinja2.TemplateNotFound(template)
+
+
+def contains_template_syntax(text: str) -> bool:
+    """Return True if `text` would be changed by rendering it as a template."""
+    return RX_TEMPLATE_SYNTAX.search(text) is not None
+
+
+def create_environment(
+    template_loader: jinja2.BaseLoader,
+    template_filters: Optional[TemplateFilters] = None,
+    cache_size: int = DEFAULT_TEMPLATE_CACHE_SIZE,
+    bytecode_cache: Optional[jinja2.BytecodeCache] = None,
+) -> jinja2.Environment:
+    env = jinja2.Environment(
+        loader=template_loader,
+        undefined=jinja2.StrictUndefined,
+        keep_trailing_newline=True,
+        extensions=["jinja2_time.TimeExtension"],
+        cache_size=cache_size,
+        # Check template file modification times so that edited files are recompiled.
+        auto_reload=True,
+        bytecode_cache=bytecode_cache,
+    )
+    env.filters.update(template_filters or {})
+    return env
+
+
+class TemplateCache:
+    """Cache of jinja environments and compiled templates shared between renderers.
+
+    Environments are shared by renderers with the same loader and filters, so
+    templates loaded from files are compiled once and recompiled only when the file's
+    modification time changes. Templates compiled from strings are stored in a
+    least-recently-used cache, keyed by environment and source string. Both caches are
+    bounded, evicting the least-recently-used entries.
+
+    If given a `bytecode_cache`, compiled file templates are also persisted (e.g. to
+    disk) so that later processes can skip compilation entirely.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_TEMPLATE_CACHE_SIZE,
+        bytecode_cache: Optional[jinja2.BytecodeCache] = None,
+    ):
+        self.max_size = max_size
+        self.bytecode_cache = bytecode_cache
+        self._environments = LRUCache(MAX_CACHED_ENVIRONMENTS)
+        self._string_templates = LRUCache(max_size)
+        self._lock = threading.Lock()
+
+    def get_environment(
+        self,
+        template_loader: jinja2.BaseLoader,
+        template_filters: Optional[TemplateFilters] = None,
+    ) -> jinja2.Environment:
+        template_filters = template_filters or {}
+        key = (template_loader, tuple(sorted(template_filters.items())))
+        with self._lock:
+            env: Optional[jinja2.Environment] = self._environments.get(key)
+            if env is None:
+                env = create_environment(
+                    template_loader,
+                    template_filters,
+                    cache_size=self.max_size,
+                    bytecode_cache=self.bytecode_cache,
+                )
+                self._environments[key] = env
+            return env
+
+    def from_string(self, env: jinja2.Environment, source: str) -> jinja2.Template:
+        # Key by the environment itself, rather than its `id`, since environments
+        # evicted from `_environments` may be garbage-collected and their `id` reused.
+        key: Tuple[jinja2.Environment, str] = (env, source)
+        template: Optional[jinja2.Template] = self._string_templates.get(key)
+        if template is None:
+            template = env.from_string(source)
+            self._string_templates[key] = template
+        return template
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "TemplateCache":
+        # Compiled templates don't depend on the context, so deep copies of contexts
+        # (e.g. values copied by `Task.copy_for_target`) share the cache.
+        return self
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Jinja environments and locks can't be pickled, so worker processes (e.g. for
+        # tasks run against many targets) start with an empty cache.
+        return {"max_size": self.max_size, "bytecode_cache": self.bytecode_cache}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore
+
+    def clear(self) -> None:
+        with self._lock:
+            self._environments.clear()
+            self._string_templates.clear()
+
+
+def create_bytecode_cache(directory: Path) -> jinja2.FileSystemBytecodeCache:
+    """Return persistent cache of compiled templates stored in `directory`.
+
+    Cache entries are keyed by template path and validated against a checksum of the
+    template source, so templates changed by a repo update are recompiled.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    return jinja2.FileSystemBytecodeCache(str(directory))
+
+
 class TemplateRenderer:
     def __init__(
         self,
@@ -33,13 +224,12 @@ class TemplateRenderer:
         template_variables: Optional[Dict[str, Any]] = None,
         template_variable_prefix: Optional[str] = None,
         source_dir: Optional[Path] = None,
+        template_cache: Optional[TemplateCache] = None,
     ):
-        self._env = jinja2.Environment(
-            loader=template_loader,
-            undefined=jinja2.StrictUndefined,
-            keep_trailing_newline=True,
-            extensions=["jinja2_time.TimeExtension"],
-        )
+        self._template_loader = template_loader
+        self._template_filters: Dict[str, Callable[..., str]] = {}
+        self._template_cache = template_cache
+        self._env = self._create_environment()
         self.template_variables = template_variables or {}
 
         if template_variable_prefix is None:
@@ -49,7 +239,29 @@ class TemplateRenderer:
 
         self.source_dir = ensure_path(source_dir or Path("."))
 
+    def _create_environment(self) -> jinja2.Environment:
+        if self._template_cache is None:
+            return create_environment(self._template_loader, self._template_filters)
+        return self._template_cache.get_environment(
+            self._template_loader, self._template_filters
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Jinja environments can't be pickled, so drop the environment and recreate it
+        # on unpickling. This allows renderers to be sent to worker processes, where
+        # the template cache starts empty but keeps using any persistent bytecode cache.
+        state = self.__dict__.copy()
+        del state["_env"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._env = self._create_environment()
+
     def get_template(self, path_str: str) -> jinja2.Template:
+        if isinstance(self._template_loader, SourceDirLoader):
+            # Names are relative to `source_dir`, which the loader resolves directly.
+            return self._env.get_template(Path(path_str).as_posix())
         path = self.resolve_template_path(path_str)
         return self._env.get_template(str(path.resolve()))
 
@@ -64,7 +276,10 @@ class TemplateRenderer:
         return template.render(self._template_context)
 
     def render_string(self, string: str) -> str:
-        template = self._env.from_string(string)
+        if self._template_cache is None:
+            template = self._env.from_string(string)
+        else:
+            template = self._template_cache.from_string(self._env, string)
         return template.render(self._template_context)
 
     def add_template_variable(self, key: str, value: Any) -> None:
@@ -74,8 +289,10 @@ class TemplateRenderer:
         self.template_variables.update(kwargs)
 
     def add_template_filters(self, **kwargs: Callable[..., str]) -> None:
-        for name, filter_function in kwargs.items():
-            self._env.filters[name] = filter_function
+        self._template_filters.update(kwargs)
+        # Filters are part of the environment, so switch to an environment (possibly
+        # shared through the template cache) that includes the new filters.
+        self._env = self._create_environment()
 
     @classmethod
     def from_context(cls: Type[TRenderer], context: TemplateContext) -> TRenderer:
@@ -91,4 +308,5 @@ class TemplateRenderer:
             template_variables={**meta_variables, **context.template_variables},
             template_variable_prefix=context.template_variable_prefix,
             source_dir=execution_context.source_dir,
+            template_cache=execution_context.template_cache,
         )
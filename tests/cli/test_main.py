@@ -1,3 +1,5 @@
+import logging.config
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 from click.testing import CliRunner
@@ -6,20 +8,88 @@ from qwikstart.cli import main
 from qwikstart.exceptions import UserFacingError
 from qwikstart.operations import add_file
 from qwikstart.parser import get_operations_mapping
+from qwikstart.tasks import TargetResult
 
 
 def test_run() -> None:
     runner = CliRunner()
     with patch.object(main, "resolve_task") as mock_resolve_task:
         # FIXME: Patch logging config which breaks pyfakefs for some reason.
-        with patch.object(main.logging.logging.config, "dictConfig"):
+        with patch.object(logging.config, "dictConfig"):
             result = runner.invoke(main.run, "fake/path")
     assert result.exit_code == 0
     mock_resolve_task.assert_called_once_with(
-        "fake/path", repo_url=None, execution_config={"dry_run": False}
+        "fake/path",
+        repo_url=None,
+        execution_config={
+            "dry_run": False,
+            "max_workers": 1,
+            "offline": False,
+            "lazy_lint": False,
+        },
     )
 
 
+def test_run_offline() -> None:
+    runner = CliRunner()
+    with patch.object(main, "resolve_task") as mock_resolve_task:
+        with patch.object(logging.config, "dictConfig"):
+            result = runner.invoke(main.run, ["fake/path", "--offline"])
+    assert result.exit_code == 0
+    assert mock_resolve_task.call_args[1]["execution_config"]["offline"]
+
+
+def test_run_no_lint() -> None:
+    runner = CliRunner()
+    with patch.object(main, "resolve_task") as mock_resolve_task:
+        with patch.object(logging.config, "dictConfig"):
+            result = runner.invoke(main.run, ["fake/path", "--no-lint"])
+    assert result.exit_code == 0
+    assert mock_resolve_task.call_args[1]["execution_config"]["lazy_lint"]
+
+
+def test_run_targets() -> None:
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        Path("targets.txt").write_text("service-a\n\n# comment\nservice-b\n")
+        with patch.object(main, "resolve_task") as mock_resolve_task:
+            task = mock_resolve_task.return_value
+            task.execute_for_targets.return_value = [
+                TargetResult(Path("service-a")),
+                TargetResult(Path("service-b")),
+            ]
+            with patch.object(logging.config, "dictConfig"):
+                result = runner.invoke(
+                    main.run,
+                    ["fake/path", "--targets", "targets.txt", "--target-workers", "2"],
+                )
+    assert result.exit_code == 0
+    task.execute.assert_not_called()
+    task.execute_for_targets.assert_called_once_with(
+        [Path("service-a"), Path("service-b")], max_workers=2
+    )
+    assert "succeeded: service-b" in result.output
+
+
+def test_run_targets_with_failure() -> None:
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        Path("targets.txt").write_text("service-a\nservice-b\n")
+        with patch.object(main, "resolve_task") as mock_resolve_task:
+            task = mock_resolve_task.return_value
+            task.execute_for_targets.return_value = [
+                TargetResult(Path("service-a")),
+                TargetResult(Path("service-b"), error="fake-error"),
+            ]
+            with patch.object(logging.config, "dictConfig"):
+                result = runner.invoke(
+                    main.run, ["fake/path", "--targets", "targets.txt"]
+                )
+    assert "failed: service-b: fake-error" in result.output
+    assert isinstance(result.exception, UserFacingError)
+    assert str(result.exception) == "Task failed for 1 of 2 targets"
+
+
 def test_list_operations() -> None:
     runner = CliRunner()
     result = runner.invoke(main.list_operations)
@@ -1,11 +1,13 @@
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, Iterator
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 
+from qwikstart import repository
 from qwikstart.cli import resolver
+from qwikstart.config import Config
 from qwikstart.exceptions import RepoLoaderError, UserFacingError
 
 FAKE_PATH_STR = "/path/to/fake.yml"
@@ -19,7 +21,7 @@ class TestResolveTask:
         with patch_resolve_task_dependencies(mock_loader) as mock_parse_task:
             resolver.resolve_task(FAKE_PATH_STR)
         mock_parse_task.assert_called_once_with(
-            data, execution_config={"source_dir": FAKE_PATH.parent}
+            data, execution_config={"source_dir": FAKE_PATH.parent, "file_buffer": ANY}
         )
 
     def test_resolve_directory(self) -> None:
@@ -28,19 +30,62 @@ class TestResolveTask:
         with patch_resolve_task_dependencies(mock_loader) as mock_parse_task:
             resolver.resolve_task(FAKE_PATH_STR)
         mock_parse_task.assert_called_once_with(
-            data, execution_config={"source_dir": FAKE_PATH.parent}
+            data, execution_config={"source_dir": FAKE_PATH.parent, "file_buffer": ANY}
+        )
+
+    def test_file_buffer_dry_run(self) -> None:
+        mock_loader = create_mock_repo_loader({"name": "fake_task"})
+        with patch_resolve_task_dependencies(mock_loader) as mock_parse_task:
+            resolver.resolve_task(FAKE_PATH_STR, execution_config={"dry_run": True})
+        execution_config = mock_parse_task.call_args[1]["execution_config"]
+        assert execution_config["file_buffer"].dry_run
+
+    def test_template_cache_configured(self, tmp_path: Path) -> None:
+        config = Config(
+            repo_cache="", git_abbreviations={}, bytecode_cache=str(tmp_path)
+        )
+        mock_loader = create_mock_repo_loader({"name": "fake_task"})
+        with patch.object(resolver, "get_user_config", return_value=config):
+            with patch_resolve_task_dependencies(mock_loader) as mock_parse_task:
+                resolver.resolve_task(FAKE_PATH_STR)
+        execution_config = mock_parse_task.call_args[1]["execution_config"]
+        assert execution_config["template_cache"].bytecode_cache is not None
+
+    def test_offline(self) -> None:
+        mock_loader = create_mock_repo_loader({"name": "fake_task"})
+        with patch.object(
+            repository, "get_repo_loader", return_value=mock_loader
+        ) as get_repo_loader:
+            with patch.object(resolver, "parse_task"):
+                resolver.resolve_task(FAKE_PATH_STR, execution_config={"offline": True})
+        get_repo_loader.assert_called_once_with(
+            FAKE_PATH_STR, None, offline=True, lazy_lint=False
         )
 
     def test_loader_error(self) -> None:
         error = RepoLoaderError("fake error")
-        with patch.object(resolver.repository, "get_repo_loader", side_effect=error):
+        with patch.object(repository, "get_repo_loader", side_effect=error):
             with pytest.raises(UserFacingError):
                 resolver.resolve_task(FAKE_PATH_STR)
 
 
+class TestCreateTemplateCache:
+    def test_no_bytecode_cache_configured(self) -> None:
+        config = Config(repo_cache="", git_abbreviations={})
+        assert resolver.create_template_cache(config) is None
+
+    def test_bytecode_cache_configured(self, tmp_path: Path) -> None:
+        config = Config(
+            repo_cache="", git_abbreviations={}, bytecode_cache=str(tmp_path)
+        )
+        template_cache = resolver.create_template_cache(config)
+        assert template_cache is not None
+        assert template_cache.bytecode_cache is not None
+
+
 @contextmanager
 def patch_resolve_task_dependencies(mock_loader: Mock) -> Iterator[Mock]:
-    with patch.object(resolver.repository, "get_repo_loader", return_value=mock_loader):
+    with patch.object(repository, "get_repo_loader", return_value=mock_loader):
         with patch.object(resolver, "parse_task") as mock_parse_task:
             yield mock_parse_task
 
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Union
 
 from pyfakefs.fake_filesystem_unittest import TestCase
 
@@ -9,6 +9,66 @@ from qwikstart.operations import add_file
 from .. import helpers
 
 
+class TestInferResources:
+    def test_target_path_written(self) -> None:
+        resources = create_operation("output.txt").get_resources()
+        assert resources is not None
+        assert resources.writes == {os.path.abspath("output.txt")}
+        assert "template_variables" in resources.reads
+
+    def test_template_path_read(self) -> None:
+        resources = create_operation("output.txt", "template.txt").get_resources()
+        assert resources is not None
+        assert os.path.abspath("template.txt") in resources.reads
+
+    def test_equivalent_target_paths_normalized(self) -> None:
+        paths: List[Union[Path, str]] = [
+            "output.txt",
+            "./output.txt",
+            Path("subdir/../output.txt"),
+        ]
+        all_writes: Set[str] = set()
+        for target_path in paths:
+            resources = create_operation(target_path).get_resources()
+            assert resources is not None
+            all_writes |= resources.writes
+        assert all_writes == {os.path.abspath("output.txt")}
+
+    def test_conflicts_with_declared_relative_path(self) -> None:
+        resources = create_operation("output.txt").get_resources()
+        operation = helpers.FakeOperation(opconfig={"writes": ["./output.txt"]})
+        declared_resources = operation.get_resources()
+        assert resources is not None and declared_resources is not None
+        assert resources.conflicts_with(declared_resources)
+
+    def test_undeclared_writes_inferred(self) -> None:
+        operation = add_file.Operation(
+            {"target_path": "output.txt", "template_path": "template.txt"},
+            opconfig={"reads": ["data"]},
+        )
+        resources = operation.get_resources()
+        assert resources is not None
+        assert "data" in resources.reads
+        assert resources.writes == {os.path.abspath("output.txt")}
+
+    def test_unknown_with_templated_target_path(self) -> None:
+        operation = create_operation("{{ qwikstart.name }}.txt")
+        assert operation.get_resources() is None
+
+    def test_unknown_with_templated_template_path(self) -> None:
+        operation = create_operation("output.txt", "{{ qwikstart.name }}.txt")
+        assert operation.get_resources() is None
+
+    def test_unknown_without_target_path(self) -> None:
+        assert (
+            add_file.Operation({"template_path": "template.txt"}).get_resources()
+            is None
+        )
+
+    def test_unknown_without_template_path(self) -> None:
+        assert add_file.Operation({"target_path": "output.txt"}).get_resources() is None
+
+
 class TestAddFile(TestCase):
     def setUp(self) -> None:
         self.setUpPyfakefs()
@@ -26,6 +86,15 @@ class TestAddFile(TestCase):
         )
         assert not output_path.exists()
 
+    def test_in_memory_template(self) -> None:
+        execution_context = helpers.get_execution_context(
+            template_sources={"memory.txt": "In-memory template"}
+        )
+        output_path = self.render_template(
+            Path("memory.txt"), execution_context=execution_context
+        )
+        assert helpers.read_file_path(output_path) == "In-memory template"
+
     def test_variables(self) -> None:
         template_path = self.create_template("""Hello, {{ qwikstart.name }}!""")
         output_path = self.render_template(
@@ -83,3 +152,11 @@ class TestAddFile(TestCase):
         add_file_op.execute(context)
 
         return output_file
+
+
+def create_operation(
+    target_path: Union[Path, str], template_path: str = "template.txt"
+) -> add_file.Operation:
+    return add_file.Operation(
+        {"target_path": target_path, "template_path": template_path}
+    )
@@ -23,11 +23,43 @@ class TestAddFileTree:
 
         # FileTreeGenerator should be initialized:
         mock_file_generator.assert_called_once_with(
-            template_dir, target_dir, ANY, ignore_patterns=[]
+            template_dir,
+            target_dir,
+            ANY,
+            ignore_patterns=[],
+            max_workers=1,
+            executor="thread",
+            incremental=False,
         )
         # The FileTreeGenerator instance's copy method should be called:
         mock_file_generator.return_value.copy.assert_called_once()
 
+    def test_concurrent_copy_options(self) -> None:
+        context = {
+            "execution_context": helpers.get_execution_context(),
+            "template_dir": Path("/path/to/template/dir"),
+            "max_workers": 4,
+            "executor": "process",
+        }
+
+        mock_file_generator = self.execute_operation(context)
+
+        _, kwargs = mock_file_generator.call_args
+        assert kwargs["max_workers"] == 4
+        assert kwargs["executor"] == "process"
+
+    def test_incremental(self) -> None:
+        context = {
+            "execution_context": helpers.get_execution_context(),
+            "template_dir": Path("/path/to/template/dir"),
+            "incremental": True,
+        }
+
+        mock_file_generator = self.execute_operation(context)
+
+        _, kwargs = mock_file_generator.call_args
+        assert kwargs["incremental"] is True
+
     def test_dry_run(self) -> None:
         target_dir = Path("/path/to/target/dir")
         context = {
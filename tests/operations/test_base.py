@@ -1,9 +1,12 @@
+import asyncio
+import os
 from typing import Any
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
 import pytest
 
+from qwikstart import base_context
 from qwikstart.base_context import DictContext
 from qwikstart.operations import base
 
@@ -38,10 +41,78 @@ class TestOperationConfig:
         assert opconfig.display_description is False
 
 
+class TestGetResources:
+    def test_unknown_by_default(self) -> None:
+        assert helpers.FakeOperation().get_resources() is None
+
+    def test_declared_in_opconfig(self) -> None:
+        operation = helpers.FakeOperation(opconfig={"reads": ["a"], "writes": ["b"]})
+        assert operation.get_resources() == base.StepResources(
+            reads=frozenset(["a", os.path.abspath("a")]),
+            writes=frozenset(["b", os.path.abspath("b")]),
+        )
+
+    def test_undeclared_reads_fall_back_to_context_reads(self) -> None:
+        operation = helpers.FakeOperation(opconfig={"writes": ["b"]})
+        resources = operation.get_resources()
+        assert resources is not None
+        assert resources.reads == operation.get_context_reads()
+
+    def test_context_reads_include_input_mapping(self) -> None:
+        operation = helpers.FakeOperation(
+            opconfig={"input_mapping": {"data.variables": "template_variables"}}
+        )
+        assert operation.get_context_reads() == {"data", "template_variables"}
+
+    def test_context_reads_with_input_namespace(self) -> None:
+        operation = helpers.FakeOperation(opconfig={"input_namespace": "data"})
+        assert operation.get_context_reads() == {"data"}
+
+
+class TestCompile:
+    def test_plan_resolved_on_init(self) -> None:
+        operation = helpers.FakeOperation(
+            opconfig={"input_mapping": {"a.b": "c"}, "output_namespace": "out"}
+        )
+        plan = operation.plan
+        assert plan.context_class is helpers.ContextWithDict
+        assert plan.context_fields == {"execution_context", "template_variables"}
+        assert plan.input_mapping[0][0].parts == ("a", "b")
+        assert plan.output_mapping == ()
+        assert plan.input_namespace is None
+        assert plan.output_namespace == "out"
+
+    def test_context_class_resolved_once(self) -> None:
+        operation = helpers.FakeOperation()
+        context = {"execution_context": helpers.get_execution_context()}
+        with patch.object(
+            helpers.FakeOperation, "get_context_class"
+        ) as get_context_class:
+            operation.execute(context)
+            operation.execute(context)
+        get_context_class.assert_not_called()
+
+    def test_context_fields_from_plan(self) -> None:
+        operation = helpers.FakeOperation()
+        context = {"execution_context": helpers.get_execution_context(), "x": 1}
+        with patch.object(
+            base_context, "get_init_parameter_names"
+        ) as get_init_parameter_names:
+            operation.execute(context)
+        get_init_parameter_names.assert_not_called()
+
+
 class TestBaseOperation(TestCase):
     def setUp(self) -> None:
         self.execution_context = helpers.get_execution_context()
 
+    def test_aexecute(self) -> None:
+        operation = helpers.FakeOperation()
+        context = {"execution_context": self.execution_context}
+        output = asyncio.run(operation.aexecute(context))
+        assert isinstance(operation.run_context, helpers.ContextWithDict)
+        assert output["template_variables"] == {}
+
     def test_default_template_variables(self) -> None:
         operation = helpers.FakeOperation()
         output = operation.execute({"execution_context": self.execution_context})
@@ -56,6 +56,11 @@ class TestDefineContext(TestCase):
             "url": "https://myproject.io",
         }
 
+    def test_error_for_binary_file(self) -> None:
+        regex = r"^PROJECT = \'(?P<project>\w+)\'"
+        with pytest.raises(OperationError, match="binary file"):
+            self.context_from_regex(regex, "PROJECT = 'myproject'\0")
+
     def context_from_regex(self, regex: str, text: str) -> Dict[str, Any]:
         """Return output context from `context_from_regex.Operation`."""
         file_path = Path("target_file.txt")
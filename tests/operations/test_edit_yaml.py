@@ -5,6 +5,7 @@ from typing import Any, Dict
 from pyfakefs.fake_filesystem_unittest import TestCase
 
 from qwikstart.operations import edit_yaml
+from qwikstart.utils.file_buffer import FileBuffer
 from qwikstart.utils.io import dump_yaml_string, load_yaml_string
 
 from .. import helpers
@@ -49,6 +50,20 @@ class TestEditYamlFS(TestCase):
         )
         assert output_yaml == {"unchanged": True}
 
+    def test_file_buffer(self) -> None:
+        self.initialize_yaml({"one": 1})
+        buffer = FileBuffer()
+        execution_context = helpers.get_execution_context(file_buffer=buffer)
+        output_yaml = self.edit_yaml_and_return_parsed(
+            {"two": 2}, execution_context=execution_context
+        )
+        assert output_yaml == {"one": 1}
+        buffer.flush()
+        assert load_yaml_string(helpers.read_file_path(self.file_path)) == {
+            "one": 1,
+            "two": 2,
+        }
+
     def test_overwrite(self) -> None:
         self.initialize_yaml({"mutable": 1})
         assert self.edit_yaml_and_return_parsed({"mutable": 2}) == {"mutable": 2}
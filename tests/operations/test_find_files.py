@@ -1,11 +1,13 @@
 import os
 import textwrap
+import time
 from typing import Any
 from unittest.mock import Mock, patch
 
 from pyfakefs.fake_filesystem_unittest import TestCase
 
 from qwikstart.operations import find_files
+from qwikstart.utils import file_index, search
 
 from .. import helpers
 
@@ -68,7 +70,38 @@ class TestFindFilesFS(TestCase):
         self.fs.create_file("match2.txt", contents="hello")
         assert self.find_files("(hi|hello)") == ["./match1.txt", "./match2.txt"]
 
-    @patch.object(find_files, "logger")
+    def test_ignore_directory(self) -> None:
+        self.fs.create_file("node_modules/file.txt", contents="match")
+        self.fs.create_file("src/file.txt", contents="match")
+        assert self.find_files("match", ignore=["node_modules"]) == ["./src/file.txt"]
+
+    def test_use_gitignore(self) -> None:
+        self.fs.create_file(".gitignore", contents="build/")
+        self.fs.create_file("build/file.txt", contents="match")
+        self.fs.create_file("src/file.txt", contents="match")
+        assert self.find_files("match", use_gitignore=True) == ["./src/file.txt"]
+
+    def test_concurrent_search(self) -> None:
+        self.fs.create_file("match1.txt", contents="hi")
+        self.fs.create_file("match2.txt", contents="hello")
+        self.fs.create_file("no-match.txt", contents="bye")
+        assert self.find_files("(hi|hello)", max_workers=2) == [
+            "./match1.txt",
+            "./match2.txt",
+        ]
+
+    def test_repeated_search_uses_file_index(self) -> None:
+        self.fs.create_file("file.txt", contents="hello")
+        mtime = time.time() - 60
+        os.utime("file.txt", (mtime, mtime))
+
+        execution_context = helpers.get_execution_context()
+        assert self.find_files("hello", execution_context=execution_context)
+        with patch.object(file_index, "read_text_file") as read_text_file:
+            assert self.find_files("hel+o", execution_context=execution_context)
+        read_text_file.assert_not_called()
+
+    @patch.object(search, "logger")
     def test_unreadable_file(self, logger: Mock) -> None:
         self.fs.create_file("restricted_file.txt")
         os.chmod("restricted_file.txt", 0o000)
@@ -78,8 +111,8 @@ class TestFindFilesFS(TestCase):
     def find_files(
         self, regex: str = "", output_name: str = "matching_files", **kwargs: Any
     ) -> Any:
+        kwargs.setdefault("execution_context", helpers.get_execution_context())
         context = {
-            "execution_context": helpers.get_execution_context(),
             "regex": regex,
             **kwargs,
         }
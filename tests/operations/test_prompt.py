@@ -38,6 +38,17 @@ class TestPromptUser:
             name="name", choices=["Troy", "Abed"]
         )
 
+    def test_choices_from_does_not_modify_inputs(self) -> None:
+        inputs = [{"name": "name", "choices_from": "possible_names"}]
+        with patch.object(prompt_user, "create_prompt_spec"):
+            execute_prompt_op(
+                {
+                    "inputs": inputs,
+                    "template_variables": {"possible_names": ["Troy", "Abed"]},
+                }
+            )
+        assert inputs == [{"name": "name", "choices_from": "possible_names"}]
+
     def test_unknown_choices_from(self) -> None:
         with pytest.raises(OperationError):
             execute_prompt_op(
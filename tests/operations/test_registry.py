@@ -0,0 +1,100 @@
+from typing import Any, List, cast
+from unittest.mock import Mock, patch
+
+import pytest
+
+from qwikstart.operations import registry
+from qwikstart.operations.registry import OperationRegistry
+
+
+class MockOperation:
+    name = "fake_op"
+    aliases: List[str] = ["fake_alias"]
+
+
+class TestOperationRegistry:
+    def test_register_name_and_aliases(self) -> None:
+        op_registry = OperationRegistry()
+        op_registry.register(MockOperation)
+        assert dict(op_registry) == cast(
+            Any, {"fake_op": MockOperation, "fake_alias": MockOperation}
+        )
+
+    def test_alias_does_not_replace_name(self) -> None:
+        class AliasOperation:
+            name = "other_op"
+            aliases = ["fake_op"]
+
+        op_registry = OperationRegistry()
+        op_registry.register(MockOperation)
+        op_registry.register(AliasOperation)
+        assert op_registry["fake_op"] is cast(Any, MockOperation)
+        assert op_registry["other_op"] is cast(Any, AliasOperation)
+
+    def test_lazy_module_imported_on_access(self) -> None:
+        op_registry = OperationRegistry(lazy_modules={"fake_op": "fake_module"})
+        with patch.object(registry, "importlib") as importlib:
+            # Importing an operation module registers the operation it defines.
+            importlib.import_module.side_effect = lambda name: op_registry.register(
+                MockOperation
+            )
+            assert "fake_op" in op_registry
+            importlib.import_module.assert_not_called()
+
+            assert op_registry["fake_op"] is cast(Any, MockOperation)
+            assert op_registry["fake_op"] is cast(Any, MockOperation)
+            importlib.import_module.assert_called_once_with("fake_module")
+
+    def test_missing_operation(self) -> None:
+        with pytest.raises(KeyError):
+            OperationRegistry()["not_an_operation"]
+
+    def test_entry_points_loaded_for_unknown_operation(self) -> None:
+        entry_point = Mock(load=Mock(return_value=MockOperation))
+        op_registry = self.create_registry_with_entry_points([entry_point])
+        assert op_registry["fake_op"] is cast(Any, MockOperation)
+        assert "fake_alias" in op_registry
+
+    def test_entry_points_loaded_once(self) -> None:
+        with patch.object(registry, "iter_entry_points", return_value=[]) as iter_eps:
+            op_registry = OperationRegistry(entry_point_group="test.group")
+            assert "not_an_operation" not in op_registry
+            assert list(op_registry) == []
+            iter_eps.assert_called_once_with("test.group")
+
+    def test_broken_entry_point_ignored(self) -> None:
+        entry_point = Mock(load=Mock(side_effect=ImportError))
+        op_registry = self.create_registry_with_entry_points([entry_point])
+        assert list(op_registry) == []
+
+    def create_registry_with_entry_points(
+        self, entry_points: List[Any]
+    ) -> OperationRegistry:
+        op_registry = OperationRegistry(entry_point_group="test.group")
+        with patch.object(registry, "iter_entry_points", return_value=entry_points):
+            op_registry.load_entry_points()
+        return op_registry
+
+
+def test_global_registry_resolves_alias() -> None:
+    from qwikstart.operations import OPERATION_REGISTRY
+
+    assert OPERATION_REGISTRY["prompt_user"] is OPERATION_REGISTRY["prompt"]
+
+
+def test_unnamed_operation_subclass_not_registered() -> None:
+    from qwikstart.operations import OPERATION_REGISTRY, BaseOperation
+
+    with patch.object(OPERATION_REGISTRY, "register") as mock_register:
+
+        class IntermediateOperation(BaseOperation[Any, None]):
+            pass
+
+    mock_register.assert_not_called()
+
+
+def test_unknown_module_attribute() -> None:
+    from qwikstart import operations
+
+    with pytest.raises(AttributeError):
+        getattr(operations, "not_an_operation")
@@ -4,6 +4,7 @@ from unittest.mock import Mock, call, patch
 
 import pytest
 
+from qwikstart.exceptions import OperationDefinitionError
 from qwikstart.operations import shell
 
 from .. import helpers
@@ -59,6 +60,71 @@ class TestShellOperation:
         )
         mock_logger.warning.assert_called_once()
 
+    def test_stream_output(self, mock_logger: Mock) -> None:
+        output = self.shell(
+            {
+                "cmd": "echo hello; echo world",
+                "stream_output": True,
+                "output_var": "out",
+            }
+        )
+        mock_logger.info.assert_has_calls([call("hello"), call("world")])
+        assert output == {"out": "hello\nworld"}
+
+    def test_stream_output_keeps_latest_lines(self, mock_logger: Mock) -> None:
+        output = self.shell(
+            {
+                "cmd": "echo hello; echo world",
+                "stream_output": True,
+                "max_output_lines": 1,
+                "output_var": "out",
+            }
+        )
+        assert output == {"out": "world"}
+
+    def test_stream_output_not_logged_with_echo_off(self, mock_logger: Mock) -> None:
+        self.shell({"cmd": "echo hello", "stream_output": True, "echo_output": False})
+        mock_logger.info.assert_called_once_with("Running command: echo hello")
+
+    def test_stream_output_error(self, mock_logger: Mock) -> None:
+        with pytest.raises(CalledProcessError):
+            self.shell({"cmd": "exit 1", "stream_output": True})
+
+    def test_commands(self, mock_logger: Mock) -> None:
+        output = self.shell(
+            {
+                "commands": ["echo hello", ["echo", "world"]],
+                "max_workers": 2,
+                "output_var": "results",
+            }
+        )
+        results = output["results"]
+        assert [result["output"] for result in results] == ["hello", "world"]
+        assert [result["returncode"] for result in results] == [0, 0]
+        assert all(result["duration"] >= 0 for result in results)
+
+    def test_commands_without_output_var(self, mock_logger: Mock) -> None:
+        assert self.shell({"commands": ["echo hello"]}) == {}
+
+    def test_commands_error_raised_after_all_commands(self, mock_logger: Mock) -> None:
+        with pytest.raises(CalledProcessError):
+            self.shell({"commands": ["exit 1", "echo hello"]})
+        mock_logger.info.assert_any_call("hello")
+
+    def test_commands_error_ignored(self, mock_logger: Mock) -> None:
+        output = self.shell(
+            {
+                "commands": ["exit 3"],
+                "ignore_error_code": True,
+                "output_var": "results",
+            }
+        )
+        assert output["results"][0]["returncode"] == 3
+
+    def test_cmd_or_commands_required(self, mock_logger: Mock) -> None:
+        with pytest.raises(OperationDefinitionError):
+            self.shell({})
+
     def shell(self, context_defs: Dict[str, Any]) -> Dict[str, Any]:
         raw_context: Dict[str, Any] = {
             "execution_context": helpers.get_execution_context(),
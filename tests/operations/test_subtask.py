@@ -7,12 +7,15 @@ from pyfakefs.fake_filesystem_unittest import TestCase
 
 from qwikstart.exceptions import OperationError
 from qwikstart.operations import subtask
+from qwikstart.repository import yamllint
 
 from .. import helpers
 
 
 class TestSubtask(TestCase):
     def setUp(self) -> None:
+        # Load linter config (which reads yamllint's presets) before faking filesystem.
+        yamllint.get_yamllint_config()
         self.setUpPyfakefs()
         self.task_dir = Path("/path/to/task")
         self.subtask_path = self.task_dir / "subdir" / "subtask.yml"
@@ -71,6 +74,25 @@ class TestSubtask(TestCase):
         self.execute_subtask(subcontext=subcontext)
         assert helpers.read_file_path(target_path) == "Hello, World!"
 
+    def test_templates_from_subtask_source(self) -> None:
+        self.fs.create_file(
+            self.subtask_path,
+            contents=textwrap.dedent(
+                """
+                source:
+                    templates:
+                        greeting.txt: "Hello, World!"
+                steps:
+                    "Copy file":
+                        name: add_file
+                        template_path: "greeting.txt"
+                """
+            ),
+        )
+        target_path = Path("/path/to/target.txt")
+        self.execute_subtask(subcontext={"target_path": target_path})
+        assert helpers.read_file_path(target_path) == "Hello, World!"
+
     def test_unknown_file_raises(self) -> None:
         with pytest.raises(OperationError):
             self.execute_subtask()
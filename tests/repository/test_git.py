@@ -1,12 +1,16 @@
-from contextlib import contextmanager
+import multiprocessing
+import shutil
+import time
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterator, Optional
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock, call, patch
 
+import git as gitlib
 import pytest
 
-from qwikstart.config import get_user_config
+from qwikstart.config import Config, get_user_config
 from qwikstart.exceptions import RepoLoaderError
 from qwikstart.repository import git
 
@@ -39,14 +43,271 @@ class TestSyncGitRepoLocally:
         with patch_sync_git_repo_dependencies() as mocks:
             git.sync_git_repo_locally(TEST_URL)
         mocks.download_git_repo.assert_not_called()
-        mocks.update_git_repo.assert_called_once_with(mocks.local_path)
+        mocks.update_git_repo.assert_called_once_with(
+            mocks.local_path, ref=None, depth=None, sparse_path=""
+        )
+        mocks.write_sync_metadata.assert_called_once_with(mocks.local_path, ref=None)
 
     def test_download_required(self) -> None:
         with patch_sync_git_repo_dependencies(local_path_exists=False) as mocks:
             git.sync_git_repo_locally(TEST_URL)
-        mocks.download_git_repo.assert_called_once_with(TEST_URL, mocks.local_path)
+        mocks.download_git_repo.assert_called_once_with(
+            TEST_URL, mocks.local_path, ref=None, depth=None, sparse_path=""
+        )
         mocks.update_git_repo.assert_not_called()
 
+    def test_fresh_repo_not_updated(self) -> None:
+        with patch_sync_git_repo_dependencies(is_fresh=True) as mocks:
+            git.sync_git_repo_locally(TEST_URL)
+        mocks.update_git_repo.assert_not_called()
+        mocks.write_sync_metadata.assert_not_called()
+
+    def test_offline_repo_not_updated(self) -> None:
+        with patch_sync_git_repo_dependencies() as mocks:
+            with patch.object(git, "use_cached_git_repo") as use_cached_git_repo:
+                git.sync_git_repo_locally(TEST_URL, offline=True)
+                use_cached_git_repo.assert_not_called()
+
+                git.sync_git_repo_locally(TEST_URL, ref="v1", offline=True)
+                use_cached_git_repo.assert_called_once_with(
+                    mocks.local_path, ref="v1", sparse_path=""
+                )
+        mocks.update_git_repo.assert_not_called()
+        mocks.write_sync_metadata.assert_not_called()
+
+    def test_offline_download_raises_error(self) -> None:
+        with patch_sync_git_repo_dependencies(local_path_exists=False) as mocks:
+            with pytest.raises(RepoLoaderError):
+                git.sync_git_repo_locally(TEST_URL, offline=True)
+        mocks.download_git_repo.assert_not_called()
+
+    def test_exclusive_lock_held_while_updating(self) -> None:
+        with patch_sync_git_repo_dependencies() as mocks:
+            git.sync_git_repo_locally(TEST_URL)
+        mocks.repo_lock.acquire.assert_called_once_with(
+            exclusive=True, timeout=git.REPO_LOCK_TIMEOUT
+        )
+        mocks.repo_lock.release.assert_called_once()
+
+    def test_fresh_repo_not_locked(self) -> None:
+        with patch_sync_git_repo_dependencies(is_fresh=True) as mocks:
+            git.sync_git_repo_locally(TEST_URL)
+        mocks.repo_lock.acquire.assert_not_called()
+
+    def test_repo_synced_while_waiting_for_lock_not_updated(self) -> None:
+        with patch_sync_git_repo_dependencies() as mocks:
+            with patch.object(git, "is_repo_fresh", side_effect=[False, True]):
+                git.sync_git_repo_locally(TEST_URL)
+        mocks.update_git_repo.assert_not_called()
+        mocks.repo_lock.release.assert_called_once()
+
+    def test_shared_lock_held_after_updating_within_scope(self) -> None:
+        with patch_sync_git_repo_dependencies() as mocks:
+            mocks.repo_lock.is_locked = False
+            with git.lock_cached_repos():
+                git.sync_git_repo_locally(TEST_URL)
+        assert mocks.repo_lock.acquire.call_args_list == [
+            call(exclusive=False, timeout=git.REPO_LOCK_TIMEOUT),
+            call(exclusive=True, timeout=git.REPO_LOCK_TIMEOUT),
+            call(exclusive=False, timeout=git.REPO_LOCK_TIMEOUT),
+        ]
+
+    def test_repo_changed_before_shared_lock_updated_again(self) -> None:
+        with patch_sync_git_repo_dependencies() as mocks:
+            mocks.repo_lock.is_locked = False
+            checked_out = patch.object(
+                git, "is_repo_checked_out", side_effect=[False, True]
+            )
+            with git.lock_cached_repos(), checked_out:
+                git.sync_git_repo_locally(TEST_URL)
+        assert mocks.update_git_repo.call_count == 2
+
+    def test_lock_timeout_raises_error(self) -> None:
+        with patch_sync_git_repo_dependencies() as mocks:
+            mocks.repo_lock.acquire.side_effect = TimeoutError
+            with pytest.raises(RepoLoaderError):
+                git.sync_git_repo_locally(TEST_URL)
+        mocks.update_git_repo.assert_not_called()
+
+
+class TestSyncLocalRepo:
+    """Tests syncing a local bare repo, which stands in for a remote repo."""
+
+    def test_clone(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            local_path = git.sync_git_repo_locally(repo_url)
+        assert local_path.joinpath("a", "file.txt").read_text() == "latest"
+        assert local_path.joinpath("b", "file.txt").exists()
+
+    def test_update(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            git.sync_git_repo_locally(repo_url, ref="v1")
+            local_path = git.sync_git_repo_locally(repo_url)
+        assert local_path.joinpath("a", "file.txt").read_text() == "latest"
+
+    def test_pinned_ref(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            local_path = git.sync_git_repo_locally(repo_url, ref="v1")
+        assert local_path.joinpath("a", "file.txt").read_text() == "v1"
+
+    def test_shallow_sparse_clone(self, tmp_path: Path) -> None:
+        config: Dict[str, Any] = {"git_clone_depth": 1, "git_sparse_checkout": True}
+        with patch_local_repo(tmp_path, **config) as repo_url:
+            local_path = git.sync_git_repo_locally(repo_url, sparse_path="a")
+            assert local_path.joinpath("a", "file.txt").exists()
+            assert not local_path.joinpath("b").exists()
+            assert len(list(gitlib.Repo(str(local_path)).iter_commits())) == 1
+
+            git.sync_git_repo_locally(repo_url, sparse_path="b")
+            assert local_path.joinpath("b", "file.txt").exists()
+
+    def test_sparse_path_ignored_for_full_clone(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            git.sync_git_repo_locally(repo_url)
+        with patch_local_repo(tmp_path, git_sparse_checkout=True, reuse=True) as url:
+            local_path = git.sync_git_repo_locally(url, sparse_path="missing")
+        assert local_path.joinpath("b", "file.txt").exists()
+
+    def test_fresh_repo_not_updated(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path, repo_cache_ttl=60) as repo_url:
+            git.sync_git_repo_locally(repo_url, ref="v1")
+            with patch.object(git, "update_git_repo") as update_git_repo:
+                git.sync_git_repo_locally(repo_url, ref="v1")
+                update_git_repo.assert_not_called()
+                git.sync_git_repo_locally(repo_url)
+                update_git_repo.assert_called_once()
+
+    def test_fresh_repo_updated_for_missing_sparse_path(self, tmp_path: Path) -> None:
+        config: Dict[str, Any] = {"git_sparse_checkout": True, "repo_cache_ttl": 60}
+        with patch_local_repo(tmp_path, **config) as repo_url:
+            git.sync_git_repo_locally(repo_url, sparse_path="a")
+            local_path = git.sync_git_repo_locally(repo_url, sparse_path="b")
+        assert local_path.joinpath("b", "file.txt").exists()
+
+    def test_offline_config_uses_cached_repo(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            git.sync_git_repo_locally(repo_url)
+        with patch_local_repo(tmp_path, offline=True, reuse=True) as repo_url:
+            with patch.object(git, "update_git_repo") as update_git_repo:
+                local_path = git.sync_git_repo_locally(repo_url)
+        update_git_repo.assert_not_called()
+        assert local_path.joinpath("a", "file.txt").read_text() == "latest"
+
+    def test_offline_checkout_of_cached_ref(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            local_path = git.sync_git_repo_locally(repo_url)
+            synced_at = get_synced_at(local_path)
+
+            git.sync_git_repo_locally(repo_url, ref="v1", offline=True)
+        assert local_path.joinpath("a", "file.txt").read_text() == "v1"
+        assert get_synced_at(local_path) == synced_at
+
+    def test_offline_checkout_of_missing_ref(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            git.sync_git_repo_locally(repo_url)
+            with pytest.raises(RepoLoaderError):
+                git.sync_git_repo_locally(repo_url, ref="missing", offline=True)
+
+    def test_offline_checkout_of_cached_sparse_path(self, tmp_path: Path) -> None:
+        config: Dict[str, Any] = {"git_sparse_checkout": True}
+        with patch_local_repo(tmp_path, **config) as repo_url:
+            git.sync_git_repo_locally(repo_url, sparse_path="a")
+            local_path = git.sync_git_repo_locally(
+                repo_url, sparse_path="b", offline=True
+            )
+        assert local_path.joinpath("b", "file.txt").exists()
+
+    def test_sync_waits_for_other_process_using_repo(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            with repo_used_by_other_process(repo_url):
+                with patch.object(git, "REPO_LOCK_TIMEOUT", 0.1):
+                    with pytest.raises(RepoLoaderError):
+                        git.sync_git_repo_locally(repo_url)
+            local_path = git.sync_git_repo_locally(repo_url)
+        assert local_path.joinpath("a", "file.txt").read_text() == "latest"
+
+    def test_fresh_repo_shared_with_other_process(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path, repo_cache_ttl=60) as repo_url:
+            with repo_used_by_other_process(repo_url):
+                with patch.object(git, "REPO_LOCK_TIMEOUT", 0.1):
+                    with git.lock_cached_repos():
+                        local_path = git.sync_git_repo_locally(repo_url)
+        assert local_path.joinpath("a", "file.txt").read_text() == "latest"
+
+    def test_repo_locked_until_scope_exits(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            with git.lock_cached_repos():
+                with git.lock_cached_repos():
+                    local_path = git.sync_git_repo_locally(repo_url)
+                repo_lock = git.get_repo_lock(local_path)
+                # Locks are held until the outermost scope exits.
+                assert repo_lock.is_locked and not repo_lock.exclusive
+            assert not repo_lock.is_locked
+
+    def test_repo_in_use_not_synced_again(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            with git.lock_cached_repos():
+                git.sync_git_repo_locally(repo_url)
+                with patch.object(git, "update_git_repo") as update_git_repo:
+                    git.sync_git_repo_locally(repo_url)
+                    git.sync_git_repo_locally(repo_url, ref="v1")
+        update_git_repo.assert_called_once()
+
+    def test_nested_sync_uses_repo_in_use_elsewhere(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            with repo_used_by_other_process(repo_url):
+                with git.lock_cached_repos():
+                    git.get_repo_lock(tmp_path / "other").acquire()
+                    # Never wait while holding another repo's lock.
+                    start = time.monotonic()
+                    local_path = git.sync_git_repo_locally(repo_url)
+                    with pytest.raises(RepoLoaderError):
+                        git.sync_git_repo_locally(repo_url, ref="v1")
+                    assert time.monotonic() - start < 10
+        assert local_path.joinpath("a", "file.txt").read_text() == "latest"
+
+    def test_failed_update_not_recorded_as_sync(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            local_path = git.sync_git_repo_locally(repo_url)
+            synced_at = get_synced_at(local_path)
+            shutil.rmtree(tmp_path / "remote.git")
+            with pytest.raises(RepoLoaderError):
+                git.sync_git_repo_locally(repo_url)
+        assert get_synced_at(local_path) == synced_at
+
+    def test_no_partial_clone_left_after_error(self, tmp_path: Path) -> None:
+        with patch_local_repo(tmp_path) as repo_url:
+            with pytest.raises(RepoLoaderError):
+                git.sync_git_repo_locally(repo_url, ref="missing")
+            local_path = git.get_local_repo_path(repo_url)
+        assert not local_path.exists()
+        assert [path.name for path in local_path.parent.iterdir()] == [
+            "remote.git.lock"
+        ]
+
+
+class TestCheckoutRef:
+    def test_checkout_local_commit_if_fetch_fails(self) -> None:
+        repo = Mock()
+        repo.remote.return_value.fetch.side_effect = gitlib.GitCommandError("fetch")
+        git.checkout_ref(repo, "abc1234")
+        repo.git.checkout.assert_called_once_with("abc1234")
+
+    def test_failed_fetch_of_branch_raises_error(self) -> None:
+        repo = Mock()
+        repo.remote.return_value.fetch.side_effect = gitlib.GitCommandError("fetch")
+        with pytest.raises(RepoLoaderError):
+            git.checkout_ref(repo, "main")
+        repo.git.checkout.assert_not_called()
+
+    def test_failed_fetch_of_missing_commit_raises_error(self) -> None:
+        repo = Mock()
+        repo.remote.return_value.fetch.side_effect = gitlib.GitCommandError("fetch")
+        repo.git.cat_file.side_effect = gitlib.GitCommandError("cat-file")
+        with pytest.raises(RepoLoaderError):
+            git.checkout_ref(repo, "abc1234")
+        repo.git.checkout.assert_not_called()
+
 
 class TestResolveGitUrl:
     def test_echo_full_url(self) -> None:
@@ -62,6 +323,13 @@ class TestResolveGitUrl:
     def test_bitbucket_abbreviation_resolved(self) -> None:
         assert git.resolve_git_url("bb:user/repo") == "https://bitbucket.org/user/repo"
 
+    def test_abbreviation_from_given_config(self) -> None:
+        config = Config(repo_cache="", git_abbreviations={"ex": "https://ex.com/{0}"})
+        with patch.object(git, "get_user_config") as get_user_config:
+            url = git.resolve_git_url("ex:user/repo", config=config)
+        assert url == "https://ex.com/user/repo"
+        get_user_config.assert_not_called()
+
 
 class TestGetLocalRepoPath:
     def test_repo_only(self) -> None:
@@ -79,31 +347,60 @@ class TestDownloadGitRepo:
         with pytest.raises(RepoLoaderError):
             git.download_git_repo("/this/is/not/a/url", CACHE_DIR.joinpath("new"))
 
-    @patch.object(git.gitlib, "Repo")  # type: ignore
-    def test_success(self, repo_class: Mock) -> None:
-        output_dir = CACHE_DIR.joinpath("new")
+    @patch("git.Repo")
+    def test_success(self, repo_class: Mock, tmp_path: Path) -> None:
+        output_dir = tmp_path.joinpath("new")
         git.download_git_repo("/fake/repo", output_dir)
-        repo_class.clone_from("/fake/repo", str(output_dir))
+        repo_class.clone_from.assert_called_once()
+        assert output_dir.is_dir()
 
 
 class TestUpdateGitRepo:
-    @patch.object(git.gitlib, "Repo")  # type: ignore
+    @patch("git.Repo")
     def test_repo_initialized_with_string(self, repo_class: Mock) -> None:
         git.update_git_repo(Path("/path/to/local/repo"))
         repo_class.assert_called_once_with("/path/to/local/repo")
 
+    @patch("git.Repo")
+    def test_failed_checkout_raises_error(self, repo_class: Mock) -> None:
+        repo = repo_class.return_value
+        repo.git.checkout.side_effect = gitlib.GitCommandError("checkout")
+        with pytest.raises(RepoLoaderError):
+            git.update_git_repo(Path("/path/to/local/repo"))
+
+
+class TestSyncMetadata:
+    def test_missing_metadata(self, tmp_path: Path) -> None:
+        assert git.read_sync_metadata(tmp_path) is None
+        assert not git.is_repo_fresh(tmp_path, ref=None, ttl=60)
+
+    def test_write_without_git_directory_ignored(self, tmp_path: Path) -> None:
+        git.write_sync_metadata(tmp_path, ref=None)
+        assert git.read_sync_metadata(tmp_path) is None
+
+    def test_fresh_only_within_ttl_for_same_ref(self, tmp_path: Path) -> None:
+        tmp_path.joinpath(".git").mkdir()
+        git.write_sync_metadata(tmp_path, ref="v1")
+        assert git.is_repo_fresh(tmp_path, ref="v1", ttl=60)
+        assert not git.is_repo_fresh(tmp_path, ref="v1", ttl=0)
+        assert not git.is_repo_fresh(tmp_path, ref="v2", ttl=60)
+        assert not git.is_repo_fresh(tmp_path, ref="v1", ttl=None)
+
 
 @dataclass(frozen=True)
 class MockSyncGitRepoDepdendencies:
     local_path: Path
     download_git_repo: Mock
     update_git_repo: Mock
+    write_sync_metadata: Mock
+    repo_lock: Mock
 
 
 @contextmanager
 def patch_sync_git_repo_dependencies(
     local_path: str = "/path/to/qwikstart.yml",
     local_path_exists: bool = True,
+    is_fresh: bool = False,
     data: Optional[Dict[str, Any]] = None,
 ) -> Iterator[MockSyncGitRepoDepdendencies]:
     mock_path = MagicMock(
@@ -111,12 +408,93 @@ def patch_sync_git_repo_dependencies(
         __str__=Mock(return_value=local_path),
         exists=Mock(return_value=local_path_exists),
     )
+    mock_path.joinpath.return_value = mock_path
 
-    with patch.object(git, "get_local_repo_path", return_value=mock_path):
-        with patch.object(git, "download_git_repo") as mock_download:
-            with patch.object(git, "update_git_repo") as mock_update_repo:
-                yield MockSyncGitRepoDepdendencies(
-                    local_path=mock_path,
-                    download_git_repo=mock_download,
-                    update_git_repo=mock_update_repo,
-                )
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch.object(git, "get_local_repo_path", return_value=mock_path)
+        )
+        stack.enter_context(patch.object(git, "is_repo_fresh", return_value=is_fresh))
+        stack.enter_context(patch.object(git, "read_sync_metadata", return_value=None))
+        yield MockSyncGitRepoDepdendencies(
+            local_path=mock_path,
+            download_git_repo=stack.enter_context(
+                patch.object(git, "download_git_repo")
+            ),
+            update_git_repo=stack.enter_context(patch.object(git, "update_git_repo")),
+            write_sync_metadata=stack.enter_context(
+                patch.object(git, "write_sync_metadata")
+            ),
+            repo_lock=stack.enter_context(
+                patch.object(git, "get_repo_lock")
+            ).return_value,
+        )
+
+
+@contextmanager
+def patch_local_repo(
+    tmp_path: Path, reuse: bool = False, **config_kwargs: Any
+) -> Iterator[str]:
+    """Create bare repo with two commits and yield url, with cache in `tmp_path`.
+
+    If `reuse` is True, the repo created by an earlier call is used.
+    """
+    if not reuse:
+        create_local_repo(tmp_path)
+    config = Config(
+        repo_cache=str(tmp_path / "cache"),
+        git_abbreviations={},
+        **config_kwargs,
+    )
+    with patch.object(git, "get_user_config", return_value=config):
+        yield (tmp_path / "remote.git").as_uri()
+
+
+@contextmanager
+def repo_used_by_other_process(repo_url: str) -> Iterator[None]:
+    """Sync repo in another process, which keeps using it until the context exits."""
+    context = multiprocessing.get_context("fork")
+    synced = context.Event()
+    finished = context.Event()
+    process = context.Process(
+        target=use_repo_until_finished, args=(repo_url, synced, finished)
+    )
+    process.start()
+    try:
+        assert synced.wait(timeout=30)
+        yield
+    finally:
+        finished.set()
+        process.join()
+    assert process.exitcode == 0
+
+
+def use_repo_until_finished(repo_url: str, synced: Any, finished: Any) -> None:
+    """Sync and use repo, like a run in another process, until finished."""
+    with git.lock_cached_repos():
+        git.sync_git_repo_locally(repo_url)
+        synced.set()
+        finished.wait(timeout=30)
+
+
+def get_synced_at(local_path: Path) -> float:
+    metadata = git.read_sync_metadata(local_path)
+    assert metadata is not None
+    return float(metadata["synced_at"])
+
+
+def create_local_repo(tmp_path: Path) -> None:
+    source_repo = gitlib.Repo.init(str(tmp_path / "source"))
+    with source_repo.config_writer() as writer:
+        writer.set_value("user", "name", "Test")
+        writer.set_value("user", "email", "test@example.com")
+    for directory, text in [("a", "v1"), ("b", "v1")]:
+        tmp_path.joinpath("source", directory).mkdir()
+        tmp_path.joinpath("source", directory, "file.txt").write_text(text)
+    source_repo.index.add(["a/file.txt", "b/file.txt"])
+    source_repo.index.commit("First commit")
+    source_repo.create_tag("v1")
+    tmp_path.joinpath("source", "a", "file.txt").write_text("latest")
+    source_repo.index.add(["a/file.txt"])
+    source_repo.index.commit("Second commit")
+    source_repo.clone(str(tmp_path / "remote.git"), bare=True)
@@ -1,4 +1,4 @@
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterator, Optional
@@ -7,9 +7,10 @@ from unittest.mock import Mock, patch
 import pytest
 from pyfakefs.fake_filesystem_unittest import TestCase
 
+from qwikstart.config import Config
 from qwikstart.exceptions import RepoLoaderError, TaskParserError
-from qwikstart.repository import loaders
-from qwikstart.utils import io
+from qwikstart.repository import git, loaders, yamllint
+from qwikstart.utils import http, io
 
 FAKE_PATH_STR = "/path/to/fake.yml"
 TEST_URL = "https://github.com/user/repo"
@@ -21,18 +22,24 @@ class TestGetRepoLoader:
     def test_loader_for_local_path(self) -> None:
         with patch.object(loaders, "RepoLoader") as loader_class:
             loaders.get_repo_loader(FAKE_PATH_STR)
-        loader_class.assert_called_once_with(FAKE_PATH_STR)
+        loader_class.assert_called_once_with(
+            FAKE_PATH_STR, offline=False, lazy_lint=False
+        )
 
     def test_git_loader(self) -> None:
         repo_url = "http://example.com"
         with patch.object(loaders, "GitRepoLoader") as loader_class:
             loader = loaders.get_repo_loader(FAKE_PATH_STR, repo_url=repo_url)
         assert loader is loader_class.return_value
-        loader_class.assert_called_once_with(repo_url, FAKE_PATH_STR)
+        loader_class.assert_called_once_with(
+            repo_url, FAKE_PATH_STR, offline=False, lazy_lint=False
+        )
 
 
 class TestRepoLoaderFS(TestCase):
     def setUp(self) -> None:
+        # Load linter config (which reads yamllint's presets) before faking filesystem.
+        yamllint.get_yamllint_config()
         self.setUpPyfakefs()
 
     def test_resolve_file(self) -> None:
@@ -56,6 +63,55 @@ class TestRepoLoaderFS(TestCase):
         assert loader.repo_path == Path("/path/to")
 
 
+class TestLoadTaskSpec:
+    def test_lint_result_cached(self, tmp_path: Path) -> None:
+        with patch_lint_dependencies(tmp_path) as linter_errors:
+            assert loaders.load_task_spec("a: 1") == {"a": 1}
+            assert loaders.load_task_spec("a: 1") == {"a": 1}
+            linter_errors.assert_called_once()
+            loaders.load_task_spec("a: 2")
+            assert linter_errors.call_count == 2
+
+    def test_parsed_spec_cached(self, tmp_path: Path) -> None:
+        spec_contents = "cached: {a: 1}"
+        with patch_lint_dependencies(tmp_path):
+            with patch.object(
+                io, "safe_load_yaml_string", wraps=io.safe_load_yaml_string
+            ) as safe_load_yaml_string:
+                task_spec = loaders.load_task_spec(spec_contents)
+                task_spec["cached"]["a"] = 2
+                assert loaders.load_task_spec(spec_contents) == {"cached": {"a": 1}}
+        safe_load_yaml_string.assert_called_once()
+
+    def test_lint_errors(self, tmp_path: Path) -> None:
+        with patch_lint_dependencies(tmp_path):
+            with pytest.raises(TaskParserError):
+                loaders.load_task_spec("this: is: invalid")
+
+    def test_lazy_lint_skips_linter(self, tmp_path: Path) -> None:
+        with patch_lint_dependencies(tmp_path) as linter_errors:
+            assert loaders.load_task_spec("a: 1", lazy_lint=True) == {"a": 1}
+        linter_errors.assert_not_called()
+
+    def test_lazy_lint_from_config(self, tmp_path: Path) -> None:
+        with patch_lint_dependencies(tmp_path, lint="lazy") as linter_errors:
+            assert loaders.load_task_spec("a: 1") == {"a": 1}
+        linter_errors.assert_not_called()
+
+    def test_lazy_lint_reports_lint_errors(self, tmp_path: Path) -> None:
+        with patch_lint_dependencies(tmp_path) as linter_errors:
+            with pytest.raises(TaskParserError, match="Failed to read yaml file"):
+                loaders.load_task_spec("this: is: invalid", lazy_lint=True)
+        linter_errors.assert_called_once()
+
+    def test_lazy_lint_reports_parse_errors(self, tmp_path: Path) -> None:
+        with patch_lint_dependencies(tmp_path) as linter_errors:
+            linter_errors.side_effect = None
+            linter_errors.return_value = []
+            with pytest.raises(TaskParserError, match="duplicate key"):
+                loaders.load_task_spec("a: 1\na: 2", lazy_lint=True)
+
+
 class TestGitRepoLoader:
     def test_task_spec(self) -> None:
         with patch_git_repo_loader_dependencies(task_spec={"greeting": "Hello"}):
@@ -67,6 +123,20 @@ class TestGitRepoLoader:
             loader = loaders.GitRepoLoader(TEST_URL)
         assert loader.repo_path == mocks.repo_path
 
+    def test_sparse_path_is_task_spec_directory(self) -> None:
+        with patch_git_repo_loader_dependencies() as mocks:
+            loaders.GitRepoLoader(TEST_URL, "path/to/qwikstart.yml")
+        mocks.sync_git_repo.assert_called_once_with(
+            TEST_URL, sparse_path="path/to", offline=False
+        )
+
+    def test_offline(self) -> None:
+        with patch_git_repo_loader_dependencies() as mocks:
+            loaders.GitRepoLoader(TEST_URL, offline=True)
+        mocks.sync_git_repo.assert_called_once_with(
+            TEST_URL, sparse_path="", offline=True
+        )
+
 
 class TestRepoLoaderWithSourceUrl:
     def test_task_spec_from_local_path(self) -> None:
@@ -76,7 +146,17 @@ class TestRepoLoaderWithSourceUrl:
         assert loader.task_spec == DETACHED_TASK_SPEC
         mocks.read_from_url.assert_not_called()
         mocks.read_file.assert_called_once_with(Path(TASK_SPEC_PATH))
-        mocks.sync_git_repo.assert_called_once_with(TEST_URL)
+        mocks.sync_git_repo.assert_called_once_with(
+            TEST_URL, ref=None, sparse_path="", offline=False
+        )
+
+    def test_source_ref_and_path(self) -> None:
+        task_spec = {"source": {"url": TEST_URL, "path": "templates", "ref": "v1"}}
+        with patch_repo_loader_deps(task_spec) as mocks:
+            loaders.RepoLoader(TASK_SPEC_PATH)
+        mocks.sync_git_repo.assert_called_once_with(
+            TEST_URL, ref="v1", sparse_path="templates", offline=False
+        )
 
     def test_task_spec_from_url(self) -> None:
         task_spec_url = "https://example.com/qwikstart.yml"
@@ -84,9 +164,13 @@ class TestRepoLoaderWithSourceUrl:
             loader = loaders.RepoLoader(task_spec_url)
 
         assert loader.task_spec == DETACHED_TASK_SPEC
-        mocks.read_from_url.assert_called_once_with(task_spec_url)
+        mocks.read_from_url.assert_called_once_with(
+            task_spec_url, cache_dir=None, timeout=None, retries=0, offline=False
+        )
         mocks.read_file.assert_not_called()
-        mocks.sync_git_repo.assert_called_once_with(TEST_URL)
+        mocks.sync_git_repo.assert_called_once_with(
+            TEST_URL, ref=None, sparse_path="", offline=False
+        )
 
     def test_remote_task_spec_without_source_url(self) -> None:
         task_spec_url = "https://example.com/qwikstart.yml"
@@ -102,6 +186,16 @@ class TestRepoLoaderWithSourceUrl:
         assert loader.repo_path == repo_path
 
 
+@contextmanager
+def patch_lint_dependencies(tmp_path: Path, lint: str = "strict") -> Iterator[Mock]:
+    config = Config(repo_cache=str(tmp_path), git_abbreviations={}, lint=lint)
+    with patch.object(loaders, "get_user_config", return_value=config):
+        with patch.object(
+            yamllint, "linter_errors", wraps=yamllint.linter_errors
+        ) as linter_errors:
+            yield linter_errors
+
+
 @dataclass(frozen=True)
 class MockGitRepoLoaderDependencies:
     repo_path: Path
@@ -117,7 +211,7 @@ def patch_git_repo_loader_dependencies(
 
     mock_sync = Mock(return_value=repo_path)
     with patch.object(loaders, "RepoLoader", return_value=mock_loader):
-        with patch.object(loaders.git, "sync_git_repo_locally", new=mock_sync):
+        with patch.object(git, "sync_git_repo_locally", new=mock_sync):
             yield MockGitRepoLoaderDependencies(
                 repo_path=repo_path, loader=mock_loader, sync_git_repo=mock_sync
             )
@@ -139,12 +233,25 @@ def patch_repo_loader_deps(
     sync = Mock(return_value=repo_path)
     read_url = Mock(return_value=task_spec_yaml_string)
     read_file = Mock(return_value=task_spec_yaml_string)
-    with patch.object(loaders.io, "read_file_contents", new=read_file):
-        with patch.object(loaders.http, "read_from_url", new=read_url):
-            with patch.object(loaders.git, "sync_git_repo_locally", new=sync):
-                yield MockRepoLoaderDependencies(
-                    repo_path=repo_path,
-                    read_file=read_file,
-                    read_from_url=read_url,
-                    sync_git_repo=sync,
-                )
+    # Don't record lint results or responses in the user's caches.
+    config = Mock(
+        lint="strict",
+        lint_cache_path=None,
+        http_cache_path=None,
+        http_timeout=None,
+        http_retries=0,
+        offline=False,
+    )
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch.object(loaders, "get_user_config", return_value=config)
+        )
+        stack.enter_context(patch.object(io, "read_file_contents", new=read_file))
+        stack.enter_context(patch.object(http, "read_from_url", new=read_url))
+        stack.enter_context(patch.object(git, "sync_git_repo_locally", new=sync))
+        yield MockRepoLoaderDependencies(
+            repo_path=repo_path,
+            read_file=read_file,
+            read_from_url=read_url,
+            sync_git_repo=sync,
+        )
@@ -0,0 +1,24 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from qwikstart.repository import yamllint
+
+
+class TestLintCache:
+    def test_validated_text_recorded(self, tmp_path: Path) -> None:
+        assert not yamllint.is_validated("a: 1", tmp_path)
+        yamllint.assert_no_errors("a: 1", cache_dir=tmp_path)
+        assert yamllint.is_validated("a: 1", tmp_path)
+        assert not yamllint.is_validated("a: 2", tmp_path)
+
+    def test_unwritable_cache_ignored(self, tmp_path: Path) -> None:
+        cache_path = tmp_path / "not-a-directory"
+        cache_path.touch()
+        yamllint.mark_validated("a: 1", cache_path)
+        assert not yamllint.is_validated("a: 1", cache_path)
+
+    def test_validated_text_not_linted_again(self, tmp_path: Path) -> None:
+        yamllint.mark_validated("a: 1", tmp_path)
+        with patch.object(yamllint, "linter_errors") as linter_errors:
+            yamllint.assert_no_errors("a: 1", cache_dir=tmp_path)
+        linter_errors.assert_not_called()
@@ -1,17 +1,38 @@
-from typing import List, Optional
+from typing import Any, Iterator, List, Optional
 
 class GitCommandError(Exception): ...
+class InvalidGitRepositoryError(Exception): ...
 class NoSuchPathError(Exception): ...
 
 
+class Commit: ...
+
+
 class Remote:
     def pull(self) -> List[str]: ...
+    def fetch(self, refspec: Optional[str] = None, **kwargs: Any) -> List[Any]: ...
+
+
+class IndexFile:
+    def add(self, items: List[str]) -> List[Any]: ...
+    def commit(self, message: str) -> Commit: ...
 
 
 class Repo:
+    git: Any
+    index: IndexFile
+    working_tree_dir: Optional[str]
+
     def __init__(self, path: Optional[str] = None): ...
 
-    @staticmethod
-    def clone_from(url: str, to_path: str) -> None: ...
+    @classmethod
+    def init(cls, path: Optional[str] = None, **kwargs: Any) -> "Repo": ...
+
+    @classmethod
+    def clone_from(cls, url: str, to_path: str, **kwargs: Any) -> "Repo": ...
 
+    def clone(self, path: str, **kwargs: Any) -> "Repo": ...
+    def config_writer(self) -> Any: ...
+    def create_tag(self, path: str) -> Any: ...
+    def iter_commits(self) -> Iterator[Commit]: ...
     def remote(self) -> Remote: ...
@@ -4,6 +4,13 @@ from typing import Optional, Union
 PathLike = Union[str, Path]
 
 
+class FakeFile:
+    st_mtime: float
+
+    def set_contents(self, contents: str) -> None:
+        ...
+
+
 class FakeFilesystem:
     def add_real_directory(
         self,
@@ -14,8 +21,13 @@ class FakeFilesystem:
     ) -> None:
         ...
 
-    def create_file(self, file_path: PathLike, contents: str = "") -> None:
+    def create_file(
+        self, file_path: PathLike, contents: Union[str, bytes] = ""
+    ) -> FakeFile:
         ...
 
     def create_dir(self, directory_path: PathLike) -> None:
         ...
+
+    def create_symlink(self, file_path: PathLike, link_target: PathLike) -> None:
+        ...
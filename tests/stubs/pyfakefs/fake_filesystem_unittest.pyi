@@ -1,4 +1,4 @@
-from typing import Any, List, Optional
+from typing import Any, ContextManager, List, Optional, Type
 
 from . import fake_filesystem
 
@@ -7,3 +7,6 @@ class TestCase:
     fs: fake_filesystem.FakeFilesystem
 
     def setUpPyfakefs(self, modules_to_reload: Optional[List[Any]] = None) -> None: ...
+    def assertRaises(
+        self, expected_exception: Type[BaseException]
+    ) -> ContextManager[Any]: ...
@@ -1,4 +1,10 @@
 from contextlib import contextmanager
-from typing import Iterator, Type
+from typing import ContextManager, Iterator, Optional, Type
 @contextmanager
 def raises(exception: Type[Exception], match: str = "") -> Iterator[None]: ...
+
+class LogCaptureFixture:
+    text: str
+    def at_level(
+        self, level: int, logger: Optional[str] = None
+    ) -> ContextManager[None]: ...
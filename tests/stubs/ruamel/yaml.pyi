@@ -1,6 +1,7 @@
 from typing import Any, Dict, TextIO, Union
 
 class YAML:
+    def __init__(self, typ: str = "rt", pure: bool = False) -> None: ...
     def indent(self, mapping: int, sequence: int, offset: int) -> None: ...
     def load(self, stream: Union[str, TextIO]) -> str: ...
     def dump(self, data: Dict[str, Any], stream: TextIO) -> None: ...
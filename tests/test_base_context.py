@@ -0,0 +1,40 @@
+import inspect
+from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import patch
+
+from qwikstart import base_context
+from qwikstart.base_context import BaseContext, ExecutionContext
+
+
+@dataclass(frozen=True)
+class ContextWithValue(BaseContext):
+    value: int = 0
+
+
+class TestFromDict:
+    def test_unknown_keys_ignored(self) -> None:
+        execution_context = ExecutionContext(source_dir=Path(), target_dir=Path())
+        context = ContextWithValue.from_dict(
+            {"execution_context": execution_context, "value": 1, "unknown": 2}
+        )
+        assert context == ContextWithValue(execution_context, value=1)
+
+    def test_signature_inspected_once_per_class(self) -> None:
+        base_context.get_init_parameter_names.cache_clear()
+        execution_context = ExecutionContext(source_dir=Path(), target_dir=Path())
+        field_dict = {"execution_context": execution_context, "value": 1, "x": 2}
+        with patch.object(inspect, "signature", wraps=inspect.signature) as signature:
+            ContextWithValue.from_dict(field_dict)
+            ContextWithValue.from_dict(field_dict)
+        signature.assert_called_once_with(ContextWithValue)
+
+    def test_known_parameter_names_not_inspected(self) -> None:
+        execution_context = ExecutionContext(source_dir=Path(), target_dir=Path())
+        field_dict = {"execution_context": execution_context, "value": 1}
+        with patch.object(base_context, "get_init_parameter_names") as get_names:
+            context = ContextWithValue.from_dict(
+                field_dict, frozenset({"execution_context"})
+            )
+        get_names.assert_not_called()
+        assert context == ContextWithValue(execution_context)
@@ -1,3 +1,4 @@
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -10,21 +11,21 @@ DEFAULT_CONFIG = config.Config(**config.DEFAULT_CONFIG_DICT)
 
 
 @patch.object(config, "load_custom_config_file")
-class TestGetUserConfig:
+class TestLoadUserConfig:
     def test_empty_config_file(self, mock_load_file: Mock) -> None:
         mock_load_file.return_value = {}
-        assert config.get_user_config() == DEFAULT_CONFIG
+        assert config.load_user_config() == DEFAULT_CONFIG
 
     def test_override_repo_cache(self, mock_load_file: Mock) -> None:
         mock_load_file.return_value = {"repo_cache": "fake/path/to/cache"}
-        user_config = config.get_user_config()
+        user_config = config.load_user_config()
         assert user_config.repo_cache == "fake/path/to/cache"
 
     def test_add_git_abbreviation(self, mock_load_file: Mock) -> None:
         mock_load_file.return_value = {
             "git_abbreviations": {"new": "https://git.example.com/{0}"}
         }
-        user_config = config.get_user_config()
+        user_config = config.load_user_config()
         assert user_config.git_abbreviations == {
             "gh": "https://github.com/{0}",
             "gl": "https://gitlab.com/{0}",
@@ -36,20 +37,73 @@ class TestGetUserConfig:
         mock_load_file.return_value = {
             "git_abbreviations": {"gh": "https://---FAKE---.github.com/{0}"}
         }
-        user_config = config.get_user_config()
+        user_config = config.load_user_config()
         assert user_config.git_abbreviations == {
             "gh": "https://---FAKE---.github.com/{0}",
             "gl": "https://gitlab.com/{0}",
             "bb": "https://bitbucket.org/{0}",
         }
 
+    def test_bytecode_cache_disabled_by_default(self, mock_load_file: Mock) -> None:
+        mock_load_file.return_value = {}
+        assert config.load_user_config().bytecode_cache_path is None
+
+    def test_bytecode_cache_path(self, mock_load_file: Mock) -> None:
+        mock_load_file.return_value = {"bytecode_cache": "~/fake/cache"}
+        user_config = config.load_user_config()
+        assert user_config.bytecode_cache_path == Path("~/fake/cache").expanduser()
+
+    def test_http_cache_path(self, mock_load_file: Mock) -> None:
+        mock_load_file.return_value = {"http_cache": "~/fake/cache"}
+        user_config = config.load_user_config()
+        assert user_config.http_cache_path == Path("~/fake/cache").expanduser()
+
+    def test_http_cache_disabled(self, mock_load_file: Mock) -> None:
+        mock_load_file.return_value = {"http_cache": None}
+        assert config.load_user_config().http_cache_path is None
+
+    def test_lazy_lint(self, mock_load_file: Mock) -> None:
+        mock_load_file.return_value = {"lint": "lazy"}
+        assert config.load_user_config().lint == "lazy"
+
+    def test_invalid_lint_raises_an_error(self, mock_load_file: Mock) -> None:
+        mock_load_file.return_value = {"lint": "sometimes"}
+        with pytest.raises(ConfigurationError, match="Expected lint config"):
+            config.load_user_config()
+
     @patch.object(config, "logger")
     def test_unknown_config_key(self, mock_logger: Mock, mock_load_file: Mock) -> None:
         mock_load_file.return_value = {"unknown_config": "fake-value"}
-        assert config.get_user_config() == DEFAULT_CONFIG
+        assert config.load_user_config() == DEFAULT_CONFIG
         mock_logger.warning.assert_called_once()
 
 
+class TestGetUserConfig(TestCase):
+    def setUp(self) -> None:
+        self.setUpPyfakefs(modules_to_reload=[config])
+
+    def test_config_loaded_once(self) -> None:
+        self.fs.create_file(config.QWIKSTART_CONFIG_FILE, contents="offline: true")
+        with patch.object(
+            config, "load_user_config", wraps=config.load_user_config
+        ) as load_user_config:
+            assert config.get_user_config().offline
+            assert config.get_user_config() is config.get_user_config()
+        load_user_config.assert_called_once()
+
+    def test_config_reloaded_when_file_changes(self) -> None:
+        assert not config.get_user_config().offline
+        self.fs.create_file(config.QWIKSTART_CONFIG_FILE, contents="offline: true")
+        assert config.get_user_config().offline
+
+    def test_reload_user_config(self) -> None:
+        user_config = config.get_user_config()
+        reloaded_config = config.reload_user_config()
+        assert reloaded_config == user_config
+        assert reloaded_config is not user_config
+        assert config.get_user_config() is reloaded_config
+
+
 class TestLoadUserConfigFile(TestCase):
     def setUp(self) -> None:
         # Reload `config` module since it defines global Paths that need to be patched.
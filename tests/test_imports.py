@@ -0,0 +1,50 @@
+"""
+Tests guarding startup time of the `qwikstart` command-line interface.
+
+Operations and slow-to-import dependencies should only be imported on first use.
+These tests run in a subprocess, since modules imported by other tests are cached.
+"""
+import json
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+SLOW_IMPORTS = [
+    "git",
+    "prompt_toolkit",
+    "pygments",
+    "requests",
+    "ruamel.yaml",
+    "yamllint",
+]
+
+
+def get_imported_modules(statement: str) -> List[str]:
+    script = f"import json, sys; {statement}; print(json.dumps(list(sys.modules)))"
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return list(json.loads(output))
+
+
+@pytest.mark.parametrize(  # type:ignore
+    "statement",
+    [
+        "import qwikstart.cli.main",
+        "from qwikstart.parser import get_operations_mapping; "
+        "'echo' in get_operations_mapping()",
+    ],
+)
+def test_cli_startup_does_not_import_slow_modules(statement: str) -> None:
+    modules = get_imported_modules(statement)
+    assert [name for name in SLOW_IMPORTS if name in modules] == []
+    assert "qwikstart.operations.echo" not in modules
+
+
+def test_operation_imported_on_first_use() -> None:
+    modules = get_imported_modules(
+        "from qwikstart.parser import get_operations_mapping; "
+        "get_operations_mapping()['define_context']"
+    )
+    assert "qwikstart.operations.define_context" in modules
+    assert "qwikstart.operations.prompt" not in modules
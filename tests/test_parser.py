@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Any, List, cast
 from unittest.mock import ANY, Mock, patch
 
@@ -5,7 +6,7 @@ import pytest
 
 from qwikstart import parser
 from qwikstart.exceptions import ObsoleteError, TaskParserError
-from qwikstart.operations import GenericOperation, insert_text
+from qwikstart.operations import GenericOperation, OperationRegistry, insert_text
 from qwikstart.tasks import Task
 
 from . import helpers
@@ -35,6 +36,34 @@ class TestParseTask:
         with pytest.raises(TaskParserError):
             parser.parse_task({})
 
+    def test_template_config_from_source(self) -> None:
+        task_spec = {
+            "source": {"search_paths": ["shared"], "templates": {"a.txt": "A"}},
+            "steps": {},
+        }
+        task = parser.parse_task(task_spec, {"source_dir": Path("/repo")})
+        execution_context = task.context["execution_context"]
+        assert execution_context.template_search_paths == (Path("/repo/shared"),)
+        assert execution_context.template_sources == {"a.txt": "A"}
+
+
+class TestParseTemplateConfig:
+    def test_no_source(self) -> None:
+        assert parser.parse_template_config({}, Path(".")) == {
+            "template_search_paths": (),
+            "template_sources": None,
+        }
+
+    def test_search_paths_not_list_raises_error(self) -> None:
+        task_spec = {"source": {"search_paths": "shared"}}
+        with pytest.raises(TaskParserError):
+            parser.parse_template_config(task_spec, Path("."))
+
+    def test_templates_not_mapping_raises_error(self) -> None:
+        task_spec = {"source": {"templates": ["a.txt"]}}
+        with pytest.raises(TaskParserError):
+            parser.parse_template_config(task_spec, Path("."))
+
 
 class TestGetOperationsMapping:
     def test_no_operations(self) -> None:
@@ -67,14 +96,26 @@ class TestGetOperationsMapping:
             "fake_alias": MockOperation,
         }
 
+    def test_registered_operation_imported_on_access(self) -> None:
+        mapping = parser.get_operations_mapping()
+        assert "prompt_user" in mapping
+        assert "not_an_operation" not in mapping
+        assert mapping["prompt_user"] is mapping["prompt"]
+        assert len(mapping) == len(list(mapping))
+
+    def test_missing_operation(self) -> None:
+        with pytest.raises(KeyError):
+            parser.get_operations_mapping()["not_an_operation"]
+
+    def test_mapping_is_cached_registry(self) -> None:
+        assert parser.get_operations_mapping() is parser.get_operations_mapping()
+
     def get_operations_mapping(self, operations: List[Any]) -> GenericOperation:
-        with patch.object(
-            # Ignore type: Mypy doesn't seem to like objects imported into a module.
-            parser.BaseOperation,  # type: ignore
-            "__subclasses__",
-            return_value=operations,
-        ):
-            return cast(GenericOperation, parser.get_operations_mapping())
+        registry = OperationRegistry()
+        for operation_class in operations:
+            registry.register(operation_class)
+        with patch.object(parser, "OPERATION_REGISTRY", registry):
+            return cast(GenericOperation, dict(parser.get_operations_mapping()))
 
 
 class TestParseOperationFromStep:
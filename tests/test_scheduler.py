@@ -0,0 +1,130 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from qwikstart import scheduler
+from qwikstart.base_context import BaseContext, DictContext
+from qwikstart.operations import BaseOperation, add_file, define_context
+
+from .helpers import ContextWithDict, get_execution_context
+
+
+class OutputOperation(BaseOperation[ContextWithDict, DictContext]):
+    """Operation that returns `local_context` as output."""
+
+    name: str = "output_operation"
+
+    def run(self, context: ContextWithDict) -> DictContext:
+        return dict(self.local_context)
+
+
+def create_operation(
+    reads: Optional[List[str]] = None, writes: Optional[List[str]] = None, **output: Any
+) -> OutputOperation:
+    return OutputOperation(output, opconfig={"reads": reads, "writes": writes})
+
+
+class TestScheduleSteps:
+    def test_no_steps(self) -> None:
+        assert scheduler.schedule_steps([]) == []
+
+    def test_independent_steps_in_single_wave(self) -> None:
+        operations = [create_operation(writes=["a"]), create_operation(writes=["b"])]
+        assert scheduler.schedule_steps(operations) == [[0, 1]]
+
+    def test_step_reading_output_scheduled_after_writer(self) -> None:
+        operations = [
+            create_operation(writes=["a"]),
+            create_operation(reads=["a"], writes=["b"]),
+            create_operation(writes=["c"]),
+        ]
+        assert scheduler.schedule_steps(operations) == [[0, 2], [1]]
+
+    def test_step_writing_read_resource_scheduled_after_reader(self) -> None:
+        operations = [create_operation(reads=["a"]), create_operation(writes=["a"])]
+        assert scheduler.schedule_steps(operations) == [[0], [1]]
+
+    def test_undeclared_reads_inferred(self) -> None:
+        operations: List[BaseOperation[Any, Any]] = [
+            define_context.Operation(
+                {"context": {"name": "a"}}, opconfig={"writes": ["template_variables"]}
+            ),
+            add_file.Operation(
+                {"target_path": "out.txt", "template_path": "template.txt"},
+                opconfig={"writes": ["out.txt"]},
+            ),
+        ]
+        assert scheduler.schedule_steps(operations) == [[0], [1]]
+
+    def test_step_with_unknown_resources_runs_alone(self) -> None:
+        operations = [
+            create_operation(writes=["a"]),
+            create_operation(),
+            create_operation(writes=["b"]),
+        ]
+        assert scheduler.schedule_steps(operations) == [[0], [1], [2]]
+
+
+class TestExecuteConcurrently:
+    def test_outputs_merged_in_step_order(self) -> None:
+        operations = [
+            create_operation(writes=["a"], a=1),
+            create_operation(writes=["b"], b=2),
+        ]
+        context: Dict[str, Any] = {"execution_context": get_execution_context()}
+        context = scheduler.execute_concurrently(operations, context, max_workers=2)
+        assert list(context) == ["execution_context", "a", "b"]
+
+    def test_dependent_step_reads_output_of_earlier_wave(self) -> None:
+        @dataclass(frozen=True)
+        class DoublingContext(BaseContext):
+            a: int
+
+        class DoublingOperation(BaseOperation[DoublingContext, DictContext]):
+            name: str = "doubling_operation"
+
+            def run(self, context: DoublingContext) -> DictContext:
+                return {"b": 2 * context.a}
+
+        operations: List[BaseOperation[Any, Any]] = [
+            create_operation(writes=["a"], a=1),
+            DoublingOperation(opconfig={"reads": ["a"], "writes": ["b"]}),
+        ]
+        context: Dict[str, Any] = {"execution_context": get_execution_context()}
+        context = scheduler.execute_concurrently(operations, context, max_workers=2)
+        assert context["b"] == 2
+
+    def test_independent_steps_run_in_parallel(self) -> None:
+        # Each operation waits for the other, which only succeeds if both run at once.
+        barrier = threading.Barrier(2, timeout=5)
+
+        class WaitingOperation(OutputOperation):
+            name: str = "waiting_operation"
+
+            def run(self, context: ContextWithDict) -> DictContext:
+                barrier.wait()
+                return super().run(context)
+
+        operations = [
+            WaitingOperation({"a": 1}, opconfig={"writes": ["a"]}),
+            WaitingOperation({"b": 2}, opconfig={"writes": ["b"]}),
+        ]
+        context: Dict[str, Any] = {"execution_context": get_execution_context()}
+        context = scheduler.execute_concurrently(operations, context, max_workers=2)
+        assert context["a"] == 1
+        assert context["b"] == 2
+
+
+class TestAexecuteConcurrently:
+    def test_outputs_merged_in_step_order(self) -> None:
+        operations = [
+            create_operation(writes=["a"], a=1),
+            create_operation(writes=["b"], b=2),
+            create_operation(reads=["a", "b"], writes=["c"], c=3),
+        ]
+        context: Dict[str, Any] = {"execution_context": get_execution_context()}
+        context = asyncio.run(
+            scheduler.aexecute_concurrently(operations, context, max_workers=2)
+        )
+        assert list(context) == ["execution_context", "a", "b", "c"]
@@ -1,7 +1,22 @@
+import asyncio
+from pathlib import Path
 from textwrap import dedent
+from typing import Any, Dict, List
 
-from qwikstart.operations import find_tagged_line, insert_text
-from qwikstart.tasks import Task
+from pyfakefs.fake_filesystem_unittest import TestCase
+
+from qwikstart.operations import (
+    BaseOperation,
+    add_file,
+    append_text,
+    define_context,
+    echo,
+    find_tagged_line,
+    insert_text,
+    search_and_replace,
+)
+from qwikstart.tasks import TargetResult, Task
+from qwikstart.utils.file_buffer import FileBuffer
 
 from .helpers import create_mock_file_path, get_execution_context, read_file_path
 
@@ -35,3 +50,195 @@ class TestTask:
                 ]
             """
         )
+
+    def test_concurrent_execution(self) -> None:
+        context: Dict[str, Any] = {
+            "execution_context": get_execution_context(max_workers=2)
+        }
+        operations = [
+            define_context.Operation(
+                {"context_defs": {"a": 1}}, opconfig={"writes": ["a"]}
+            ),
+            define_context.Operation(
+                {"context_defs": {"b": 2}}, opconfig={"writes": ["b"]}
+            ),
+        ]
+        context = Task(context=context, operations=operations).execute()
+        assert context["a"] == 1
+        assert context["b"] == 2
+
+    def test_aexecute(self) -> None:
+        context: Dict[str, Any] = {"execution_context": get_execution_context()}
+        operations: List[BaseOperation[Any, Any]] = [
+            define_context.Operation({"context_defs": {"greeting": "Hello"}}),
+            echo.Operation({"message": "Hello"}),
+        ]
+        context = asyncio.run(Task(context=context, operations=operations).aexecute())
+        assert context["greeting"] == "Hello"
+
+    def test_concurrent_aexecute(self) -> None:
+        context: Dict[str, Any] = {
+            "execution_context": get_execution_context(max_workers=2)
+        }
+        operations = [
+            define_context.Operation(
+                {"context_defs": {"a": 1}}, opconfig={"writes": ["a"]}
+            ),
+            define_context.Operation(
+                {"context_defs": {"b": 2}}, opconfig={"writes": ["b"]}
+            ),
+        ]
+        context = asyncio.run(Task(context=context, operations=operations).aexecute())
+        assert context["a"] == 1
+        assert context["b"] == 2
+
+
+def test_dry_run_edits_to_skipped_new_file(tmp_path: Path) -> None:
+    new_file_path = tmp_path / "new.txt"
+    execution_context = get_execution_context(
+        source_dir=tmp_path,
+        template_sources={"new.txt": "Hello"},
+        dry_run=True,
+        file_buffer=FileBuffer(dry_run=True),
+    )
+    operations: List[BaseOperation[Any, Any]] = [
+        add_file.Operation({"template_path": "new.txt", "target_path": new_file_path}),
+        insert_text.Operation(
+            {"file_path": new_file_path, "text": "World", "line": 1, "column": 0}
+        ),
+    ]
+    Task(
+        context={"execution_context": execution_context}, operations=operations
+    ).execute()
+    assert not new_file_path.exists()
+
+
+class TestTaskWithFileBuffer(TestCase):
+    def setUp(self) -> None:
+        self.setUpPyfakefs()
+        self.file_path = Path("/path/to/test.txt")
+        self.fs.create_file(self.file_path, contents="Hello")
+
+    def create_task(self, dry_run: bool = False) -> Task:
+        execution_context = get_execution_context(
+            dry_run=dry_run, file_buffer=FileBuffer(dry_run=dry_run)
+        )
+        context: Dict[str, Any] = {
+            "execution_context": execution_context,
+            "file_path": self.file_path,
+        }
+        operations: List[BaseOperation[Any, Any]] = [
+            search_and_replace.Operation({"search": "Hello", "replace": "Howdy"}),
+            append_text.Operation({"text": " World"}),
+        ]
+        return Task(context=context, operations=operations)
+
+    def test_edits_written_when_task_completes(self) -> None:
+        task = self.create_task()
+        task.execute()
+        assert self.file_path.read_text() == "Howdy\n World"
+
+    def test_edits_flushed_before_unbuffered_operation(self) -> None:
+        task = self.create_task()
+        file_buffer = task.get_file_buffer()
+        assert file_buffer is not None
+        file_buffer.write_text(self.file_path, "Hello again")
+
+        echo.Operation({"message": "Unbuffered operation"}).execute(task.context)
+        assert self.file_path.read_text() == "Hello again"
+
+    def test_aexecute_writes_edits_when_task_completes(self) -> None:
+        task = self.create_task()
+        asyncio.run(task.aexecute())
+        assert self.file_path.read_text() == "Howdy\n World"
+
+    def test_dry_run(self) -> None:
+        task = self.create_task(dry_run=True)
+        task.execute()
+        assert self.file_path.read_text() == "Hello"
+
+
+class TestExecuteForTargets:
+    def create_task(self, source_dir: Path, template: str) -> Task:
+        execution_context = get_execution_context(
+            source_dir=source_dir,
+            target_dir=Path("."),
+            template_sources={"greeting.txt": template},
+            file_buffer=FileBuffer(),
+        )
+        context: Dict[str, Any] = {
+            "execution_context": execution_context,
+            "template_variables": {"name": "World"},
+        }
+        operations: List[BaseOperation[Any, Any]] = [
+            add_file.Operation(
+                {"template_path": "greeting.txt", "target_path": "greeting.txt"}
+            ),
+            append_text.Operation({"file_path": "greeting.txt", "text": "!"}),
+        ]
+        return Task(context=context, operations=operations)
+
+    def create_targets(self, tmp_path: Path) -> List[Path]:
+        target_dirs = [tmp_path / "a", tmp_path / "b"]
+        for target_dir in target_dirs:
+            target_dir.mkdir()
+        return target_dirs
+
+    def test_copy_for_target(self, tmp_path: Path) -> None:
+        task = self.create_task(tmp_path, "Hello")
+        task_copy = task.copy_for_target(tmp_path)
+        assert task_copy.operations is task.operations
+        assert task_copy.context["template_variables"] == {"name": "World"}
+        assert task_copy.context["template_variables"] is not (
+            task.context["template_variables"]
+        )
+        execution_context = task_copy.context["execution_context"]
+        assert execution_context.target_dir == tmp_path
+        assert execution_context.file_buffer is not task.get_file_buffer()
+        assert execution_context.get_template_loader() is (
+            task.context["execution_context"].get_template_loader()
+        )
+
+    def test_copy_for_target_without_file_buffer(self, tmp_path: Path) -> None:
+        task = self.create_task(tmp_path, "Hello")
+        execution_context = task.context["execution_context"]
+        task.context["execution_context"] = execution_context.copy(file_buffer=None)
+        task_copy = task.copy_for_target(tmp_path)
+        assert task_copy.get_file_buffer() is None
+
+    def test_execute_for_targets(self, tmp_path: Path) -> None:
+        task = self.create_task(tmp_path, "Hello, {{ qwikstart.name }}")
+        target_dirs = self.create_targets(tmp_path)
+        results = task.execute_for_targets(target_dirs)
+        assert results == [TargetResult(target_dir) for target_dir in target_dirs]
+        for target_dir in target_dirs:
+            assert (target_dir / "greeting.txt").read_text() == "Hello, World\n!"
+        assert task.context["template_variables"] == {"name": "World"}
+
+    def test_failed_target_reported(self, tmp_path: Path) -> None:
+        task = self.create_task(tmp_path, "Hello, {{ qwikstart.missing }}")
+        target_dirs = self.create_targets(tmp_path)
+        results = task.execute_for_targets(target_dirs)
+        assert [result.target_dir for result in results] == target_dirs
+        assert not any(result.succeeded for result in results)
+        assert "missing" in str(results[0].error)
+        assert Path.cwd() != target_dirs[0]
+
+    def test_execute_for_targets_in_processes(self, tmp_path: Path) -> None:
+        task = self.create_task(tmp_path, "Hello, {{ qwikstart.name }}")
+        target_dirs = self.create_targets(tmp_path)
+        results = task.execute_for_targets(target_dirs, max_workers=2)
+        assert all(result.succeeded for result in results)
+        for target_dir in target_dirs:
+            assert (target_dir / "greeting.txt").read_text() == "Hello, World\n!"
+
+    def test_operations_unchanged_by_targets(self, tmp_path: Path) -> None:
+        task = self.create_task(tmp_path, "Hello")
+        task.operations = [
+            define_context.Operation({"context_defs": {"cfg": {"a": 1}}}),
+            define_context.Operation({"context_defs": {"cfg": {"b": 2}}}),
+        ]
+        results = task.execute_for_targets(self.create_targets(tmp_path))
+        assert all(result.succeeded for result in results)
+        assert task.operations[0].local_context == {"context_defs": {"cfg": {"a": 1}}}
+        assert task.operations[1].local_context == {"context_defs": {"cfg": {"b": 2}}}
@@ -27,6 +27,13 @@ class TestGetNestedDictValue:
             dict_utils.get_nested_dict_value(nested_dict, "missing")
 
 
+class TestPopNestedDictValue:
+    def test_one_level(self) -> None:
+        nested_dict = {"nested": {"key": "value", "other": 1}}
+        assert dict_utils.pop_nested_dict_value(nested_dict, "nested.key") == "value"
+        assert nested_dict == {"nested": {"other": 1}}
+
+
 class TestSetNestedDictValue:
     def test_one_level(self) -> None:
         nested_dict: Dict[str, Any] = {"nested": {}}
@@ -61,6 +68,12 @@ class TestMergeNestedDicts:
         )
         assert merged_dict == {"nested_dict": {"a": 1, "b": 2}}
 
+    def test_unmodified_values_shared_with_default(self) -> None:
+        default = {"shared": {"a": 1}, "nested_dict": {"a": 1}}
+        merged_dict = dict_utils.merge_nested_dicts(default, {"nested_dict": {"b": 2}})
+        assert merged_dict["shared"] is default["shared"]
+        assert default == {"shared": {"a": 1}, "nested_dict": {"a": 1}}
+
     def test_inplace_modification_preserves_ruamel_comments(self) -> None:
         # ruamel.yaml uses a special dict class to preserve comments. Ensure that
         # inplace modification preserves comments from original dictionary.
@@ -111,3 +124,36 @@ class TestRemapDict:
     def test_nested_key_in_mapping_is_not_subdict(self) -> None:
         with pytest.raises(ValueError, match="Expected key 'not-dict' to contain dict"):
             dict_utils.remap_dict({"not-dict": "value"}, {"not-dict.key": "key"})
+
+    def test_original_dict_not_modified(self) -> None:
+        original_dict = {"nested": {"key": "value"}, "other": {"a": 1}}
+        remapped_dict = dict_utils.remap_dict(
+            original_dict, {"nested.key": "other.key"}
+        )
+        assert remapped_dict == {"nested": {}, "other": {"a": 1, "key": "value"}}
+        assert original_dict == {"nested": {"key": "value"}, "other": {"a": 1}}
+
+    def test_unmapped_values_shared_with_original_dict(self) -> None:
+        original_dict = {"key": "value", "shared": {"a": 1}}
+        remapped_dict = dict_utils.remap_dict(original_dict, {"key": "new-key"})
+        assert remapped_dict["shared"] is original_dict["shared"]
+
+
+class TestRemapDictWithKeyPaths:
+    def test_compiled_mapping_reused(self) -> None:
+        key_mapping = dict_utils.compile_key_mapping({"a.b": "c"})
+        assert key_mapping == (
+            (dict_utils.KeyPath("a.b", ("a", "b")), dict_utils.KeyPath("c", ("c",))),
+        )
+        for value in (1, 2):
+            remapped_dict = dict_utils.remap_dict_with_key_paths(
+                {"a": {"b": value}}, key_mapping
+            )
+            assert remapped_dict == {"a": {}, "c": value}
+
+    def test_custom_separator(self) -> None:
+        key_mapping = dict_utils.compile_key_mapping({"a/b": "c"}, "/")
+        remapped_dict = dict_utils.remap_dict_with_key_paths(
+            {"a": {"b": 1}}, key_mapping
+        )
+        assert remapped_dict == {"a": {}, "c": 1}
@@ -0,0 +1,121 @@
+import copy
+import logging
+import os
+import pickle
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from pyfakefs.fake_filesystem_unittest import TestCase
+
+from qwikstart.utils import file_buffer
+
+
+class TestFileBuffer(TestCase):
+    def setUp(self) -> None:
+        self.setUpPyfakefs()
+        self.file_path = Path("/path/to/test.txt")
+        self.fs.create_file(self.file_path, contents="Hello")
+
+    def test_edits_not_written_until_flush(self) -> None:
+        buffer = file_buffer.FileBuffer()
+        buffer.write_text(self.file_path, buffer.read_text(self.file_path) + " World")
+        assert buffer.read_text(self.file_path) == "Hello World"
+        assert self.file_path.read_text() == "Hello"
+
+        assert buffer.flush() == [self.file_path]
+        assert self.file_path.read_text() == "Hello World"
+
+    def test_unchanged_file_not_written(self) -> None:
+        buffer = file_buffer.FileBuffer()
+        buffer.write_text(self.file_path, "Hello")
+        assert buffer.changed_paths == []
+        assert buffer.flush() == []
+
+    def test_flush_clears_buffer(self) -> None:
+        buffer = file_buffer.FileBuffer()
+        buffer.write_text(self.file_path, "Howdy")
+        buffer.flush()
+        self.file_path.write_text("Changed on disk")
+        assert buffer.read_text(self.file_path) == "Changed on disk"
+
+    def test_dry_run_not_written(self) -> None:
+        buffer = file_buffer.FileBuffer(dry_run=True)
+        buffer.write_text(self.file_path, "Howdy")
+        assert buffer.flush() == [self.file_path]
+        assert self.file_path.read_text() == "Hello"
+
+    def test_missing_file_read_as_empty_in_dry_run(self) -> None:
+        new_file_path = Path("/path/to/new.txt")
+        buffer = file_buffer.FileBuffer(dry_run=True)
+        buffer.write_text(new_file_path, buffer.read_text(new_file_path) + "Hello")
+        assert buffer.flush() == [new_file_path]
+        assert not new_file_path.exists()
+
+    def test_missing_file_raises_error(self) -> None:
+        buffer = file_buffer.FileBuffer()
+        with pytest.raises(FileNotFoundError):
+            buffer.read_text(Path("/path/to/new.txt"))
+
+    def test_paths_to_same_file_share_edits(self) -> None:
+        os.chdir(self.file_path.parent)
+        buffer = file_buffer.FileBuffer()
+        relative_path = Path(self.file_path.name)
+        buffer.write_text(relative_path, buffer.read_text(relative_path) + " World")
+        buffer.write_text(self.file_path, buffer.read_text(self.file_path) + "!")
+        assert buffer.flush() == [self.file_path]
+        assert self.file_path.read_text() == "Hello World!"
+
+    def test_write_through_symlink(self) -> None:
+        link_path = Path("/path/to/link.txt")
+        self.fs.create_symlink(link_path, self.file_path)
+        file_buffer.write_file_atomically(link_path, "Howdy")
+        assert link_path.is_symlink()
+        assert self.file_path.read_text() == "Howdy"
+
+    def test_file_permissions_not_changed(self) -> None:
+        os.chmod(self.file_path, 0o755)
+        file_buffer.write_file_atomically(self.file_path, "Howdy")
+        assert self.file_path.read_text() == "Howdy"
+        assert os.stat(self.file_path).st_mode & 0o777 == 0o755
+        assert os.listdir(self.file_path.parent) == ["test.txt"]
+
+    def test_write_new_file_atomically(self) -> None:
+        new_file_path = Path("/path/to/new.txt")
+        file_buffer.write_file_atomically(new_file_path, "Hello")
+        assert new_file_path.read_text() == "Hello"
+
+    def test_temporary_file_removed_on_error(self) -> None:
+        with patch.object(os, "replace", side_effect=OSError):
+            with pytest.raises(OSError):
+                file_buffer.write_file_atomically(self.file_path, "Howdy")
+        assert os.listdir(self.file_path.parent) == [self.file_path.name]
+
+    def test_deepcopy_shares_buffer(self) -> None:
+        buffer = file_buffer.FileBuffer()
+        assert copy.deepcopy(buffer) is buffer
+
+    def test_pickle(self) -> None:
+        buffer = file_buffer.FileBuffer(dry_run=True)
+        buffer.write_text(self.file_path, "Howdy")
+        unpickled_buffer = pickle.loads(pickle.dumps(buffer))
+        assert unpickled_buffer.dry_run
+        assert unpickled_buffer.read_text(self.file_path) == "Howdy"
+
+    def test_read_lines(self) -> None:
+        self.file_path.write_text("a\nb")
+        assert file_buffer.read_lines(self.file_path) == ["a\n", "b"]
+
+    def test_write_text_without_buffer(self) -> None:
+        file_buffer.write_text(self.file_path, "Howdy")
+        assert file_buffer.read_text(self.file_path) == "Howdy"
+
+
+def test_dry_run_logs_diff(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("Hello\n")
+    buffer = file_buffer.FileBuffer(dry_run=True)
+    buffer.write_text(file_path, "Howdy\n")
+    with caplog.at_level(logging.INFO):
+        buffer.flush()
+    assert "-Hello\n+Howdy" in caplog.text
@@ -0,0 +1,130 @@
+"""
+Tests for qwikstart.utils.file_index
+
+These tests use pyfakefs (https://jmcgeheeiv.github.io/pyfakefs/) for mocking
+the filesystem. It appears that this doesn't play nicely with `ipdb` so any
+debugging of these tests will need to be done with normal `pdb`.
+"""
+import copy
+import os
+import pickle
+import time
+from unittest.mock import Mock, patch
+
+from pyfakefs.fake_filesystem_unittest import TestCase
+
+from qwikstart.utils import file_index
+
+
+class TestFileContentIndex(TestCase):
+    def setUp(self) -> None:
+        self.setUpPyfakefs()
+        self.index = file_index.FileContentIndex()
+
+    def create_file(self, path: str, contents: str = "", age: float = 60) -> None:
+        """Create file with modification time `age` seconds in the past."""
+        self.fs.create_file(path, contents=contents)
+        self.set_age(path, age)
+
+    def set_age(self, path: str, age: float) -> None:
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+    @patch.object(file_index, "read_text_file", wraps=file_index.read_text_file)
+    def test_unchanged_file_read_once(self, read_text_file: Mock) -> None:
+        self.create_file("file.txt", "text")
+        assert self.index.read_text("file.txt") == "text"
+        assert self.index.read_text("file.txt") == "text"
+        read_text_file.assert_called_once()
+
+    def test_changed_file_read_again(self) -> None:
+        self.create_file("file.txt", "text")
+        assert self.index.read_text("file.txt") == "text"
+
+        with open("file.txt", "w") as f:
+            f.write("changed")
+        self.set_age("file.txt", 30)
+        assert self.index.read_text("file.txt") == "changed"
+
+    @patch.object(file_index, "read_text_file", wraps=file_index.read_text_file)
+    def test_recently_modified_file_not_indexed(self, read_text_file: Mock) -> None:
+        self.create_file("file.txt", "text", age=0)
+        self.index.read_text("file.txt")
+        self.index.read_text("file.txt")
+        assert read_text_file.call_count == 2
+        assert len(self.index) == 0
+
+    def test_large_file_not_indexed(self) -> None:
+        self.index = file_index.FileContentIndex(max_file_size=2)
+        self.create_file("file.txt", "text")
+        assert self.index.read_text("file.txt") == "text"
+        assert len(self.index) == 0
+
+    def test_least_recently_used_file_evicted(self) -> None:
+        self.index = file_index.FileContentIndex(max_total_size=8)
+        for path in ["a.txt", "b.txt", "c.txt"]:
+            self.create_file(path, "text")
+        self.index.read_text("a.txt")
+        self.index.read_text("b.txt")
+        self.index.read_text("a.txt")
+        self.index.read_text("c.txt")
+        assert len(self.index) == 2
+        assert self.index.total_size == 8
+        with patch.object(file_index, "read_text_file") as read_text_file:
+            self.index.read_text("a.txt")
+            self.index.read_text("c.txt")
+        read_text_file.assert_not_called()
+
+    def test_changed_file_replaces_entry_size(self) -> None:
+        self.create_file("file.txt", "text")
+        self.index.read_text("file.txt")
+        with open("file.txt", "w") as f:
+            f.write("changed")
+        self.set_age("file.txt", 30)
+        self.index.read_text("file.txt")
+        assert self.index.total_size == len("changed")
+
+    def test_binary_file(self) -> None:
+        self.fs.create_file("file.bin", contents=b"\0binary")
+        assert self.index.read_text("file.bin") is None
+
+    def test_newlines_translated(self) -> None:
+        self.fs.create_file("file.txt", contents=b"crlf\r\ncr\rlf\n")
+        assert self.index.read_text("file.txt") == "crlf\ncr\nlf\n"
+
+    def test_missing_file(self) -> None:
+        with self.assertRaises(OSError):
+            self.index.read_text("missing.txt")
+
+    @patch.object(file_index, "scan_directory", wraps=file_index.scan_directory)
+    def test_unchanged_directory_scanned_once(self, scan_directory: Mock) -> None:
+        self.create_file("dir/b.txt")
+        self.create_file("dir/a/file.txt")
+        self.set_age("dir", 60)
+
+        expected = [
+            file_index.DirectoryEntry("a", is_dir=True, is_symlink=False),
+            file_index.DirectoryEntry("b.txt", is_dir=False, is_symlink=False),
+        ]
+        assert self.index.scan_directory("dir") == expected
+        assert self.index.scan_directory("dir") == expected
+        scan_directory.assert_called_once()
+
+    def test_clear(self) -> None:
+        self.create_file("file.txt", "text")
+        self.index.read_text("file.txt")
+        self.index.clear()
+        assert len(self.index) == 0
+        assert self.index.total_size == 0
+
+    def test_deepcopy_shares_index(self) -> None:
+        assert copy.deepcopy(self.index) is self.index
+
+    def test_pickle_drops_entries(self) -> None:
+        self.create_file("file.txt", "text")
+        index = file_index.FileContentIndex(max_file_size=10, max_total_size=20)
+        index.read_text("file.txt")
+        unpickled_index = pickle.loads(pickle.dumps(index))
+        assert unpickled_index.max_file_size == 10
+        assert unpickled_index.max_total_size == 20
+        assert len(unpickled_index) == 0
@@ -6,10 +6,13 @@ the filesystem. It appears that this doesn't play nicely with `ipdb` so any
 debugging of these tests will need to be done with normal `pdb`.
 """
 import os
+import pickle
 from pathlib import Path
 from typing import Any, Dict, List, Optional
+from unittest.mock import patch
 
 import jinja2
+import pytest
 from pyfakefs.fake_filesystem_unittest import TestCase
 
 from qwikstart.utils import filesystem, templates
@@ -35,7 +38,9 @@ class TestRenderFileTree(TestCase):
         source_dir: Optional[Path] = None,
         target_dir: Optional[Path] = None,
         ignore_patterns: Optional[List[str]] = None,
-    ) -> None:
+        max_workers: int = 1,
+        incremental: bool = False,
+    ) -> filesystem.CopySummary:
         renderer = templates.TemplateRenderer(
             jinja2.FileSystemLoader("/"),
             template_variables=template_variables,
@@ -46,8 +51,10 @@ class TestRenderFileTree(TestCase):
             target_dir or self.target_dir,
             renderer,
             ignore_patterns or [],
+            max_workers=max_workers,
+            incremental=incremental,
         )
-        generator.copy()
+        return generator.copy()
 
     def test_empty_source_tree(self) -> None:
         self.render_source_directory_to_target_directory()
@@ -153,6 +160,154 @@ class TestRenderFileTree(TestCase):
         )
         assert os.listdir(self.target_dir) == ["subdirectory"]
 
+    def test_concurrent_copy(self) -> None:
+        for name in ["a", "b", "c"]:
+            self.fs.create_file(
+                self.source_dir / name / "{{ qwikstart.name }}.txt",
+                contents="Hello, {{ qwikstart.name }}!",
+            )
+        self.render_source_directory_to_target_directory(
+            template_variables={"name": "World"}, max_workers=3
+        )
+
+        for name in ["a", "b", "c"]:
+            with open(self.target_dir / name / "World.txt") as f:
+                assert f.read() == "Hello, World!"
+
+    def test_copy_summary(self) -> None:
+        self.fs.create_file(self.source_dir / "a.txt")
+        self.fs.create_file(self.source_dir / "b.txt")
+        summary = self.render_source_directory_to_target_directory()
+        assert summary == filesystem.CopySummary(written=2, skipped=0)
+
+    def test_incremental_skips_unchanged_files(self) -> None:
+        self.fs.create_file(self.source_dir / "same.txt", contents="Hello, World!")
+        self.fs.create_file(self.source_dir / "different.txt", contents="new")
+        self.fs.create_file(self.source_dir / "binary.bin", contents=b"\0binary")
+        self.fs.create_file(self.source_dir / "new.txt", contents="new")
+        self.fs.create_file(self.target_dir / "same.txt", contents="Hello, World!")
+        self.fs.create_file(self.target_dir / "different.txt", contents="old")
+        self.fs.create_file(self.target_dir / "binary.bin", contents=b"\0binary")
+        for name in ["same.txt", "binary.bin"]:
+            os.utime(self.target_dir / name, (0, 0))
+
+        summary = self.render_source_directory_to_target_directory(incremental=True)
+
+        assert summary == filesystem.CopySummary(written=2, skipped=2)
+        assert os.path.getmtime(self.target_dir / "same.txt") == 0
+        assert os.path.getmtime(self.target_dir / "binary.bin") == 0
+        with open(self.target_dir / "different.txt") as f:
+            assert f.read() == "new"
+
+    def test_incremental_copies_changed_binary_file(self) -> None:
+        self.fs.create_file(self.source_dir / "binary.bin", contents=b"\0new")
+        self.fs.create_file(self.target_dir / "binary.bin", contents=b"\0old")
+
+        summary = self.render_source_directory_to_target_directory(incremental=True)
+
+        assert summary == filesystem.CopySummary(written=1, skipped=0)
+        with open(self.target_dir / "binary.bin", "rb") as f:
+            assert f.read() == b"\0new"
+
+    def test_incremental_copies_mode_of_unchanged_file(self) -> None:
+        self.fs.create_file(self.source_dir / "test.txt", contents="test")
+        self.fs.create_file(self.target_dir / "test.txt", contents="test")
+        os.chmod(self.source_dir / "test.txt", 0o777)
+
+        summary = self.render_source_directory_to_target_directory(incremental=True)
+
+        assert summary.skipped == 1
+        assert filemode(self.target_dir / "test.txt") == 0o777
+
+    def test_template_names_relative_to_renderer_source_dir(self) -> None:
+        self.fs.create_file(self.source_dir / "sub" / "test.txt", contents="test")
+        renderer = templates.TemplateRenderer(
+            templates.SourceDirLoader(self.source_dir), source_dir=self.source_dir
+        )
+        generator = filesystem.FileTreeGenerator(
+            self.source_dir, self.target_dir, renderer
+        )
+        with patch.object(renderer, "render", wraps=renderer.render) as render:
+            generator.copy()
+        render.assert_called_once_with("sub/test.txt")
+        with open(self.target_dir / "sub" / "test.txt") as f:
+            assert f.read() == "test"
+
+    def test_template_outside_renderer_source_dir(self) -> None:
+        self.fs.create_file(self.source_dir / "test.txt", contents="test")
+        renderer = templates.TemplateRenderer(
+            jinja2.FileSystemLoader("/"), source_dir=Path("/other")
+        )
+        generator = filesystem.FileTreeGenerator(
+            self.source_dir, self.target_dir, renderer
+        )
+        with patch.object(renderer, "render", wraps=renderer.render) as render:
+            generator.copy()
+        render.assert_called_once_with(str(self.source_dir / "test.txt"))
+
+    def test_unknown_executor(self) -> None:
+        renderer = templates.TemplateRenderer(jinja2.FileSystemLoader("/"))
+        with pytest.raises(ValueError, match="Unknown executor"):
+            filesystem.FileTreeGenerator(
+                self.source_dir, self.target_dir, renderer, executor="unknown"
+            )
+
+    def test_copier_can_be_pickled_for_process_executor(self) -> None:
+        renderer = templates.TemplateRenderer(
+            jinja2.FileSystemLoader("/"), template_variables={"name": "World"}
+        )
+        generator = filesystem.FileTreeGenerator(
+            self.source_dir, self.target_dir, renderer, executor="process"
+        )
+        copier = pickle.loads(pickle.dumps(generator.copier))
+        assert copier.renderer.render_string("{{ name }}") == "World"
+
+
+class TestProcessExecutor:
+    def test_concurrent_copy(self, tmp_path: Path) -> None:
+        source_dir = tmp_path / "source"
+        for name in ["a", "b", "c"]:
+            source_dir.joinpath(name).mkdir(parents=True)
+            source_dir.joinpath(name, "{{ qwikstart.name }}.txt").write_text(
+                "Hello, {{ qwikstart.name }}!"
+            )
+        renderer = templates.TemplateRenderer(
+            templates.SourceDirLoader(source_dir),
+            template_variables={"name": "World"},
+            template_variable_prefix=templates.DEFAULT_TEMPLATE_VARIABLE_PREFIX,
+            source_dir=source_dir,
+        )
+        generator = filesystem.FileTreeGenerator(
+            source_dir, tmp_path / "target", renderer, max_workers=2, executor="process"
+        )
+        assert generator.copy() == filesystem.CopySummary(written=3, skipped=0)
+        for name in ["a", "b", "c"]:
+            text = tmp_path.joinpath("target", name, "World.txt").read_text()
+            assert text == "Hello, World!"
+
+    def test_worker_uses_initialized_copier(self, tmp_path: Path) -> None:
+        tmp_path.joinpath("test.txt").write_text("test")
+        copier = filesystem.FileCopier(
+            templates.TemplateRenderer(jinja2.FileSystemLoader("/"))
+        )
+        # Restore the worker's copier, since this runs in the test process.
+        with patch.object(filesystem, "_worker_copier", None):
+            filesystem._initialize_worker(copier)
+            jobs = [(tmp_path / "test.txt", tmp_path / "copy.txt")]
+            assert filesystem._copy_files_in_worker(jobs) == [True]
+        assert tmp_path.joinpath("copy.txt").read_text() == "test"
+
+
+class TestChunkJobs:
+    def test_chunks_per_worker(self) -> None:
+        jobs = [(Path(str(i)), Path(str(i))) for i in range(10)]
+        chunks = filesystem.chunk_jobs(jobs, max_workers=2)
+        assert len(chunks) == 5
+        assert [job for chunk in chunks for job in chunk] == jobs
+
+    def test_no_jobs(self) -> None:
+        assert filesystem.chunk_jobs([], max_workers=2) == []
+
 
 class TestFnmatchesToRegex:
     def test_exact_match(self) -> None:
@@ -1,9 +1,14 @@
-from unittest.mock import Mock, patch
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
 
-from qwikstart.utils import http
+import pytest
 
-# Ignore type: Mypy doesn't like referencing objects imported into a module.
-REQUESTS_MODULE = http.requests  # type: ignore
+from qwikstart.exceptions import RepoLoaderError
+from qwikstart.utils import http
 
 
 class TestIsUrl:
@@ -17,7 +22,158 @@ class TestIsUrl:
         assert http.is_url("not-a-url") is False
 
 
-@patch.object(REQUESTS_MODULE, "get", return_value=Mock(text="http-response-text"))
-def test_read_from_url(mock_get: Mock) -> None:
-    assert http.read_from_url("fake.url") == "http-response-text"
-    mock_get.assert_called_once_with("fake.url")
+class FakeServer:
+    """Local HTTP server serving `files`, which records request headers."""
+
+    def __init__(self) -> None:
+        self.files: Dict[str, str] = {}
+        self.etags: Dict[str, str] = {}
+        #: Error status codes returned instead of files.
+        self.errors: Dict[str, int] = {}
+        self.requests: List[Dict[str, str]] = []
+        self.url = ""
+
+    def set_file(self, path: str, text: str, etag: str = "") -> None:
+        self.files[path] = text
+        self.etags[path] = etag
+
+
+@contextmanager
+def serve_files() -> Iterator[FakeServer]:
+    fake_server = FakeServer()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            fake_server.requests.append(dict(self.headers))
+            if self.path in fake_server.errors:
+                self.send_error(fake_server.errors[self.path])
+                return
+            if self.path not in fake_server.files:
+                self.send_error(404)
+                return
+
+            etag = fake_server.etags[self.path]
+            if etag and self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            body = fake_server.files[self.path].encode("utf-8")
+            self.send_response(200)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    fake_server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield fake_server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+class TestReadFromUrl:
+    def test_read(self) -> None:
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello")
+            assert http.read_from_url(f"{server.url}/spec.yml") == "Hello"
+
+    def test_missing_file_raises_error(self) -> None:
+        with serve_files() as server:
+            with pytest.raises(RepoLoaderError):
+                http.read_from_url(f"{server.url}/missing.yml")
+
+    def test_unchanged_file_read_from_cache(self, tmp_path: Path) -> None:
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello", etag='"v1"')
+            url = f"{server.url}/spec.yml"
+            assert http.read_from_url(url, cache_dir=tmp_path) == "Hello"
+            assert http.read_from_url(url, cache_dir=tmp_path) == "Hello"
+        assert server.requests[1]["If-None-Match"] == '"v1"'
+
+    def test_changed_file_downloaded(self, tmp_path: Path) -> None:
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello", etag='"v1"')
+            url = f"{server.url}/spec.yml"
+            http.read_from_url(url, cache_dir=tmp_path)
+            server.set_file("/spec.yml", "Goodbye", etag='"v2"')
+            assert http.read_from_url(url, cache_dir=tmp_path) == "Goodbye"
+            assert http.read_from_url(url, cache_dir=tmp_path) == "Goodbye"
+        assert server.requests[2]["If-None-Match"] == '"v2"'
+
+    def test_cached_response_used_after_server_error(self, tmp_path: Path) -> None:
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello")
+            url = f"{server.url}/spec.yml"
+            http.read_from_url(url, cache_dir=tmp_path)
+            server.errors["/spec.yml"] = 500
+            assert http.read_from_url(url, cache_dir=tmp_path) == "Hello"
+
+    def test_cached_response_used_after_retries_fail(self, tmp_path: Path) -> None:
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello")
+            url = f"{server.url}/spec.yml"
+            http.read_from_url(url, cache_dir=tmp_path)
+            server.errors["/spec.yml"] = 503
+            assert http.read_from_url(url, cache_dir=tmp_path, retries=1) == "Hello"
+
+    def test_cached_response_used_after_connection_error(self, tmp_path: Path) -> None:
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello")
+            url = f"{server.url}/spec.yml"
+            http.read_from_url(url, cache_dir=tmp_path)
+        assert http.read_from_url(url, cache_dir=tmp_path) == "Hello"
+
+    def test_cached_response_not_used_after_client_error(self, tmp_path: Path) -> None:
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello")
+            url = f"{server.url}/spec.yml"
+            http.read_from_url(url, cache_dir=tmp_path)
+            del server.files["/spec.yml"]
+            with pytest.raises(RepoLoaderError):
+                http.read_from_url(url, cache_dir=tmp_path)
+
+    def test_offline(self, tmp_path: Path) -> None:
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello")
+            url = f"{server.url}/spec.yml"
+            http.read_from_url(url, cache_dir=tmp_path)
+            assert http.read_from_url(url, cache_dir=tmp_path, offline=True) == "Hello"
+        assert len(server.requests) == 1
+
+    def test_offline_without_cached_response(self, tmp_path: Path) -> None:
+        with pytest.raises(RepoLoaderError):
+            http.read_from_url("http://example.com", cache_dir=tmp_path, offline=True)
+
+    def test_session_reused(self) -> None:
+        assert http.get_session(retries=1) is http.get_session(retries=1)
+
+
+class TestHttpCache:
+    def test_last_modified_header(self) -> None:
+        cached = {"etag": None, "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        headers = http.get_conditional_headers(cached)
+        assert headers == {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+    def test_hash_collision_ignored(self, tmp_path: Path) -> None:
+        with patch.object(http, "get_cache_path", return_value=tmp_path / "a.json"):
+            tmp_path.joinpath("a.json").write_text('{"url": "other", "text": ""}')
+            assert http.read_cached_response("url", tmp_path) is None
+
+    def test_unwritable_cache_ignored(self, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "not-a-directory"
+        cache_dir.touch()
+        with serve_files() as server:
+            server.set_file("/spec.yml", "Hello")
+            url = f"{server.url}/spec.yml"
+            assert http.read_from_url(url, cache_dir=cache_dir) == "Hello"
+        assert http.read_cached_response(url, cache_dir) is None
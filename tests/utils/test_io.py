@@ -0,0 +1,27 @@
+from pathlib import Path
+
+import pytest
+from ruamel.yaml.constructor import DuplicateKeyError
+
+from qwikstart.utils import io
+
+
+class TestSafeLoadYaml:
+    def test_load_string(self) -> None:
+        data = io.safe_load_yaml_string("a:  # comment\n    b: [1, 2]\n")
+        assert data == {"a": {"b": [1, 2]}}
+        assert type(data) is dict
+
+    def test_load_file(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "data.yml"
+        file_path.write_text("a: 1\n")
+        assert io.safe_load_yaml_file(file_path) == {"a": 1}
+
+    def test_duplicate_keys_raise_error(self) -> None:
+        with pytest.raises(DuplicateKeyError):
+            io.safe_load_yaml_string("a: 1\na: 2\n")
+
+    def test_matches_round_trip_loader(self) -> None:
+        yaml_contents = "date: 2020-01-01\nflag: yes\noctal: 0o10\nnull_value: ~\n"
+        safe_data = io.safe_load_yaml_string(yaml_contents)
+        assert safe_data == io.load_yaml_string(yaml_contents)
@@ -0,0 +1,97 @@
+import fcntl
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from qwikstart.utils import locks
+from qwikstart.utils.locks import FileLock
+
+
+def can_lock(path: Path, exclusive: bool) -> bool:
+    """Return True if a lock could be acquired by a different open file."""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        lock_type = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        fcntl.flock(fd, lock_type | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+    finally:
+        os.close(fd)
+
+
+class TestFileLock:
+    def test_shared_lock(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        lock = FileLock(lock_path)
+        lock.acquire(exclusive=False)
+        assert lock.is_locked
+        assert can_lock(lock_path, exclusive=False)
+        assert not can_lock(lock_path, exclusive=True)
+        lock.release()
+
+    def test_exclusive_lock(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        lock = FileLock(lock_path)
+        lock.acquire(exclusive=True)
+        assert not can_lock(lock_path, exclusive=False)
+        lock.release()
+
+    def test_switch_from_exclusive_to_shared_lock(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        lock = FileLock(lock_path)
+        lock.acquire(exclusive=True)
+        lock.acquire(exclusive=False)
+        assert lock.exclusive is False
+        assert can_lock(lock_path, exclusive=False)
+        lock.release()
+
+    def test_acquire_held_lock(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        lock = FileLock(lock_path)
+        lock.acquire(exclusive=True)
+        lock.acquire(exclusive=True)
+        assert lock.exclusive
+        lock.release()
+
+    def test_release(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        lock = FileLock(lock_path)
+        lock.acquire(exclusive=True)
+        lock.release()
+        assert not lock.is_locked
+        assert can_lock(lock_path, exclusive=True)
+
+    def test_release_unlocked(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        lock = FileLock(lock_path)
+        lock.release()
+        assert not lock.is_locked
+
+    def test_lock_not_enforced_without_fcntl(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        lock = FileLock(lock_path)
+        with patch.object(locks, "fcntl", None):
+            lock.acquire(exclusive=True)
+        assert lock.exclusive
+        assert can_lock(lock_path, exclusive=True)
+        lock.release()
+
+    def test_acquire_with_timeout(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        lock = FileLock(lock_path)
+        lock.acquire(exclusive=True, timeout=1)
+        assert not can_lock(lock_path, exclusive=False)
+        lock.release()
+
+    def test_timeout_while_other_lock_held(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / "nested" / "file.lock"
+        other_lock = FileLock(lock_path)
+        other_lock.acquire(exclusive=False)
+        lock = FileLock(lock_path)
+        with pytest.raises(TimeoutError):
+            lock.acquire(exclusive=True, timeout=0.1)
+        assert not lock.is_locked
+        other_lock.release()
@@ -0,0 +1,176 @@
+"""
+Tests for qwikstart.utils.search
+
+Most of these tests use pyfakefs (https://jmcgeheeiv.github.io/pyfakefs/) for mocking
+the filesystem. Memory-mapped files aren't supported by pyfakefs, so tests of `mmap`
+scanning use pytest's `tmp_path` fixture instead.
+"""
+import os
+import re
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import patch
+
+from pyfakefs.fake_filesystem_unittest import TestCase
+
+from qwikstart.utils import search
+
+
+class TestIterFiles(TestCase):
+    def setUp(self) -> None:
+        self.setUpPyfakefs()
+
+    def iter_files(self, **kwargs: Any) -> List[str]:
+        return list(search.iter_files("root", **kwargs))
+
+    def test_sorted_files_before_subdirectories(self) -> None:
+        self.fs.create_file("root/b/file.txt")
+        self.fs.create_file("root/c.txt")
+        self.fs.create_file("root/a.txt")
+        assert self.iter_files() == ["root/a.txt", "root/c.txt", "root/b/file.txt"]
+
+    def test_symlinked_directory_not_followed(self) -> None:
+        self.fs.create_file("other/file.txt")
+        self.fs.create_symlink("root/link", "/other")
+        self.fs.create_file("root/a.txt")
+        assert self.iter_files() == ["root/a.txt"]
+
+    def test_path_filter(self) -> None:
+        self.fs.create_file("root/file.txt")
+        self.fs.create_file("root/file.md")
+        assert self.iter_files(path_filter="*.md") == ["root/file.md"]
+
+    def test_ignore_directory_name(self) -> None:
+        self.fs.create_file("root/node_modules/file.txt")
+        self.fs.create_file("root/sub/node_modules/file.txt")
+        self.fs.create_file("root/sub/file.txt")
+        assert self.iter_files(ignore_patterns=["node_modules"]) == [
+            "root/sub/file.txt"
+        ]
+
+    def test_ignore_relative_path(self) -> None:
+        self.fs.create_file("root/build/file.txt")
+        self.fs.create_file("root/sub/build/file.txt")
+        assert self.iter_files(ignore_patterns=["build/*"]) == [
+            "root/sub/build/file.txt"
+        ]
+
+    def test_gitignore_not_used_by_default(self) -> None:
+        self.fs.create_file("root/.gitignore", contents="*.log")
+        self.fs.create_file("root/file.log")
+        assert self.iter_files() == ["root/.gitignore", "root/file.log"]
+
+    def test_gitignore_name_pattern(self) -> None:
+        self.fs.create_file("root/.gitignore", contents="# Comment\n*.log\n!keep.log")
+        self.fs.create_file("root/file.log")
+        self.fs.create_file("root/sub/file.log")
+        self.fs.create_file("root/sub/file.txt")
+        assert self.iter_files(use_gitignore=True) == [
+            "root/.gitignore",
+            "root/sub/file.txt",
+        ]
+
+    def test_gitignore_directory_pattern(self) -> None:
+        self.fs.create_file("root/.gitignore", contents="build/")
+        self.fs.create_file("root/build/file.txt")
+        self.fs.create_file("root/sub/build")
+        assert self.iter_files(use_gitignore=True) == [
+            "root/.gitignore",
+            "root/sub/build",
+        ]
+
+    def test_nested_gitignore_anchored_pattern(self) -> None:
+        self.fs.create_file("root/sub/.gitignore", contents="/out/file.txt")
+        self.fs.create_file("root/sub/out/file.txt")
+        self.fs.create_file("root/out/file.txt")
+        assert self.iter_files(use_gitignore=True) == [
+            "root/out/file.txt",
+            "root/sub/.gitignore",
+        ]
+
+    def test_missing_directory(self) -> None:
+        assert self.iter_files() == []
+
+
+class TestSearchFiles(TestCase):
+    def setUp(self) -> None:
+        self.setUpPyfakefs()
+
+    def test_match(self) -> None:
+        self.fs.create_file("match.txt", contents="match")
+        self.fs.create_file("other.txt", contents="other")
+        paths = ["match.txt", "other.txt"]
+        assert search.search_files(paths, re.compile("match")) == ["match.txt"]
+
+    def test_concurrent_search_preserves_order(self) -> None:
+        paths = [f"file{i}.txt" for i in range(10)]
+        for path in paths:
+            self.fs.create_file(path, contents="match")
+        assert search.search_files(paths, re.compile("match"), max_workers=4) == paths
+
+    def test_binary_file_rejected(self) -> None:
+        self.fs.create_file("binary.bin", contents=b"match\0")
+        assert search.search_files(["binary.bin"], re.compile("match")) == []
+
+    def test_undecodable_file_rejected(self) -> None:
+        self.fs.create_file("latin.txt", contents=b"match \xff")
+        assert search.search_files(["latin.txt"], re.compile("match")) == []
+
+    def test_missing_file_rejected(self) -> None:
+        assert search.search_files(["missing.txt"], re.compile("match")) == []
+
+
+class TestToBytesRegex:
+    def test_literal_pattern(self) -> None:
+        bytes_regex = search.to_bytes_regex(re.compile("hello|world", re.MULTILINE))
+        assert bytes_regex is not None
+        assert bytes_regex.pattern == b"hello|world"
+        assert bytes_regex.flags & re.MULTILINE
+
+    def test_patterns_matching_single_characters(self) -> None:
+        for pattern in ["a.c", r"\w+", "[^a]", "é"]:
+            assert search.to_bytes_regex(re.compile(pattern)) is None
+
+    def test_ignore_case(self) -> None:
+        assert search.to_bytes_regex(re.compile("match", re.IGNORECASE)) is None
+
+    def test_character_escapes(self) -> None:
+        patterns = [r"caf\u00e9", r"\U0001F600", r"\N{LATIN SMALL LETTER E}", r"\x41"]
+        for pattern in patterns:
+            assert search.to_bytes_regex(re.compile(pattern)) is None
+
+    def test_inline_unicode_flag(self) -> None:
+        assert search.to_bytes_regex(re.compile("(?u)abc")) is None
+        assert search.to_bytes_regex(re.compile("(?mu)abc")) is None
+
+    def test_line_endings(self) -> None:
+        for pattern in ["end$", r"a\nb", r"a\rb", "a\nb"]:
+            assert search.to_bytes_regex(re.compile(pattern)) is None
+
+    def test_pattern_invalid_for_bytes(self) -> None:
+        regex = re.compile("abc")
+        with patch.object(re, "compile", side_effect=re.error("invalid")):
+            assert search.to_bytes_regex(regex) is None
+
+
+class TestSearchFileMmap:
+    def test_large_file_match(self, tmp_path: Path) -> None:
+        path = tmp_path / "large.txt"
+        path.write_text("x" * 100 + "match")
+        assert self.search_file(path, "match")
+        assert not self.search_file(path, "missing")
+
+    def test_large_binary_file_rejected(self, tmp_path: Path) -> None:
+        path = tmp_path / "large.bin"
+        path.write_bytes(b"\0" * 100 + b"match")
+        assert not self.search_file(path, "match")
+
+    def test_large_file_with_crlf_line_endings(self, tmp_path: Path) -> None:
+        path = tmp_path / "large.txt"
+        path.write_bytes(b"version = 12\r\n")
+        assert self.search_file(path, "(?m)12$")
+
+    def search_file(self, path: Path, pattern: str) -> bool:
+        regex = re.compile(pattern)
+        bytes_regex = search.to_bytes_regex(regex)
+        return search.search_file(os.fspath(path), regex, bytes_regex, mmap_threshold=1)
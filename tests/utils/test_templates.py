@@ -5,15 +5,20 @@ These tests use pyfakefs (https://jmcgeheeiv.github.io/pyfakefs/) for mocking
 the filesystem. It appears that this doesn't play nicely with `ipdb` so any
 debugging of these tests will need to be done with normal `pdb`.
 """
+import copy
+import pickle
 import textwrap
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import jinja2
+import pytest
 from pyfakefs.fake_filesystem_unittest import TestCase
 
 from qwikstart.utils import templates
 
+from ..helpers import get_execution_context
+
 
 class TestRenderFileTree(TestCase):
     def setUp(self) -> None:
@@ -83,3 +88,199 @@ class TestRenderFileTree(TestCase):
                 "source_dir": self.source_dir,
             }
         }
+
+    def test_pickled_renderer_keeps_filters(self) -> None:
+        renderer = self.get_template_renderer(template_variables={"name": "World"})
+        renderer.add_template_filters(shout=str.upper)
+        renderer = pickle.loads(pickle.dumps(renderer))
+        assert renderer.render_string("{{ name | shout }}") == "WORLD"
+
+
+class TestTemplateCache(TestCase):
+    def setUp(self) -> None:
+        self.setUpPyfakefs()
+        self.template_path = Path("/source/test.txt")
+        self.loader = jinja2.FileSystemLoader("/")
+        self.cache = templates.TemplateCache()
+
+    def get_template_renderer(self) -> templates.TemplateRenderer:
+        return templates.TemplateRenderer(
+            self.loader,
+            template_variables={"name": "World"},
+            template_cache=self.cache,
+        )
+
+    def test_renderers_share_environment(self) -> None:
+        renderer_1 = self.get_template_renderer()
+        renderer_2 = self.get_template_renderer()
+        assert renderer_1._env is renderer_2._env
+
+    def test_filters_use_separate_environment(self) -> None:
+        renderer_1 = self.get_template_renderer()
+        renderer_2 = self.get_template_renderer()
+        renderer_2.add_template_filters(shout=str.upper)
+        assert renderer_1._env is not renderer_2._env
+        assert renderer_2.render_string("{{ name | shout }}") == "WORLD"
+
+    def test_string_template_compiled_once(self) -> None:
+        env = self.cache.get_environment(self.loader)
+        template = self.cache.from_string(env, "Hello, {{ name }}!")
+        assert self.cache.from_string(env, "Hello, {{ name }}!") is template
+
+    def test_clear(self) -> None:
+        env = self.cache.get_environment(self.loader)
+        template = self.cache.from_string(env, "Hello")
+        self.cache.clear()
+        assert self.cache.get_environment(self.loader) is not env
+        assert self.cache.from_string(env, "Hello") is not template
+
+    def test_string_template_evicted_when_cache_is_full(self) -> None:
+        cache = templates.TemplateCache(max_size=1)
+        env = cache.get_environment(self.loader)
+        template = cache.from_string(env, "first")
+        cache.from_string(env, "second")
+        assert cache.from_string(env, "first") is not template
+
+    def test_file_template_compiled_once(self) -> None:
+        self.fs.create_file(self.template_path, contents="Hello, {{ name }}!")
+        renderer_1 = self.get_template_renderer()
+        renderer_2 = self.get_template_renderer()
+        template = renderer_1.get_template(str(self.template_path))
+        assert renderer_2.get_template(str(self.template_path)) is template
+
+    def test_modified_file_template_recompiled(self) -> None:
+        template_file = self.fs.create_file(self.template_path, contents="Hello")
+        renderer = self.get_template_renderer()
+        assert renderer.render(str(self.template_path)) == "Hello"
+
+        template_file.set_contents("Goodbye")
+        template_file.st_mtime += 1
+        assert renderer.render(str(self.template_path)) == "Goodbye"
+
+    def test_cache_is_shared_by_execution_context_copies(self) -> None:
+        execution_context = get_execution_context()
+        template_cache = execution_context.template_cache
+        assert copy.deepcopy(execution_context).template_cache is template_cache
+        assert execution_context.copy(dry_run=True).template_cache is template_cache
+
+    def test_execution_context_copies_share_template_loader(self) -> None:
+        execution_context = get_execution_context()
+        template_loader = execution_context.get_template_loader()
+        copied_context = execution_context.copy(target_dir=Path("/other"))
+        assert copied_context.get_template_loader() is template_loader
+        copied_context = execution_context.copy(source_dir=Path("/other"))
+        assert copied_context.get_template_loader() is not template_loader
+
+    def test_equal_loaders_share_environment(self) -> None:
+        loaders = [
+            templates.SourceDirLoader("/source", template_sources={"a.txt": "A"})
+            for _ in range(50)
+        ]
+        environments = {id(self.cache.get_environment(loader)) for loader in loaders}
+        assert len(environments) == 1
+        other_loader = templates.SourceDirLoader("/other")
+        assert self.cache.get_environment(other_loader) is not (
+            self.cache.get_environment(loaders[0])
+        )
+
+    def test_execution_context_copies_share_environment(self) -> None:
+        execution_context = get_execution_context(source_dir=Path("/source"))
+        environments = set()
+        for i in range(50):
+            # Copy twice, so that each copy creates a new loader for "/source".
+            subtask_context = execution_context.copy(source_dir=Path(f"/subtask_{i}"))
+            copied_context = subtask_context.copy(source_dir=Path("/source"))
+            loader = copied_context.get_template_loader()
+            environments.add(id(self.cache.get_environment(loader)))
+        assert len(environments) == 1
+
+    def test_environment_evicted_when_cache_is_full(self) -> None:
+        env = self.cache.get_environment(templates.SourceDirLoader("/source_0"))
+        for i in range(1, templates.MAX_CACHED_ENVIRONMENTS + 1):
+            self.cache.get_environment(templates.SourceDirLoader(f"/source_{i}"))
+        assert len(self.cache._environments) == templates.MAX_CACHED_ENVIRONMENTS
+        loader = templates.SourceDirLoader("/source_0")
+        assert self.cache.get_environment(loader) is not env
+
+    def test_pickled_renderer_keeps_bytecode_cache(self) -> None:
+        bytecode_cache = templates.create_bytecode_cache(Path("/bytecode_cache"))
+        self.cache = templates.TemplateCache(bytecode_cache=bytecode_cache)
+        renderer = pickle.loads(pickle.dumps(self.get_template_renderer()))
+        assert renderer._template_cache is not None
+        assert renderer._template_cache.bytecode_cache is not None
+
+    def test_pickle_drops_cached_templates(self) -> None:
+        env = self.cache.get_environment(self.loader)
+        self.cache.from_string(env, "Hello")
+        unpickled_cache = pickle.loads(pickle.dumps(self.cache))
+        assert unpickled_cache.max_size == self.cache.max_size
+        assert len(unpickled_cache._environments) == 0
+
+    def test_bytecode_cache_persists_compiled_templates(self) -> None:
+        self.fs.create_file(self.template_path, contents="Hello, {{ name }}!")
+        bytecode_dir = Path("/bytecode_cache")
+        self.cache = templates.TemplateCache(
+            bytecode_cache=templates.create_bytecode_cache(bytecode_dir)
+        )
+
+        renderer = self.get_template_renderer()
+        assert renderer.render(str(self.template_path)) == "Hello, World!"
+        assert len(list(bytecode_dir.iterdir())) == 1
+
+
+class TestSourceDirLoader(TestCase):
+    def setUp(self) -> None:
+        self.setUpPyfakefs()
+        self.source_dir = Path("/source")
+        self.fs.create_file(self.source_dir / "test.txt", contents="source")
+        self.fs.create_file("/fallback/test.txt", contents="fallback")
+        self.fs.create_file("/fallback/other.txt", contents="other")
+
+    def get_template_renderer(
+        self, template_loader: jinja2.BaseLoader
+    ) -> templates.TemplateRenderer:
+        return templates.TemplateRenderer(template_loader, source_dir=self.source_dir)
+
+    def test_relative_name(self) -> None:
+        loader = templates.SourceDirLoader(self.source_dir)
+        renderer = self.get_template_renderer(loader)
+        assert renderer.render("test.txt") == "source"
+        assert renderer.get_template("test.txt").name == "test.txt"
+
+    def test_absolute_name(self) -> None:
+        loader = templates.SourceDirLoader(self.source_dir)
+        renderer = self.get_template_renderer(loader)
+        assert renderer.render("/fallback/test.txt") == "fallback"
+
+    def test_name_outside_source_dir(self) -> None:
+        loader = templates.SourceDirLoader(self.source_dir)
+        renderer = self.get_template_renderer(loader)
+        assert renderer.render("../fallback/test.txt") == "fallback"
+
+    def test_fallback_search_path(self) -> None:
+        loader = templates.SourceDirLoader(self.source_dir, search_paths=["/fallback"])
+        renderer = self.get_template_renderer(loader)
+        assert renderer.render("test.txt") == "source"
+        assert renderer.render("other.txt") == "other"
+
+    def test_in_memory_template_sources(self) -> None:
+        loader = templates.SourceDirLoader(
+            self.source_dir, template_sources={"test.txt": "in-memory"}
+        )
+        renderer = self.get_template_renderer(loader)
+        assert renderer.render("test.txt") == "in-memory"
+
+    def test_template_not_found(self) -> None:
+        loader = templates.SourceDirLoader(self.source_dir)
+        renderer = self.get_template_renderer(loader)
+        with pytest.raises(jinja2.TemplateNotFound):
+            renderer.render("missing.txt")
+
+    def test_execution_context_loader(self) -> None:
+        execution_context = get_execution_context(
+            source_dir=self.source_dir, template_sources={"memory.txt": "in-memory"}
+        )
+        loader = execution_context.get_template_loader()
+        renderer = self.get_template_renderer(loader)
+        assert renderer.render("test.txt") == "source"
+        assert renderer.render("memory.txt") == "in-memory"